@@ -2,12 +2,15 @@ from abc import ABC, abstractmethod
 
 
 class Action(ABC):
+    """
+    Class representing an option offered to the player each turn. Actions
+    hold no state, so a single instance of each is shared by every Game.
+    """
 
-    def __init__(self, game):
-        self.game = game
+    __slots__ = ()
 
     @abstractmethod
-    def execute(self):
+    def execute(self, game):
         pass
 
     @abstractmethod
@@ -21,7 +24,9 @@ class Action(ABC):
 
 class PlayAction(Action):
 
-    def execute(self):
+    __slots__ = ()
+
+    def execute(self, game):
         # Do nothing, as this will advance to harvest.
         pass
 
@@ -34,8 +39,10 @@ class PlayAction(Action):
 
 class StatusAction(Action):
 
-    def execute(self):
-        self.game.report_status()
+    __slots__ = ()
+
+    def execute(self, game):
+        game.report_status()
 
     def get_prompt(self):
         return "Review farm status"
@@ -46,8 +53,10 @@ class StatusAction(Action):
 
 class ListCropsAction(Action):
 
-    def execute(self):
-        self.game.list_crops()
+    __slots__ = ()
+
+    def execute(self, game):
+        game.list_crops()
 
     def get_prompt(self):
         return "See a list of available crops"
@@ -58,8 +67,10 @@ class ListCropsAction(Action):
 
 class PlantCropsAction(Action):
 
-    def execute(self):
-        self.game.plant_crops()
+    __slots__ = ()
+
+    def execute(self, game):
+        return game.plant_crops()
 
     def get_prompt(self):
         return "Buy and plant crops"
@@ -70,8 +81,10 @@ class PlantCropsAction(Action):
 
 class BuyFieldsAction(Action):
 
-    def execute(self):
-        self.game.buy_fields()
+    __slots__ = ()
+
+    def execute(self, game):
+        return game.buy_fields()
 
     def get_prompt(self):
         return "Buy fields"
@@ -82,11 +95,21 @@ class BuyFieldsAction(Action):
 
 class ExitAction(Action):
 
-    def execute(self):
-        self.game.exit()
+    __slots__ = ()
+
+    def execute(self, game):
+        game.exit()
 
     def get_prompt(self):
         return "Retire from the farming business"
 
     def should_end_round(self):
         return True
+
+
+PLAY_ACTION = PlayAction()
+STATUS_ACTION = StatusAction()
+LIST_CROPS_ACTION = ListCropsAction()
+PLANT_CROPS_ACTION = PlantCropsAction()
+BUY_FIELDS_ACTION = BuyFieldsAction()
+EXIT_ACTION = ExitAction()
@@ -0,0 +1,142 @@
+import argparse
+import json
+
+from acs.advisor import *
+from acs.ai import Strategy
+from acs.data_reader import DataReader
+from acs.launchers import Launcher
+from acs.solver import Solver
+
+
+class StrategyPolicy(Solver):
+    """
+    Class computing the expected final score of following a Strategy, using
+    the Solver's value tables: each year the Strategy buys the first
+    affordable field while any field costs less than money / field_ratio,
+    then plants crops drawn from its planting probabilities, renormalised
+    over the affordable crops. As in the Solver, each draw is planted across
+    all empty fields.
+    """
+
+    def __init__(self, strategy, max_years, initial_money, crops, fields):
+        super().__init__(max_years, initial_money, crops, fields)
+        self.strategy = strategy
+
+    def cache_key(self):
+        return super().cache_key() + (self.strategy.genome_hash(),)
+
+    def best_decision(self, year, money, mask):
+        """
+        Return the (expected value, field to buy, most likely crop to plant)
+        of the Strategy's play at the start of the given year.
+        """
+
+        available = [(index, field) for index, field
+                     in enumerate(self.purchasable_fields)
+                     if not mask & (1 << index)]
+
+        # The game only offers to buy fields when one is affordable, and
+        # then sells the first affordable field
+        purchase = next(((index, field) for index, field in available
+                         if field.price < money), None)
+
+        if purchase is not None and \
+                any(field.price < money / self.strategy.field_ratio
+                    for index, field in available):
+            index, field = purchase
+
+            return (self.value(year, money - field.price, mask | 1 << index),
+                    field, None)
+
+        affordable = [crop for crop in self.crops if crop.cost <= money]
+
+        if money < self.lowest_crop_cost or not affordable:
+            return self.value(year + 1, money, mask), None, None
+
+        chances = self.strategy.chances_to_plant
+        total_chance = sum(chances[crop] for crop in affordable)
+        fields = self.planting_orders[mask]
+
+        # With no chance of any affordable crop, the CropSampler draws the
+        # dearest of them
+        if total_chance == 0:
+            crop = max(affordable, key=lambda crop: crop.cost)
+            return (self.planting_value(year, money, mask, fields, crop),
+                    None, crop)
+
+        expected_value = sum(
+            chances[crop] / total_chance
+            * self.planting_value(year, money, mask, fields, crop)
+            for crop in affordable)
+
+        return (expected_value, None,
+                max(affordable, key=lambda crop: chances[crop]))
+
+
+def export_table(policy, source):
+    """
+    Solve the given Solver (or StrategyPolicy) and return its decisions as a
+    DecisionTable.
+    """
+
+    policy.solve()
+    fields = [policy.starting_field] + policy.purchasable_fields
+    tables = {}
+
+    for year, mask in policy.value_tables:
+        rows = []
+
+        for money in policy.money_grid:
+            value, field, crop = policy.best_decision(year, money, mask)
+
+            if field is not None:
+                rows.append([Advice.BUY, field.id, round(value, 1)])
+            elif crop is not None:
+                rows.append([Advice.PLANT, crop.id, round(value, 1)])
+            else:
+                rows.append([Advice.ADVANCE, None, round(value, 1)])
+
+        tables[(year, mask)] = rows
+
+    return DecisionTable(
+        source, policy.max_years, policy.starting_field.id,
+        [field.id for field in policy.purchasable_fields],
+        {crop.id: crop.name for crop in policy.crops},
+        {field.id: field.name for field in fields},
+        policy.lowest_crop_cost, Solver.MONEY_SCALE, Solver.MONEY_GROWTH,
+        tables)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export the solver's policy, or an evolved Strategy, as a "
+                    "decision table for the interactive game's advisor.")
+    parser.add_argument("--strategy",
+                        help="best Strategy file written by acs.anytime "
+                             "(default: the solver's policy)")
+    parser.add_argument("--output", default=Launcher.ADVICE_FILE)
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    crops = data_reader.import_crops()
+    fields = data_reader.import_fields()
+
+    if arguments.strategy is None:
+        policy = Solver(Launcher.MAX_YEARS, Launcher.INITIAL_MONEY, crops,
+                        fields)
+        source = "solver"
+    else:
+        with open(arguments.strategy, encoding="utf-8") as strategy_file:
+            strategy = Strategy.from_dict(json.load(strategy_file)["strategy"],
+                                          crops)
+
+        policy = StrategyPolicy(strategy, Launcher.MAX_YEARS,
+                                Launcher.INITIAL_MONEY, crops, fields)
+        source = "strategy " + arguments.strategy
+
+    table = export_table(policy, source)
+    table.save(arguments.output)
+
+    print("Exported", len(table.tables), "tables to", arguments.output)
+    print("Expected score from the start:",
+          round(policy.value(1, Launcher.INITIAL_MONEY, 0)))
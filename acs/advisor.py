@@ -0,0 +1,175 @@
+import json
+import math
+
+
+class Advice:
+    """
+    Class representing a recommended action: advance to harvest, buy the
+    field with the given id or plant the crop with the given id, and the
+    expected final score of following the advice from here on.
+    """
+
+    ADVANCE = 0
+    BUY = 1
+    PLANT = 2
+
+    __slots__ = ("action", "item_id", "expected_score")
+
+    def __init__(self, action, item_id, expected_score):
+        self.action = action
+        self.item_id = item_id
+        self.expected_score = expected_score
+
+
+class DecisionTable:
+    """
+    Class representing a policy precomputed for the start of each year, for
+    each set of owned fields and each point of a geometric money grid (as
+    used by the Solver). It is written by acs.advice_export, and reading it
+    needs nothing but the JSON file.
+
+    Each row of the table for a (year, field set) is [action, item id,
+    expected score]. Decisions are looked up at the grid point at or below
+    the farm's money, so that whatever they buy is always affordable, and
+    expected scores are interpolated between grid points.
+    """
+
+    __slots__ = ("source", "max_years", "starting_field_id", "field_ids",
+                 "crop_names", "field_names", "lowest_crop_cost",
+                 "money_scale", "money_growth", "tables")
+
+    def __init__(self, source, max_years, starting_field_id, field_ids,
+                 crop_names, field_names, lowest_crop_cost, money_scale,
+                 money_growth, tables):
+        self.source = source
+        self.max_years = max_years
+        self.starting_field_id = starting_field_id
+        self.field_ids = field_ids
+        self.crop_names = crop_names
+        self.field_names = field_names
+        self.lowest_crop_cost = lowest_crop_cost
+        self.money_scale = money_scale
+        self.money_growth = money_growth
+        self.tables = tables
+
+    @staticmethod
+    def load(file_name):
+        with open(file_name, encoding="utf-8") as table_file:
+            data = json.load(table_file)
+
+        return DecisionTable(
+            data["source"], data["max_years"], data["starting_field_id"],
+            data["field_ids"],
+            {int(crop_id): name for crop_id, name
+             in data["crop_names"].items()},
+            {int(field_id): name for field_id, name
+             in data["field_names"].items()},
+            data["lowest_crop_cost"], data["money_scale"],
+            data["money_growth"],
+            {tuple(int(part) for part in key.split(":")): rows
+             for key, rows in data["tables"].items()})
+
+    def save(self, file_name):
+        with open(file_name, "w", encoding="utf-8") as table_file:
+            json.dump({
+                "source": self.source,
+                "max_years": self.max_years,
+                "starting_field_id": self.starting_field_id,
+                "field_ids": self.field_ids,
+                "crop_names": self.crop_names,
+                "field_names": self.field_names,
+                "lowest_crop_cost": self.lowest_crop_cost,
+                "money_scale": self.money_scale,
+                "money_growth": self.money_growth,
+                "tables": {str(year) + ":" + str(mask): rows
+                           for (year, mask), rows in self.tables.items()}
+            }, table_file, separators=(",", ":"))
+
+    def field_mask(self, owned_field_ids):
+        mask = 0
+
+        for index, field_id in enumerate(self.field_ids):
+            if field_id in owned_field_ids:
+                mask |= 1 << index
+
+        return mask
+
+    def lookup(self, year, money, owned_field_ids):
+        """
+        Return the Advice for the start of the given year, or None if the
+        game is over or the state is outside the table.
+        """
+
+        rows = self.tables.get((year, self.field_mask(owned_field_ids)))
+
+        if rows is None:
+            return None
+
+        if money < self.lowest_crop_cost:
+            index = 0
+        else:
+            index = min(int(math.log(money / self.money_scale + 1)
+                            / math.log(self.money_growth)), len(rows) - 1)
+
+        action, item_id, expected_score = rows[index]
+
+        # Interpolate the expected score towards the next grid point
+        if index + 1 < len(rows):
+            lower = self.money_scale * (self.money_growth ** index - 1)
+            upper = self.money_scale * (self.money_growth ** (index + 1) - 1)
+            expected_score += ((money - lower) / (upper - lower)
+                               * (rows[index + 1][2] - expected_score))
+
+        return Advice(action, item_id, expected_score)
+
+
+class Advisor:
+    """
+    Class giving a player advice from a DecisionTable during a game. Advice
+    is looked up while every owned field is empty, and a recommended crop is
+    then recommended for every empty field it is affordable for, as the
+    policies plant one crop across the farm each year.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.advice = None
+
+    def advise(self, game):
+        """
+        Return the Advice for the current state of the given Game, or None if
+        there is none.
+        """
+
+        farm = game.farm
+
+        if all(field.is_empty() for field in farm.owned_fields):
+            self.advice = self.table.lookup(
+                game.current_year, farm.money,
+                [field.id for field in farm.owned_fields])
+        elif self.advice is not None and \
+                self.advice.action == Advice.PLANT:
+            crop = next((crop for crop in game.available_crops
+                         if crop.id == self.advice.item_id), None)
+
+            if crop is None or crop.cost > farm.money or \
+                    all(not field.is_empty() for field in farm.owned_fields):
+                self.advice = Advice(Advice.ADVANCE, None,
+                                     self.advice.expected_score)
+
+        return self.advice
+
+    def describe(self, advice):
+        """
+        Return a line describing the given Advice.
+        """
+
+        if advice.action == Advice.BUY:
+            recommendation = "Buy " + self.table.field_names[advice.item_id]
+        elif advice.action == Advice.PLANT:
+            recommendation = "Plant " + self.table.crop_names[advice.item_id]
+        else:
+            recommendation = "Advance to harvest"
+
+        return "Advisor: {} (expected final score {})".format(
+            recommendation, round(advice.expected_score))
@@ -1,8 +1,23 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from array import array
 from functools import total_ordering
-import random
+import bisect
+import hashlib
+import itertools
+import json
+import math
+import os
+import signal
+import threading
+import time
 
 import acs.input_providers
+from acs.fidelity import *
 from acs.game import *
+from acs.niching import *
+from acs.seeding import *
+from acs.shared_tables import SharedTables
+from acs.streaming_stats import *
 
 
 @total_ordering
@@ -12,6 +27,8 @@ class CropChance:
     this Crop.
     """
 
+    __slots__ = ("crop", "chance")
+
     def __init__(self, crop, chance):
         self.crop = crop
         self.chance = chance
@@ -30,6 +47,44 @@ class CropChance:
         return other.chance < self.chance
 
 
+class CropSampler:
+    """
+    Class for drawing crops according to a set of planting probabilities in
+    O(log n). Crops are held in order of cost with cumulative probabilities,
+    so that the crops affordable with any amount of money form a prefix whose
+    total probability is known, and draws can be renormalised over it. As a
+    population holds one sampler per Strategy, the probabilities are packed
+    in an array, and the order of the crops can be given by the owner of the
+    catalog so that every sampler over it shares one tuple.
+    """
+
+    __slots__ = ("crops", "cumulative_chances")
+
+    def __init__(self, chances_to_plant, cost_order=None):
+        if cost_order is None:
+            cost_order = CropSampler.order_by_cost(chances_to_plant)
+
+        self.crops = cost_order
+        self.cumulative_chances = array("d", itertools.accumulate(
+            chances_to_plant[crop] for crop in cost_order))
+
+    @staticmethod
+    def order_by_cost(crops):
+        return tuple(sorted(crops, key=lambda crop: crop.cost))
+
+    def sample(self, r, number_affordable):
+        """
+        Given a random number in [0, 1) and the number of crops affordable
+        (i.e. the cheapest N crops), return the chosen crop.
+        """
+
+        last = number_affordable - 1
+        target = r * self.cumulative_chances[last]
+        index = bisect.bisect_right(self.cumulative_chances, target, 0, last)
+
+        return self.crops[index]
+
+
 @total_ordering
 class Strategy:
     """
@@ -39,17 +94,28 @@ class Strategy:
     saved up before being able to buy it.
     """
 
-    def __init__(self, crop_weightings, field_ratio):
+    __slots__ = ("crop_weightings", "field_ratio", "fitness",
+                 "chances_to_plant", "crop_sampler", "score_statistics",
+                 "fidelity_stage")
+
+    def __init__(self, crop_weightings, field_ratio, cost_order=None):
         self.crop_weightings = crop_weightings
         self.field_ratio = field_ratio
         self.fitness = 0
+        self.score_statistics = None
+
+        # Number of the fidelity stage this Strategy was eliminated at, whose
+        # truncated games its fitness comes from, or None if it was
+        # evaluated in full.
+        self.fidelity_stage = None
         self.chances_to_plant = {}
-        self.calculate_chances_to_plant()
+        self.calculate_chances_to_plant(cost_order)
 
-    def calculate_chances_to_plant(self):
+    def calculate_chances_to_plant(self, cost_order=None):
         """
         Populate this strategy's set of probabilities for planting each crop in
-        the game using the stored weightings.
+        the game using the stored weightings, and the sampler drawing from
+        them with the given order of the crops by cost, if known.
         """
 
         total_weight = sum(self.crop_weightings.values())
@@ -58,26 +124,21 @@ class Strategy:
             chance = (weighting / total_weight)
             self.chances_to_plant[crop] = chance
 
-    def describe(self):
+        self.crop_sampler = CropSampler(self.chances_to_plant, cost_order)
+
+    def describe(self, file=None):
         """
-        Return a summary of this strategy's performance, and the planting
-        probabilities used to achieve it.
+        Print a summary of this strategy's performance, and the planting
+        probabilities used to achieve it, to the given file (standard output
+        by default).
         """
 
-        report = ("SCORE: " + str(round(self.fitness)) + "  Field ratio: " +
-                  "{:.3f}".format(round(self.field_ratio, 3)) + " || ")
-
         # Construct ordered list of crop chances
-        crop_chances = []
-        for crop, chance in self.chances_to_plant.items():
-            crop_chances.append(CropChance(crop, chance))
-        crop_chances.sort()
+        crop_chances = sorted(CropChance(crop, chance) for crop, chance
+                              in self.chances_to_plant.items())
 
-        for crop_chance in crop_chances:
-            report += (crop_chance.crop.name + ": " +
-                       str(int(round(crop_chance.chance * 100))) + "%  ")
-
-        print(report)
+        write_report(render_strategy(self.fitness, self.field_ratio,
+                                     crop_chances) + "\n", file)
 
     def replace_weighting(self, crop_to_replace, new_weighting):
         """
@@ -87,13 +148,64 @@ class Strategy:
         for crop, weighting in self.crop_weightings.items():
             if crop == crop_to_replace:
                 self.crop_weightings[crop] = new_weighting
-        self.calculate_chances_to_plant()
+        self.calculate_chances_to_plant(self.crop_sampler.crops)
+
+    def to_dict(self):
+        """
+        Return a JSON-serialisable representation of this Strategy, with crop
+        weightings keyed by crop name.
+        """
+
+        return {
+            "crop_weightings": {crop.name: weighting for crop, weighting
+                                in self.crop_weightings.items()},
+            "field_ratio": self.field_ratio
+        }
+
+    @staticmethod
+    def from_dict(data, crops):
+        """
+        Create a Strategy from the representation given by to_dict, using the
+        supplied list of Crops.
+        """
+
+        crop_weightings = {crop: data["crop_weightings"][crop.name]
+                           for crop in crops}
+
+        return Strategy(crop_weightings, data["field_ratio"])
+
+    def genome_hash(self):
+        """
+        Return a digest of this Strategy's crop weightings and field ratio,
+        which is the same for equal genomes in any process or run.
+        """
+
+        genome = (sorted((crop.id, weighting) for crop, weighting
+                         in self.crop_weightings.items()),
+                  self.field_ratio)
+
+        return hashlib.blake2b(repr(genome).encode("utf-8"),
+                               digest_size=16).hexdigest()
+
+    def copy(self):
+        return Strategy(dict(self.crop_weightings), self.field_ratio,
+                        self.crop_sampler.crops)
+
+    def stages_passed(self):
+        if self.fidelity_stage is None:
+            return math.inf
+
+        return self.fidelity_stage
 
     def __eq__(self, other):
-        return other.fitness == self.fitness
+        return (other.stages_passed(), other.fitness) == \
+            (self.stages_passed(), self.fitness)
 
     def __lt__(self, other):
-        return other.fitness < self.fitness
+        # Strategies which got further through the fidelity stages rank
+        # above the rest, as their fitnesses are not comparable
+        return (other.stages_passed(), other.fitness) < \
+            (self.stages_passed(), self.fitness)
 
 
 class Evolver:
@@ -102,6 +214,7 @@ class Evolver:
     breeding Strategies.
     """
 
+    # Defaults for the hyperparameters, which may be configured per Evolver.
     NUM_GAMES = 20
     NUM_GENERATIONS = 1000
     POPULATION_SIZE = 100
@@ -110,21 +223,184 @@ class Evolver:
     CHANCE_TO_MUTATE_FIELD = 0.2
     FIELD_MUTATION_SIZE = 0.7
 
+    # Multiple of the uniform selection probability given to the fittest
+    # Strategy when choosing parents.
+    SELECTION_PRESSURE = 2
+
+    # Number of Strategies competing to be each parent in steady-state
+    # evolution.
+    TOURNAMENT_SIZE = 3
+
+    # Number of evaluations kept queued per worker in steady-state evolution,
+    # so that no worker waits for its next Strategy.
+    EVALUATIONS_IN_FLIGHT_PER_WORKER = 2
+
+    # Number of generations a budgeted run plans to fit in its budget, and
+    # the fewest generations it plans for the budget remaining at any point.
+    BUDGET_GENERATIONS = 50
+    MIN_BUDGET_GENERATIONS_LEFT = 10
+
+    # Range of population sizes and numbers of games per Strategy a budgeted
+    # run will use. The maximums bound the length of a generation, which is
+    # how long a requested stop may take.
+    MIN_POPULATION_SIZE = 10
+    MAX_POPULATION_SIZE = 500
+    MIN_NUM_GAMES = 2
+    MAX_NUM_GAMES = 100
+
+    # Number of games with which a new best Strategy is confirmed before it
+    # is written to the best Strategy file, and the number of batches they
+    # are split into so that the worker pool shares them.
+    CONFIRMATION_NUM_GAMES = 200
+    CONFIRMATION_BATCHES = 8
+
     # Number of generations to compute between console progress reports.
     GENERATIONS_PER_SUMMARY = 1
 
     # Number of Strategies included in progress reports.
     TOP_STRATEGIES_TO_REPORT = 5
 
-    def __init__(self, max_years, initial_money, crops, fields):
+    # Quantiles of Strategy fitness estimated for each generation.
+    GENERATION_QUANTILES = (0.1, 0.5, 0.9)
+
+    # Genome distance within which Strategies are counted as sharing a niche
+    # when measuring diversity, if no niche radius is configured.
+    NICHE_RADIUS = 0.1
+
+    def __init__(self, max_years, initial_money, crops, fields,
+                 num_generations=None, verbose=True, trace_recorder=None,
+                 seed=None, workers=None, weather_table=None,
+                 hall_of_fame=None, niche_radius=None, population_size=None,
+                 num_games=None, chance_to_mutate_crop=None,
+                 chance_to_mutate_field=None, field_mutation_size=None,
+                 initial_selection_probability=None, target_fitness=None,
+                 evaluation_store=None, time_budget=None, game_budget=None,
+                 best_file_name=None, fidelity_schedule=None,
+                 fidelity_audit_interval=None, progress_monitor=None):
         self.max_years = max_years
         self.initial_money = initial_money
         self.crops = crops
         self.fields = fields
 
+        # Order of the crops by cost, shared by the sampler of every Strategy
+        # this Evolver creates.
+        self.cost_order = CropSampler.order_by_cost(crops)
+        self.num_generations = (num_generations if num_generations is not None
+                                else Evolver.NUM_GENERATIONS)
+        self.verbose = verbose
+
+        self.population_size = population_size or Evolver.POPULATION_SIZE
+        self.num_games = num_games or Evolver.NUM_GAMES
+        self.chance_to_mutate_crop = (
+            chance_to_mutate_crop if chance_to_mutate_crop is not None
+            else Evolver.CHANCE_TO_MUTATE_CROP)
+        self.chance_to_mutate_field = (
+            chance_to_mutate_field if chance_to_mutate_field is not None
+            else Evolver.CHANCE_TO_MUTATE_FIELD)
+        self.field_mutation_size = (
+            field_mutation_size if field_mutation_size is not None
+            else Evolver.FIELD_MUTATION_SIZE)
+
+        # If set, evolution stops at the first generation whose best Strategy
+        # reaches this fitness.
+        self.target_fitness = target_fitness
+
+        # Games are only traced when they are played in this process.
+        self.trace_recorder = trace_recorder
+
+        # All randomness is drawn from streams derived from the master seed,
+        # so that runs are reproducible however they are parallelised.
+        self.seed = seed if seed is not None else generate_master_seed()
+        self.rng = make_rng(self.seed, "evolver")
+
+        # Pre-drawn weather to play games with, instead of drawing it afresh.
+        # Each scenario must cover every harvest of a game, or games would
+        # run on into the next scenario's weather.
+        if weather_table is not None and \
+                weather_table.years < max_years - 1:
+            raise ValueError("Weather table scenarios cover "
+                             + str(weather_table.years)
+                             + " years, but games need "
+                             + str(max_years - 1))
+
+        self.weather_table = weather_table
+
+        # Number of worker processes used to evaluate Strategies, and the
+        # tables they share when playing with pre-drawn weather.
+        self.workers = workers
+        self.executor = None
+        self.shared_tables = None
+
+        # Total number of games played, and of game years fast-forwarded
+        # rather than simulated.
+        self.games_played = 0
+        self.years_skipped = 0
+
+        # Store of evaluations from previous runs, consulted before playing
+        # games, and the number of evaluations found in it.
+        self.evaluation_store = evaluation_store
+        self.store_hits = 0
+
+        # Time spent evaluating Strategies, summed over all workers, and
+        # wall-clock time spent evolving.
+        self.worker_seconds = 0
+        self.elapsed_seconds = 0
+
+        # If either budget is set, evolution runs until the budget is spent
+        # (in seconds or games played) instead of for a number of
+        # generations, sizing each generation to the measured throughput.
+        self.time_budget = time_budget
+        self.game_budget = game_budget
+        self.start_time = None
+
+        # Fittest Strategy seen so far, which is also written to the given
+        # file whenever it improves, and whether a stop has been requested
+        # (e.g. by SIGTERM).
+        self.best_strategy = None
+        self.best_file_name = best_file_name
+        self.stop_requested = False
+
+        # Highest fitness, as measured in its generation, of any Strategy
+        # confirmed so far. Only Strategies measured fitter than this are
+        # confirmed, since the fittest of a generation almost always
+        # measures above the confirmed fitness of the best.
+        self.best_measured_fitness = None
+
+        # Cheap evaluation stages which Strategies must pass before being
+        # evaluated in full. Every N generations, all Strategies go through
+        # every stage, so the rank correlation of each stage with the full
+        # evaluation is measured over the whole population.
+        self.fidelity_schedule = fidelity_schedule
+        self.fidelity_audit_interval = fidelity_audit_interval
+        self.fidelity_correlations = None
+
+        # Archive of the best Strategies seen in any generation, if kept.
+        self.hall_of_fame = hall_of_fame
+
+        # Publisher of each generation's progress to a local endpoint, if
+        # any.
+        self.progress_monitor = progress_monitor
+
+        # Statistics of the fitnesses and game scores of the most recently
+        # evaluated generation.
+        self.fitness_statistics = None
+        self.game_statistics = None
+
+        # If set, parents are selected by fitness shared among all Strategies
+        # within this genome distance, to stop the population collapsing onto
+        # a single genome.
+        self.niche_radius = niche_radius
+
+        # Niche count of each Strategy in, and effective number of niches of,
+        # the most recently evaluated generation.
+        self.niche_counts = None
+        self.diversity = None
+
         # Probability of selecting the first available parent (start of
         # geometric sequence)
-        self.initial_selection_probability = 2 / Evolver.POPULATION_SIZE
+        self.initial_selection_probability = (
+            initial_selection_probability
+            or Evolver.SELECTION_PRESSURE / self.population_size)
 
         # Common ratio for geometric selection sequence
         self.common_ratio = Evolver.calculate_common_ratio(self)
@@ -134,37 +410,411 @@ class Evolver:
         Entry point for evolutionary algorithm.
         """
 
-        print('Evolutionary algorithm is online.')
+        if self.verbose:
+            print('Evolutionary algorithm is online. Seed:', self.seed)
+
+        previous_handler = self.handle_termination()
+        self.start_workers()
+        self.start_time = time.perf_counter()
+
+        try:
+            return self.run_generations()
+        finally:
+            self.restore_termination_handler(previous_handler)
+            self.elapsed_seconds += time.perf_counter() - self.start_time
+            self.stop_workers()
+
+            if self.verbose:
+                self.report_throughput()
+
+    def evolve_steady_state(self, num_evaluations=None):
+        """
+        Entry point for asynchronous steady-state evolution, which has no
+        generation barrier: whenever an evaluation finishes, its Strategy
+        joins the population and a new child is bred and dispatched, so every
+        worker stays busy. Unless given, the number of evaluations matches the
+        configured number of generations. Results depend on the order in which
+        evaluations finish, so parallel runs are not reproducible.
+        """
+
+        if self.verbose:
+            print('Steady-state evolution is online. Seed:', self.seed)
+
+        previous_handler = self.handle_termination()
+        self.start_workers()
+        self.start_time = time.perf_counter()
+
+        try:
+            return self.run_steady_state(
+                num_evaluations
+                or self.num_generations * self.population_size)
+        finally:
+            self.restore_termination_handler(previous_handler)
+            self.elapsed_seconds += time.perf_counter() - self.start_time
+            self.stop_workers()
+
+            if self.verbose:
+                self.report_throughput()
+
+    def handle_termination(self):
+        """
+        Make SIGTERM request a stop at the end of the current generation,
+        rather than killing the process, and return the previous handler.
+        This must be done before the workers start, as they ignore SIGTERM
+        (e.g. sent to the whole process group) and leave the stop to this
+        process. Signal handlers can only be set from the main thread.
+        """
+
+        if threading.current_thread() is not threading.main_thread():
+            return None
+
+        def request_stop(signal_number, frame):
+            self.stop_requested = True
+
+        return signal.signal(signal.SIGTERM, request_stop)
+
+    @staticmethod
+    def restore_termination_handler(previous_handler):
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+    def run_generations(self):
+        """
+        Evolve a population of Strategies for the configured number of
+        generations (or until the budget is spent), until the target fitness
+        is reached or a stop is requested, and return the final generation
+        sorted by fitness.
+        """
 
         # Generate initial population of Strategies
         current_generation = self.generate_initial_population()
 
-        for generation in range(Evolver.NUM_GENERATIONS):
+        if self.is_budgeted():
+            generations = itertools.count()
+        else:
+            generations = range(self.num_generations)
+
+        for generation in generations:
 
             # Compute results of using Strategies in this generation
-            self.determine_fitness(current_generation)
+            self.determine_fitness(current_generation, generation)
 
-            # Rank the Strategies in this generation by fitness
+            # Rank the Strategies in this generation by fitness. Only those
+            # evaluated in full are summarised, archived or reported.
             current_generation.sort()
+            evaluated = [strategy for strategy in current_generation
+                         if strategy.fidelity_stage is None]
+            self.summarise_generation(evaluated)
+            self.measure_diversity(current_generation)
+            self.record_best(evaluated[0], generation)
 
-            # If we are reporting this generation, report
-            if generation % Evolver.GENERATIONS_PER_SUMMARY == 0:
-                average_fitness = \
-                    self.sum_fitness_of_strategies(current_generation) \
-                    / Evolver.POPULATION_SIZE
+            if self.hall_of_fame is not None:
+                self.hall_of_fame.update(evaluated, generation)
+
+            if self.progress_monitor is not None:
+                self.progress_monitor.update(self, generation, evaluated)
 
+            # If we are reporting this generation, report
+            if self.verbose and \
+                    generation % Evolver.GENERATIONS_PER_SUMMARY == 0:
                 self.report_progress(
-                    current_generation, generation, average_fitness)
+                    evaluated, generation, self.fitness_statistics,
+                    self.game_statistics, self.diversity,
+                    self.fidelity_correlations)
+
+            if self.target_fitness is not None and \
+                    evaluated[0].fitness >= self.target_fitness:
+                break
+
+            if self.stop_requested or self.is_budget_spent():
+                break
 
             # If we are not finished yet, create the next generation
-            if generation < Evolver.NUM_GENERATIONS - 1:
-                next_generation = self.breed_generation(current_generation)
-                self.mutate(next_generation)
-                current_generation = next_generation
+            if not self.is_budgeted() and \
+                    generation == self.num_generations - 1:
+                break
+
+            population_size = self.population_size
+
+            if self.is_budgeted():
+                population_size, self.num_games = \
+                    self.plan_generation(generation)
+
+            next_generation = self.breed_generation(
+                self.selection_order(current_generation), population_size)
+            self.mutate(next_generation)
+            current_generation = next_generation
+            self.set_population_size(population_size)
 
         current_generation.sort()
         return current_generation
 
+    def is_budgeted(self):
+        return self.time_budget is not None or self.game_budget is not None
+
+    def remaining_budget(self):
+        """
+        Return the number of games that can still be played within the
+        budget, converting remaining time to games at the throughput measured
+        so far in this run.
+        """
+
+        remaining = math.inf
+
+        if self.game_budget is not None:
+            remaining = self.game_budget - self.games_played
+
+        if self.time_budget is not None:
+            elapsed = time.perf_counter() - self.start_time
+            games_per_second = self.games_played / max(elapsed, 1e-9)
+            remaining = min(remaining,
+                            (self.time_budget - elapsed) * games_per_second)
+
+        return remaining
+
+    def is_budget_spent(self):
+        """
+        Return whether the budget cannot fit even the smallest generation.
+        """
+
+        return self.is_budgeted() and self.remaining_budget() < \
+            Evolver.MIN_POPULATION_SIZE * Evolver.MIN_NUM_GAMES
+
+    def plan_generation(self, generation):
+        """
+        Return the population size and number of games per Strategy for the
+        generation after the given one, spreading the remaining budget over
+        the generations still planned. The ratio of population size to games
+        per Strategy is kept at that of the defaults.
+        """
+
+        generations_left = max(Evolver.BUDGET_GENERATIONS - generation - 1,
+                               Evolver.MIN_BUDGET_GENERATIONS_LEFT)
+        games_per_generation = self.remaining_budget() / generations_left
+        ratio = Evolver.POPULATION_SIZE / Evolver.NUM_GAMES
+
+        population_size = min(max(Evolver.MIN_POPULATION_SIZE,
+                                  int(math.sqrt(games_per_generation
+                                                * ratio))),
+                              Evolver.MAX_POPULATION_SIZE)
+        num_games = min(max(Evolver.MIN_NUM_GAMES,
+                            int(games_per_generation / population_size)),
+                        Evolver.MAX_NUM_GAMES)
+
+        return population_size, num_games
+
+    def set_population_size(self, population_size):
+        """
+        Change the population size, keeping the same selection pressure.
+        """
+
+        if population_size == self.population_size:
+            return
+
+        selection_pressure = (self.initial_selection_probability
+                              * self.population_size)
+        self.population_size = population_size
+        self.initial_selection_probability = (selection_pressure
+                                              / population_size)
+        self.common_ratio = self.calculate_common_ratio()
+
+    def record_best(self, strategy, generation):
+        """
+        Keep a copy of the given Strategy if it is the fittest seen so far,
+        writing it to the best Strategy file if there is one. When there is
+        a file, the fittest of a generation may have been measured with only
+        a few games, so if it measured fitter than any Strategy confirmed
+        before, it is confirmed with more games, all on the same weather, and
+        only replaces the best if its confirmed fitness is higher.
+        """
+
+        if self.best_file_name is None:
+            if self.best_strategy is None or \
+                    strategy.fitness > self.best_strategy.fitness:
+                self.best_strategy = strategy.copy()
+                self.best_strategy.fitness = strategy.fitness
+
+            return
+
+        if self.best_measured_fitness is not None and \
+                strategy.fitness <= self.best_measured_fitness:
+            return
+
+        self.best_measured_fitness = strategy.fitness
+        candidate = strategy.copy()
+        candidate.fitness = self.confirm_fitness(strategy)
+
+        if self.best_strategy is not None and \
+                candidate.fitness <= self.best_strategy.fitness:
+            return
+
+        self.best_strategy = candidate
+        strategy = candidate
+
+        # Replace the file atomically, so readers never see a partial write
+        temporary_file_name = self.best_file_name + ".tmp"
+
+        with open(temporary_file_name, "w", encoding="utf-8") as best_file:
+            json.dump({
+                "strategy": strategy.to_dict(),
+                "fitness": strategy.fitness,
+                "generation": generation,
+                "games_played": self.games_played
+            }, best_file)
+
+        os.replace(temporary_file_name, self.best_file_name)
+
+    def confirm_fitness(self, strategy):
+        """
+        Return the mean score of the given Strategy over
+        CONFIRMATION_NUM_GAMES games, played in batches by the worker pool
+        if it is running. Every Strategy confirmed faces the same weather.
+        """
+
+        batches = [strategy.copy()
+                   for batch in range(Evolver.CONFIRMATION_BATCHES)]
+        seeds = [derive_seed(self.seed, "confirmation", batch)
+                 for batch in range(Evolver.CONFIRMATION_BATCHES)]
+        scores = RunningStatistics()
+
+        for statistics in self.evaluate_strategies(
+                batches, seeds, Evolver.CONFIRMATION_NUM_GAMES
+                // Evolver.CONFIRMATION_BATCHES):
+            scores.merge(statistics.running)
+
+        return scores.mean
+
+    def run_steady_state(self, num_evaluations):
+        """
+        Evaluate the given number of Strategies, breeding each from the
+        population of those evaluated so far, and return the population
+        sorted by fitness. Until the population is full, Strategies are
+        random; after that, each evaluated Strategy replaces the least fit
+        member if it is fitter.
+        """
+
+        population = []
+        in_flight = {}
+        dispatched = 0
+        completed = 0
+
+        while completed < num_evaluations and not self.stop_requested:
+            if self.executor is None:
+                strategy = self.breed_steady_state_child(population)
+                start_time = time.perf_counter()
+                self.evaluate_strategy(
+                    strategy, derive_seed(self.seed, "evaluation", dispatched))
+                self.worker_seconds += time.perf_counter() - start_time
+                dispatched += 1
+                finished = [strategy]
+            else:
+                capacity = (self.workers
+                            * Evolver.EVALUATIONS_IN_FLIGHT_PER_WORKER)
+                finished = []
+
+                # Strategies found in the evaluation store are not
+                # dispatched, and are inserted before breeding any more
+                while dispatched < num_evaluations \
+                        and len(in_flight) < capacity and not finished:
+                    strategy = self.breed_steady_state_child(population)
+                    seed = derive_seed(self.seed, "evaluation", dispatched)
+                    dispatched += 1
+
+                    if self.lookup_evaluation(strategy, seed, self.num_games,
+                                              self.max_years):
+                        finished.append(strategy)
+                        continue
+
+                    future = self.executor.submit(
+                        evaluate_in_worker,
+                        [strategy.crop_weightings[crop]
+                         for crop in self.crops],
+                        strategy.field_ratio, seed, self.num_games)
+                    in_flight[future] = (strategy, seed)
+
+                done, pending = wait(in_flight,
+                                     timeout=0 if finished else None,
+                                     return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    strategy, seed = in_flight.pop(future)
+                    result = future.result()
+                    self.record_evaluation(strategy, result)
+                    self.store_evaluation(strategy, seed, self.num_games,
+                                          self.max_years, result[1])
+                    finished.append(strategy)
+
+            for strategy in finished:
+                self.insert_into_population(population, strategy)
+                completed += 1
+                self.record_best(strategy, completed // self.population_size)
+
+                if self.hall_of_fame is not None:
+                    self.hall_of_fame.update(
+                        [strategy], completed // self.population_size)
+
+                # Report once per population's worth of evaluations
+                if completed % self.population_size != 0:
+                    continue
+
+                if self.verbose or self.progress_monitor is not None:
+                    population.sort()
+                    self.summarise_generation(population)
+
+                if self.progress_monitor is not None:
+                    self.progress_monitor.update(
+                        self, completed // self.population_size - 1,
+                        population)
+
+                if self.verbose:
+                    self.measure_diversity(population)
+                    self.report_progress(
+                        population, completed // self.population_size - 1,
+                        self.fitness_statistics, self.game_statistics,
+                        self.diversity)
+
+        population.sort()
+        return population
+
+    def breed_steady_state_child(self, population):
+        """
+        Return a new Strategy to evaluate: a random one while the population
+        is still being filled, otherwise a mutated child of two parents
+        chosen by tournament.
+        """
+
+        if len(population) < self.population_size:
+            return self.generate_random_strategy()
+
+        father = self.choose_parent_by_tournament(population)
+        mother = self.choose_parent_by_tournament(population)
+        child = Evolver.create_child(father, mother)
+        self.mutate([child])
+
+        return child
+
+    def choose_parent_by_tournament(self, population):
+        """
+        Return the fittest of a few Strategies chosen at random from the
+        given population.
+        """
+
+        return max(self.rng.sample(population,
+                                   min(Evolver.TOURNAMENT_SIZE,
+                                       len(population))),
+                   key=lambda strategy: strategy.fitness)
+
+    def insert_into_population(self, population, strategy):
+        if len(population) < self.population_size:
+            population.append(strategy)
+            return
+
+        weakest = min(range(len(population)),
+                      key=lambda index: population[index].fitness)
+
+        if strategy.fitness > population[weakest].fitness:
+            population[weakest] = strategy
+
     def generate_initial_population(self):
         """
         Create a random base population of Strategies.
@@ -172,7 +822,7 @@ class Evolver:
 
         strategies = []
 
-        for strategy in range(Evolver.POPULATION_SIZE):
+        for strategy in range(self.population_size):
             strategies.append(self.generate_random_strategy())
 
         return strategies
@@ -185,44 +835,256 @@ class Evolver:
         crop_weightings = {}
 
         for crop in self.crops:
-            weighting = random.randint(1, 1000)
+            weighting = self.rng.randint(1, 1000)
             crop_weightings[crop] = weighting
 
-        field_ratio = random.random() * 2 + 1
+        field_ratio = self.rng.random() * 2 + 1
 
-        return Strategy(crop_weightings, field_ratio)
+        return Strategy(crop_weightings, field_ratio, self.cost_order)
 
-    def determine_fitness(self, current_generation):
+    def start_workers(self):
+        """
+        Start the pool of worker processes used to evaluate Strategies, if
+        this Evolver has been configured to use more than one.
+        """
+
+        if self.workers is None or self.workers <= 1 \
+                or self.executor is not None:
+            return
+
+        # Workers attach to the catalog and weather in shared memory, rather
+        # than each receiving their own copy
+        if self.weather_table is not None:
+            self.shared_tables = SharedTables.publish(
+                self.crops, self.fields, self.weather_table)
+            initargs = (self.max_years, self.initial_money, None, None,
+                        self.shared_tables.name,
+                        self.shared_tables.catalog_digest)
+        else:
+            initargs = (self.max_years, self.initial_money, self.crops,
+                        self.fields)
+
+        self.executor = ProcessPoolExecutor(
+            self.workers, initializer=initialise_worker, initargs=initargs)
+
+    def stop_workers(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+        if self.shared_tables is not None:
+            self.shared_tables.close()
+            self.shared_tables = None
+
+    def determine_fitness(self, current_generation, generation=0):
         """
         For each Strategy in the supplied generation, determine its fitness at
-        playing the game.
+        playing the game. Each Strategy is played using its own seed derived
+        from its generation and position, so results do not depend on which
+        process evaluates it.
         """
 
-        for strategy in current_generation:
-            self.evaluate_strategy(strategy)
+        seeds = [derive_seed(self.seed, "generation", generation, index)
+                 for index in range(len(current_generation))]
+
+        if self.fidelity_schedule:
+            self.evaluate_in_stages(current_generation, seeds, generation)
+        else:
+            self.evaluate_strategies(current_generation, seeds)
+
+    def evaluate_in_stages(self, strategies, seeds, generation):
+        """
+        Evaluate the given Strategies through each stage of the fidelity
+        schedule, promoting only the fittest of each stage to the next, and
+        finally evaluate those remaining in full. Strategies eliminated at a
+        stage keep their fitness from that stage, and are marked with it so
+        that they rank below every Strategy that got further.
+        """
+
+        audit = (self.fidelity_audit_interval is not None
+                 and generation % self.fidelity_audit_interval == 0)
+        candidates = list(range(len(strategies)))
+        stage_fitnesses = []
+
+        for strategy in strategies:
+            strategy.fidelity_stage = None
+
+        for number, stage in enumerate(self.fidelity_schedule):
+            self.evaluate_strategies(
+                [strategies[index] for index in candidates],
+                [derive_seed(seeds[index], "stage", number)
+                 for index in candidates],
+                stage.num_games, stage.max_years)
+            stage_fitnesses.append({index: strategies[index].fitness
+                                    for index in candidates})
+
+            if audit:
+                continue
+
+            candidates.sort(key=lambda index: -strategies[index].fitness)
+            promoted = stage.number_promoted(len(candidates))
+
+            for index in candidates[promoted:]:
+                strategies[index].fidelity_stage = number
+
+            candidates = candidates[:promoted]
+
+        self.evaluate_strategies([strategies[index] for index in candidates],
+                                 [seeds[index] for index in candidates])
+
+        # Correlations over only the promoted Strategies are biased, so are
+        # only measured in audits, when everyone is evaluated in full
+        if audit:
+            self.fidelity_correlations = [
+                spearman_correlation(
+                    [fitnesses[index] for index in candidates],
+                    [strategies[index].fitness for index in candidates])
+                for fitnesses in stage_fitnesses]
+
+    def evaluate_strategies(self, strategies, seeds, num_games=None,
+                            max_years=None):
+        """
+        Evaluate each Strategy with the corresponding seed, using the worker
+        pool if it is running, and return the ScoreStatistics of each. Games
+        may be cut short of the Evolver's own number of years.
+        """
 
-    def evaluate_strategy(self, strategy):
+        if self.executor is None:
+            start_time = time.perf_counter()
+            all_statistics = [
+                self.evaluate_strategy(strategy, seed, num_games, max_years)
+                for strategy, seed in zip(strategies, seeds)]
+            self.worker_seconds += time.perf_counter() - start_time
+
+            return all_statistics
+
+        num_games = num_games or self.num_games
+        max_years = max_years or self.max_years
+
+        # Only Strategies missing from the evaluation store are dispatched
+        pending = [(strategy, seed)
+                   for strategy, seed in zip(strategies, seeds)
+                   if not self.lookup_evaluation(strategy, seed, num_games,
+                                                 max_years)]
+        weightings = [[strategy.crop_weightings[crop] for crop in self.crops]
+                      for strategy, seed in pending]
+        field_ratios = [strategy.field_ratio for strategy, seed in pending]
+        chunk_size = max(1, len(pending) // (self.workers * 4))
+
+        results = self.executor.map(
+            evaluate_in_worker, weightings, field_ratios,
+            [seed for strategy, seed in pending], [num_games] * len(pending),
+            [max_years] * len(pending), chunksize=chunk_size)
+
+        for (strategy, seed), result in zip(pending, results):
+            self.record_evaluation(strategy, result)
+            self.store_evaluation(strategy, seed, num_games, max_years,
+                                  result[1])
+
+        return [strategy.score_statistics for strategy in strategies]
+
+    def record_evaluation(self, strategy, result):
         """
-        Exercise a single Strategy for the requisite number of games and store
-        its fitness.
+        Store the result of evaluating the given Strategy in a worker.
         """
 
-        input_provider = acs.input_providers.AIInputProvider(strategy)
-        scores = []
+        statistics, years_skipped, seconds = result
+        strategy.fitness = statistics.running.mean
+        strategy.score_statistics = statistics
+        self.games_played += statistics.running.count
+        self.years_skipped += years_skipped
+        self.worker_seconds += seconds
+
+    def lookup_evaluation(self, strategy, seed, num_games, max_years):
+        """
+        If the evaluation store holds an evaluation of the given Strategy
+        with the given seed, number of games and years, store it in the
+        Strategy and return True. Games played with a weather table are never
+        stored.
+        """
+
+        if self.evaluation_store is None or self.weather_table is not None:
+            return False
+
+        found = self.evaluation_store.get(
+            strategy.genome_hash(), max_years, self.initial_money, seed,
+            num_games)
+
+        if found is None:
+            return False
+
+        statistics, years_skipped = found
+        strategy.fitness = statistics.running.mean
+        strategy.score_statistics = statistics
+        self.years_skipped += years_skipped
+        self.store_hits += 1
+
+        return True
+
+    def store_evaluation(self, strategy, seed, num_games, max_years,
+                         years_skipped):
+        if self.evaluation_store is None or self.weather_table is not None:
+            return
+
+        self.evaluation_store.put(
+            strategy.genome_hash(), max_years, self.initial_money, seed,
+            num_games, strategy.score_statistics, years_skipped)
+
+    def evaluate_strategy(self, strategy, seed=None, num_games=None,
+                          max_years=None):
+        """
+        Exercise a single Strategy for the requisite number of games, store its
+        fitness and return the ScoreStatistics of its scores. Game N is played
+        with weather drawn from the stream (seed, "weather", N), or with the
+        weather table scenario chosen by that stream, so Strategies evaluated
+        with the same seed face the same weather.
+        """
+
+        if seed is None:
+            seed = self.rng.getrandbits(64)
+
+        num_games = num_games or self.num_games
+        max_years = max_years or self.max_years
+
+        if self.lookup_evaluation(strategy, seed, num_games, max_years):
+            return strategy.score_statistics
+
+        years_skipped_before = self.years_skipped
+        input_provider = acs.input_providers.AIInputProvider(
+            strategy, make_rng(seed, "decisions"))
+        statistics = ScoreStatistics()
 
         # Run Strategy through games
-        for i in range(Evolver.NUM_GAMES):
+        for i in range(num_games):
+            rng = None
+            weather_generator = None
+
+            if self.weather_table is None:
+                rng = make_rng(seed, "weather", i)
+            else:
+                weather_generator = self.weather_table.generator(
+                    derive_seed(seed, "weather", i))
+
             game = Game(
-                self.max_years,
+                max_years,
                 self.initial_money,
                 input_provider,
                 self.crops,
-                self.fields)
-            score = game.run()
-            scores.append(score)
+                self.fields,
+                self.trace_recorder,
+                rng,
+                weather_generator)
+            statistics.add(game.run())
+            self.games_played += 1
+            self.years_skipped += game.years_skipped
 
         # Calculate overall fitness
-        strategy.fitness = sum(scores) / len(scores)
+        strategy.fitness = statistics.running.mean
+        strategy.score_statistics = statistics
+        self.store_evaluation(strategy, seed, num_games, max_years,
+                              self.years_skipped - years_skipped_before)
+
+        return statistics
 
     @staticmethod
     def sum_fitness_of_strategies(strategies):
@@ -238,18 +1100,106 @@ class Evolver:
 
         return total_fitness
 
+    def summarise_generation(self, strategies):
+        """
+        For a list of Strategies whose fitness has been computed, accumulate
+        the distribution of their fitnesses and of all of their game scores,
+        without holding on to any individual scores.
+        """
+
+        fitness_statistics = ScoreStatistics(Evolver.GENERATION_QUANTILES)
+        game_statistics = RunningStatistics()
+
+        for strategy in strategies:
+            fitness_statistics.add(strategy.fitness)
+
+            if strategy.score_statistics is not None:
+                game_statistics.merge(strategy.score_statistics.running)
+
+        self.fitness_statistics = fitness_statistics
+        self.game_statistics = game_statistics
+
+    def measure_diversity(self, strategies):
+        """
+        Calculate the niche count of each of the given Strategies, and the
+        effective number of niches in the population.
+        """
+
+        points = [genome_vector(strategy, self.crops)
+                  for strategy in strategies]
+        self.niche_counts = niche_counts(
+            points, self.niche_radius or Evolver.NICHE_RADIUS)
+        self.diversity = effective_niches(self.niche_counts)
+
+    def selection_order(self, current_generation):
+        """
+        Return the given generation, sorted by fitness, in the order parents
+        should be selected from it. With fitness sharing, each Strategy's
+        fitness is divided by its niche count, so crowded genomes lose
+        their advantage.
+        """
+
+        if self.niche_radius is None:
+            return current_generation
+
+        shared_fitness = {id(strategy): strategy.fitness / count
+                          for strategy, count
+                          in zip(current_generation, self.niche_counts)}
+
+        return sorted(current_generation,
+                      key=lambda strategy: (-strategy.stages_passed(),
+                                            -shared_fitness[id(strategy)]))
+
     @staticmethod
-    def report_progress(current_generation, generation_number, average_fitness):
+    def report_progress(current_generation, generation_number,
+                        fitness_statistics, game_statistics, diversity=None,
+                        fidelity_correlations=None):
         """
         Give a summary of the current fitness of the generation as a whole, and
         list the weightings of the top few performers.
         """
 
         print("\n***** Generation " + str(generation_number + 1)
-              + " - Average Score: " + str(round(average_fitness)))
+              + " - Average Score: "
+              + str(round(fitness_statistics.running.mean)))
+        print("Fitness: " + fitness_statistics.summarise())
+        print("Games: " + str(game_statistics.count) + " played, sd "
+              + str(round(game_statistics.standard_deviation())) + " min "
+              + str(round(game_statistics.minimum)) + " max "
+              + str(round(game_statistics.maximum)))
+
+        if diversity is not None:
+            print("Effective niches: " + "{:.1f}".format(diversity))
+
+        if fidelity_correlations:
+            print("Rank correlation of each fidelity stage with full "
+                  "evaluation: " + ", ".join(
+                      "-" if correlation is None
+                      else "{:.2f}".format(correlation)
+                      for correlation in fidelity_correlations))
+
         Evolver.print_top_strategies(
             current_generation, Evolver.TOP_STRATEGIES_TO_REPORT)
 
+    def utilisation(self):
+        """
+        Return the fraction of the available worker time spent evaluating
+        Strategies while evolving.
+        """
+
+        if self.elapsed_seconds == 0:
+            return 0
+
+        return self.worker_seconds / (self.elapsed_seconds
+                                      * max(1, self.workers or 1))
+
+    def report_throughput(self):
+        print("\nGames per second: "
+              + str(round(self.games_played / max(self.elapsed_seconds,
+                                                  1e-9)))
+              + "  Worker utilisation: "
+              + "{:.0%}".format(self.utilisation()))
+
     @staticmethod
     def print_top_strategies(strategies, number_to_list):
         """
@@ -262,15 +1212,16 @@ class Evolver:
         for i in range(maximum):
             strategies[i].describe()
 
-    def breed_generation(self, current_generation):
+    def breed_generation(self, current_generation, population_size=None):
         """
         Combine the Strategies in the current generation into a population of
-        equal size, preferentially using traits of the highest performers.
+        equal (or the given) size, preferentially using traits of the highest
+        performers.
         """
 
         next_generation = []
 
-        for i in range(Evolver.POPULATION_SIZE):
+        for i in range(population_size or self.population_size):
 
             # Select parent Strategies
             father = self.choose_parent(current_generation)
@@ -303,7 +1254,8 @@ class Evolver:
         # Take average of field weightings from both Strategies
         child_field_ratio = 0.5 * (father.field_ratio + mother.field_ratio)
 
-        return Strategy(child_crop_weightings, child_field_ratio)
+        return Strategy(child_crop_weightings, child_field_ratio,
+                        father.crop_sampler.crops)
 
     def calculate_common_ratio(self):
         """
@@ -311,11 +1263,14 @@ class Evolver:
         geometric sequence used to select parent strategies.
         """
 
-        this_r = self.initial_selection_probability
-        size = Evolver.POPULATION_SIZE
+        initial_probability = self.initial_selection_probability
+        this_r = initial_probability
+        size = self.population_size
 
+        # The probabilities of the sequence must sum to 1, so
+        # p(1 - r^size) / (1 - r) = 1, i.e. r = 1 - p(1 - r^size)
         while True:
-            next_r = ((size - 2) + 2 * (this_r ** size)) / size
+            next_r = 1 - initial_probability * (1 - this_r ** size)
 
             if abs(next_r - this_r) < 0.000001:
                 return this_r
@@ -328,7 +1283,7 @@ class Evolver:
         (i.e. fitter) Strategies being advantaged.
         """
 
-        r = random.random()
+        r = self.rng.random()
         initial_probability = self.initial_selection_probability
         cumulative_probability = initial_probability
 
@@ -353,14 +1308,14 @@ class Evolver:
         """
 
         for strategy in current_generation:
-            r = random.random()
+            r = self.rng.random()
 
-            if r < Evolver.CHANCE_TO_MUTATE_CROP:
+            if r < self.chance_to_mutate_crop:
                 self.mutate_crop_weighting(strategy)
 
             # If mutating field ratio, add or subtract up to the size constant
-            if r < Evolver.CHANCE_TO_MUTATE_FIELD:
-                Evolver.mutate_field_ratio(strategy)
+            if r < self.chance_to_mutate_field:
+                self.mutate_field_ratio(strategy)
 
     def mutate_crop_weighting(self, strategy):
         """
@@ -369,24 +1324,73 @@ class Evolver:
 
         # Determine which crop's weighting to change
         weighting_to_change = \
-            int(round(random.random() * (len(self.crops) - 1)))
+            int(round(self.rng.random() * (len(self.crops) - 1)))
 
         # Generate new weighting
-        new_weighting = int(round(random.random() * 100))
+        new_weighting = int(round(self.rng.random() * 100))
 
         # Replace weighting in Strategy
         strategy.replace_weighting(
             self.crops[weighting_to_change], new_weighting)
 
-    @staticmethod
-    def mutate_field_ratio(strategy):
+    def mutate_field_ratio(self, strategy):
         """
         Mutate the given Strategy's field ratio by up to the known maximum
         mutation size.
         """
 
         # Generate field ratio delta
-        delta = (random.random() * 2 - 1) * Evolver.FIELD_MUTATION_SIZE
+        delta = (self.rng.random() * 2 - 1) * self.field_mutation_size
 
         # Modify field ratio in Strategy
         strategy.field_ratio += delta
+
+
+# Evolver used by a worker process to evaluate Strategies, and the shared
+# tables it is attached to, if any.
+worker_evolver = None
+worker_tables = None
+
+
+def initialise_worker(max_years, initial_money, crops, fields,
+                      shared_tables_name=None, catalog_digest=None):
+    """
+    Set up a worker process, using the given catalog or attaching to the
+    named shared tables for its catalog and weather.
+    """
+
+    global worker_evolver, worker_tables
+    weather_table = None
+
+    # A stop is requested of the parent, which finishes the generation and
+    # then shuts the workers down
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    if shared_tables_name is not None:
+        worker_tables = SharedTables.attach(shared_tables_name,
+                                            catalog_digest)
+        crops = worker_tables.crops
+        fields = worker_tables.fields
+        weather_table = worker_tables.weather_table
+
+    worker_evolver = Evolver(max_years, initial_money, crops, fields,
+                             verbose=False, weather_table=weather_table)
+
+
+def evaluate_in_worker(weightings, field_ratio, seed, num_games,
+                       max_years=None):
+    """
+    Evaluate a Strategy, given as its crop weightings in catalog order, in a
+    worker process and return its ScoreStatistics, the number of years
+    skipped and the time taken.
+    """
+
+    start_time = time.perf_counter()
+    strategy = Strategy(dict(zip(worker_evolver.crops, weightings)),
+                        field_ratio, worker_evolver.cost_order)
+    years_skipped_before = worker_evolver.years_skipped
+    statistics = worker_evolver.evaluate_strategy(strategy, seed, num_games,
+                                                  max_years)
+
+    return (statistics, worker_evolver.years_skipped - years_skipped_before,
+            time.perf_counter() - start_time)
@@ -0,0 +1,80 @@
+import argparse
+import os
+
+from acs.ai import *
+from acs.data_reader import DataReader
+from acs.evaluation_store import EvaluationStore
+from acs.launchers import Launcher
+from acs.progress_server import ProgressMonitor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Find the best Strategy possible within a time or game "
+                    "budget. The best Strategy so far is kept in the best "
+                    "file, and SIGTERM stops the run cleanly.")
+    parser.add_argument("--minutes", type=float,
+                        help="wall-clock budget in minutes")
+    parser.add_argument("--games", type=int,
+                        help="budget in simulated games")
+    parser.add_argument("--best", default="best_strategy.json",
+                        help="file holding the best Strategy so far")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--store",
+                        help="evaluation store file shared between runs")
+    parser.add_argument("--fidelity-stage", type=FidelityStage.parse,
+                        action="append",
+                        metavar="MAX_YEARS:NUM_GAMES:PROMOTE_FRACTION",
+                        help="cheap evaluation stage to pass before full "
+                             "evaluation (repeatable)")
+    parser.add_argument("--fidelity-audit-interval", type=int, default=10)
+    parser.add_argument("--progress", type=ProgressMonitor.parse_address,
+                        metavar="HOST:PORT|SOCKET_PATH",
+                        help="serve live progress as JSON over HTTP on this "
+                             "local address or Unix socket")
+    arguments = parser.parse_args()
+
+    if arguments.minutes is None and arguments.games is None:
+        parser.error("give a budget with --minutes and/or --games")
+
+    data_reader = DataReader()
+    crops = data_reader.import_crops()
+    fields = data_reader.import_fields()
+    evaluation_store = None
+
+    if arguments.store is not None:
+        evaluation_store = EvaluationStore.for_catalog(
+            arguments.store, crops, fields, data_reader.crops_file_name,
+            data_reader.fields_file_name)
+
+    progress_monitor = None
+
+    if arguments.progress is not None:
+        progress_monitor = ProgressMonitor(arguments.progress)
+        print("Serving progress on", progress_monitor.start())
+
+    evolver = Evolver(
+        Launcher.MAX_YEARS, Launcher.INITIAL_MONEY, crops, fields,
+        seed=arguments.seed, workers=arguments.workers,
+        evaluation_store=evaluation_store,
+        time_budget=(arguments.minutes * 60
+                     if arguments.minutes is not None else None),
+        game_budget=arguments.games, best_file_name=arguments.best,
+        fidelity_schedule=arguments.fidelity_stage,
+        fidelity_audit_interval=arguments.fidelity_audit_interval,
+        progress_monitor=progress_monitor)
+
+    try:
+        evolver.evolve()
+    finally:
+        if evaluation_store is not None:
+            evaluation_store.close()
+
+        if progress_monitor is not None:
+            progress_monitor.stop()
+
+    print("\n********* Best Strategy *********\n")
+    evolver.best_strategy.describe()
+    print("Games played:", evolver.games_played,
+          " Stopped early:", evolver.stop_requested)
@@ -1,4 +1,5 @@
 from acs.farm import *
+import hashlib
 import json
 
 
@@ -7,13 +8,17 @@ class DataReader:
     crops_file_name = "../crops.dat"
     fields_file_name = "../fields.dat"
 
+    def __init__(self, crops_file_name=None, fields_file_name=None):
+        self.crops_file_name = crops_file_name or DataReader.crops_file_name
+        self.fields_file_name = fields_file_name or DataReader.fields_file_name
+
 
     def import_crops(self):
 
         imported_crops = []
 
         try:
-            raw_crops = self.read_data(DataReader.crops_file_name)
+            raw_crops = self.read_data(self.crops_file_name)
 
             for crop in raw_crops["crops"]:
 
@@ -41,7 +46,7 @@ class DataReader:
         imported_fields = []
 
         try:
-            raw_fields = self.read_data(DataReader.fields_file_name)
+            raw_fields = self.read_data(self.fields_file_name)
 
             for field in raw_fields["fields"]:
 
@@ -67,3 +72,25 @@ class DataReader:
             data = json.load(data_file)
 
         return data
+
+
+    @staticmethod
+    def catalog_digest(crops, fields):
+        """
+        Return a hex digest identifying the contents of the given catalog, so
+        that anything derived from it can be invalidated when it changes.
+        """
+
+        contents = {
+            "crops": [[crop.id, crop.name, crop.description, crop.cost,
+                       crop.sale_price, crop.ideal_heat, crop.ideal_wetness,
+                       crop.heat_sensitivity, crop.wetness_sensitivity]
+                      for crop in crops],
+            "fields": [[field.id, field.name, field.description,
+                        field.max_crop_quantity, field.soil_quality,
+                        field.price]
+                       for field in fields]
+        }
+
+        return hashlib.sha256(
+            json.dumps(contents, sort_keys=True).encode("utf-8")).hexdigest()
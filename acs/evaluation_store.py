@@ -0,0 +1,135 @@
+import pickle
+import sqlite3
+
+from acs.data_reader import DataReader
+
+
+class EvaluationStore:
+    """
+    Class representing an on-disk store of Strategy evaluations, shared
+    between runs and processes. Each evaluation is keyed by the Strategy's
+    genome hash, the game parameters, the seed and the number of games, and
+    belongs to the catalog it was played with. When a named catalog's
+    contents change, the evaluations made with its old contents are deleted.
+
+    Writes are batched, and the database uses write-ahead logging so that
+    any number of processes can read while one writes.
+    """
+
+    BATCH_SIZE = 100
+
+    # Seconds to wait for another process's write to finish.
+    TIMEOUT = 30
+
+    def __init__(self, file_name, catalog_digest, catalog_name=None):
+        self.file_name = file_name
+        self.catalog_digest = catalog_digest
+        self.pending = {}
+        self.connection = sqlite3.connect(file_name,
+                                          timeout=EvaluationStore.TIMEOUT)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "catalog_digest TEXT, genome_hash TEXT, max_years INTEGER, "
+                "initial_money INTEGER, seed TEXT, num_games INTEGER, "
+                "statistics BLOB, years_skipped INTEGER, "
+                "PRIMARY KEY (catalog_digest, genome_hash, max_years, "
+                "initial_money, seed, num_games))")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS catalogs ("
+                "name TEXT PRIMARY KEY, digest TEXT)")
+
+        if catalog_name is not None:
+            self.invalidate_stale(catalog_name)
+
+    @staticmethod
+    def for_catalog(file_name, crops, fields, crops_file_name,
+                    fields_file_name):
+        """
+        Open the store for the catalog read from the given files, discarding
+        evaluations made before the files last changed.
+        """
+
+        return EvaluationStore(file_name,
+                               DataReader.catalog_digest(crops, fields),
+                               crops_file_name + "|" + fields_file_name)
+
+    def invalidate_stale(self, catalog_name):
+        """
+        Record the current digest of the named catalog, deleting all
+        evaluations made with any previous contents.
+        """
+
+        with self.connection:
+            row = self.connection.execute(
+                "SELECT digest FROM catalogs WHERE name = ?",
+                (catalog_name,)).fetchone()
+
+            if row is not None and row[0] != self.catalog_digest:
+                self.connection.execute(
+                    "DELETE FROM evaluations WHERE catalog_digest = ?",
+                    (row[0],))
+
+            self.connection.execute(
+                "INSERT OR REPLACE INTO catalogs VALUES (?, ?)",
+                (catalog_name, self.catalog_digest))
+
+    def get(self, genome_hash, max_years, initial_money, seed, num_games):
+        """
+        Return the ScoreStatistics and number of years skipped of a stored
+        evaluation, or None if there is none.
+        """
+
+        # Seeds are stored as text, as they may exceed SQLite's integers
+        key = (self.catalog_digest, genome_hash, max_years, initial_money,
+               str(seed), num_games)
+        row = self.pending.get(key)
+
+        if row is None:
+            row = self.connection.execute(
+                "SELECT statistics, years_skipped FROM evaluations WHERE "
+                "catalog_digest = ? AND genome_hash = ? AND max_years = ? AND "
+                "initial_money = ? AND seed = ? AND num_games = ?",
+                key).fetchone()
+
+        if row is None:
+            return None
+
+        return pickle.loads(row[0]), row[1]
+
+    def put(self, genome_hash, max_years, initial_money, seed, num_games,
+            statistics, years_skipped):
+        """
+        Queue an evaluation to be stored, writing the queue once it is full.
+        """
+
+        key = (self.catalog_digest, genome_hash, max_years, initial_money,
+               str(seed), num_games)
+        self.pending[key] = (pickle.dumps(statistics), years_skipped)
+
+        if len(self.pending) >= EvaluationStore.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO evaluations VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?)",
+                [key + value for key, value in self.pending.items()])
+
+        self.pending = {}
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,5 +1,11 @@
+from acs.rendering import *
+
+
 class Farm:
 
+    __slots__ = ("owned_fields", "money", "current_year_expenditure",
+                 "current_year_new_assets")
+
     def __init__(self, owned_fields, initial_money):
         self.owned_fields = owned_fields
         self.money = initial_money
@@ -9,6 +15,10 @@ class Farm:
 
 class Field:
 
+    __slots__ = ("id", "name", "description", "max_crop_quantity",
+                 "soil_quality", "price", "last_revenue", "crop",
+                 "crop_quantity")
+
     def __init__(self,
                  id,
                  name,
@@ -27,6 +37,15 @@ class Field:
         self.crop = None
         self.crop_quantity = 0
 
+    def copy(self):
+        """
+        Return an empty copy of this field, for a game which must not share
+        field state with others running at the same time.
+        """
+
+        return Field(self.id, self.name, self.description,
+                     self.max_crop_quantity, self.soil_quality, self.price)
+
     def clear(self):
         self.crop = None
         self.crop_quantity = None
@@ -39,35 +58,26 @@ class Field:
     def is_empty(self):
         return self.crop is None
 
-    def report_status(self):
+    def report_status(self, file=None):
 
         """
-        Print a summary of this field's properties and contents.
+        Print a summary of this field's properties and contents to the given
+        file (standard output by default).
         """
 
-        if self.crop is None:
-            print(self.name, "-", self.description)
-            print("Value:", self.price, " Size:", self.max_crop_quantity)
-            print("Contents: None\n")
-        else:
-            print(self.name, "-", self.description)
-            print("Value:", self.price, " Size:", self.max_crop_quantity)
-            print("Contents:", self.crop.name, "(", self.crop_quantity, ")\n")
+        write_report(render_field_status(self), file)
 
-    def report_performance(self):
+    def report_performance(self, file=None):
 
         """
-        Print a summary of this field's financial performance this year, unless
-        it was empty, in which case do nothing.
+        Print a summary of this field's financial performance this year to the
+        given file, unless it was empty, in which case do nothing.
         """
 
         if self.is_empty():
             return
 
-        expenditure = self.crop.cost * self.crop_quantity
-
-        print(self.name, "-", self.crop.name, ", Revenue", self.last_revenue,
-              ", Cost", expenditure)
+        write_report(render_field_performance(self), file)
 
     def calculate_income(self, weather):
 
@@ -97,6 +107,10 @@ class Field:
 
 class Crop:
 
+    __slots__ = ("id", "name", "description", "cost", "sale_price",
+                 "ideal_heat", "ideal_wetness", "heat_sensitivity",
+                 "wetness_sensitivity")
+
     def __init__(self,
                  id,
                  name,
@@ -117,6 +131,5 @@ class Crop:
         self.heat_sensitivity = heat_sensitivity
         self.wetness_sensitivity = wetness_sensitivity
 
-    def describe(self):
-        print(self.name, "-", self.description)
-        print("Cost:", self.cost, "  Sale price:", self.sale_price, "\n")
+    def describe(self, file=None):
+        write_report(render_crop(self), file)
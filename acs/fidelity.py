@@ -0,0 +1,81 @@
+import math
+
+
+class FidelityStage:
+    """
+    Class representing a cheap, low-fidelity stage of evaluation: every
+    Strategy reaching the stage plays the given number of games of the given
+    number of years, and only the given fraction of them, the fittest, is
+    promoted to the next stage.
+    """
+
+    __slots__ = ("max_years", "num_games", "promote_fraction")
+
+    def __init__(self, max_years, num_games, promote_fraction):
+        self.max_years = max_years
+        self.num_games = num_games
+        self.promote_fraction = promote_fraction
+
+    def number_promoted(self, number_evaluated):
+        return max(1, math.ceil(number_evaluated * self.promote_fraction))
+
+    @staticmethod
+    def parse(text):
+        """
+        Create a FidelityStage from text of the form
+        "max_years:num_games:promote_fraction", e.g. "5:5:0.3".
+        """
+
+        max_years, num_games, promote_fraction = text.split(":")
+
+        return FidelityStage(int(max_years), int(num_games),
+                             float(promote_fraction))
+
+
+def ranks(values):
+    """
+    Return the rank of each of the given values, giving tied values the mean
+    of the ranks they span.
+    """
+
+    order = sorted(range(len(values)), key=lambda index: values[index])
+    result = [0] * len(values)
+    start = 0
+
+    while start < len(order):
+        end = start
+
+        while end + 1 < len(order) and \
+                values[order[end + 1]] == values[order[start]]:
+            end += 1
+
+        for position in range(start, end + 1):
+            result[order[position]] = (start + end) / 2
+
+        start = end + 1
+
+    return result
+
+
+def spearman_correlation(xs, ys):
+    """
+    Return Spearman's rank correlation between two lists of values, or None
+    if it is undefined.
+    """
+
+    if len(xs) < 3:
+        return None
+
+    x_ranks = ranks(xs)
+    y_ranks = ranks(ys)
+    mean = (len(xs) - 1) / 2
+
+    covariance = sum((x - mean) * (y - mean)
+                     for x, y in zip(x_ranks, y_ranks))
+    x_spread = math.sqrt(sum((x - mean) ** 2 for x in x_ranks))
+    y_spread = math.sqrt(sum((y - mean) ** 2 for y in y_ranks))
+
+    if x_spread == 0 or y_spread == 0:
+        return None
+
+    return covariance / (x_spread * y_spread)
@@ -3,12 +3,18 @@ from acs.data_reader import *
 from acs.farm import *
 from acs.input_providers import *
 from acs.weather import *
+from types import MappingProxyType
 import math
 
 
 class Game:
 
-    heat_bands = [
+    # Read-only numbered dictionaries of the shared Action instances, for
+    # each combination of (can plant, can buy fields). They are handed to
+    # every input provider in every game, so must not be modified.
+    numbered_actions = {}
+
+    heat_bands = WeatherBands([
         WeatherBand(-3.0, "This was a glacial year "),
         WeatherBand(-2.5, "This was a freezing year "),
         WeatherBand(-2.0, "This was a frigid year "),
@@ -20,9 +26,9 @@ class Game:
         WeatherBand(1.5, "This was a sultry year "),
         WeatherBand(2.0, "This was a sweltering year "),
         WeatherBand(2.5, "This was a scorching year "),
-    ]
+    ])
 
-    wetness_bands = [
+    wetness_bands = WeatherBands([
         WeatherBand(-3.0, "with an arid climate."),
         WeatherBand(-2.5, "with minimal precipitation."),
         WeatherBand(-2.0, "with scattered drizzle."),
@@ -34,9 +40,10 @@ class Game:
         WeatherBand(1.5, "with some squalling."),
         WeatherBand(2.0, "with torrential downpours."),
         WeatherBand(2.5, "with monsoon storms."),
-    ]
+    ])
 
-    def __init__(self, max_years, initial_money, input_provider, crops, fields):
+    def __init__(self, max_years, initial_money, input_provider, crops, fields,
+                 trace_recorder=None, rng=None, weather_generator=None):
         self.available_crops = crops
         self.available_fields = fields.copy()
         self.input_provider = input_provider
@@ -48,8 +55,13 @@ class Game:
         self.max_years = max_years
         self.current_year = 1
         self.exiting = False
-        self.weather_generator = WeatherGenerator()
+        self.weather_generator = weather_generator or WeatherGenerator(rng)
         self.lowest_crop_cost = self.get_lowest_crop_cost()
+        self.trace_recorder = trace_recorder
+        self.trace = None
+
+        # Number of years not simulated because their outcome was fixed.
+        self.years_skipped = 0
 
     def get_lowest_crop_cost(self):
 
@@ -76,7 +88,7 @@ class Game:
         Main game loop.
         """
 
-        self.input_provider.show_greeting(self.max_years)
+        self.start()
 
         while True:
 
@@ -85,20 +97,45 @@ class Game:
             if action is None:
                 continue
 
-            action.execute()
+            action.execute(self)
 
-            if self.exiting:
+            if self.end_turn(action):
                 break
 
-            if action.should_end_round():
-                self.advance_year()
+        return self.finish()
 
-            if self.current_year == self.max_years:
-                break
+    def start(self):
+        self.input_provider.show_greeting(self.max_years)
+
+        if self.trace_recorder is not None:
+            self.trace = self.trace_recorder.start_game(self)
+
+    def end_turn(self, action):
+        """
+        Advance to the next year if the given Action ends the round, and
+        return whether the game is over.
+        """
+
+        if self.exiting:
+            return True
 
+        if action.should_end_round():
+            self.advance_year()
+
+            # Skip straight to the final score if nothing can change it
+            if self.input_provider.fast_forward and self.is_absorbed():
+                self.years_skipped = self.max_years - self.current_year
+                return True
+
+        return self.current_year == self.max_years
+
+    def finish(self):
         score = self.calculate_final_score()
         self.input_provider.show_final_score(score)
 
+        if self.trace is not None:
+            self.trace.record_end(score)
+
         return score
 
     def decide_action(self):
@@ -110,21 +147,30 @@ class Game:
         Create a numbered dictionary of Actions based on the current situation.
         """
 
-        actions = [
-            StatusAction(self),
-            ListCropsAction(self)
-        ]
+        can_plant = (self.is_empty_field_available()
+                     and not self.is_player_bankrupt())
+        can_buy = self.are_fields_available_to_buy()
+        key = (can_plant, can_buy)
 
-        if self.is_empty_field_available() and not self.is_player_bankrupt():
-            actions.append(PlantCropsAction(self))
+        if key not in Game.numbered_actions:
+            actions = [
+                STATUS_ACTION,
+                LIST_CROPS_ACTION
+            ]
 
-        if self.are_fields_available_to_buy():
-            actions.append(BuyFieldsAction(self))
+            if can_plant:
+                actions.append(PLANT_CROPS_ACTION)
 
-        actions.append(PlayAction(self))
-        actions.append(ExitAction(self))
+            if can_buy:
+                actions.append(BUY_FIELDS_ACTION)
 
-        return self.make_numbered_dictionary(actions)
+            actions.append(PLAY_ACTION)
+            actions.append(EXIT_ACTION)
+
+            Game.numbered_actions[key] = MappingProxyType(
+                self.make_numbered_dictionary(actions))
+
+        return Game.numbered_actions[key]
 
     def is_empty_field_available(self):
         for field in self.farm.owned_fields:
@@ -220,6 +266,9 @@ class Game:
         self.farm.current_year_expenditure += selected_field.price
         self.farm.current_year_new_assets += selected_field.price
 
+        if self.trace is not None:
+            self.trace.record_purchase(self.current_year, selected_field)
+
     @staticmethod
     def make_numbered_dictionary(ordered_list):
         new_dict = {}
@@ -244,6 +293,11 @@ class Game:
         self.input_provider.report_financials(income, expenditure, new_assets)
         self.input_provider.report_field_performance(self.farm.owned_fields)
 
+        if self.trace is not None:
+            self.trace.record_year(
+                self.current_year, weather, income, expenditure, new_assets,
+                self.farm.owned_fields, self.farm.money + income)
+
         # Register results in game state
         self.current_year += 1
         self.farm.money += income
@@ -276,8 +330,113 @@ class Game:
     def is_player_bankrupt(self):
         return self.farm.money < self.lowest_crop_cost
 
+    def is_absorbed(self):
+        """
+        Return whether the farm's money and assets can no longer change: no
+        crops are growing, and no crop or field is affordable.
+        """
+
+        return (self.is_player_bankrupt()
+                and not self.are_fields_available_to_buy()
+                and not any(not field.is_empty()
+                            for field in self.farm.owned_fields))
+
     def calculate_final_score(self):
         return self.farm.money + self.calculate_assets()
 
     def exit(self):
         self.exiting = True
+
+
+class AsyncGame(Game):
+    """
+    Class representing a Game whose decisions are awaited from an input
+    provider with coroutine decide methods, so that many games can be played
+    at once on one event loop. Planting and buying mirror Game's, and
+    everything else is shared with Game and runs without yielding to other
+    games.
+    """
+
+    async def run(self):
+        self.start()
+
+        while True:
+
+            action = await self.decide_action()
+
+            if action is None:
+                continue
+
+            # Planting and buying return the coroutines making their decisions
+            decisions = action.execute(self)
+
+            if decisions is not None:
+                await decisions
+
+            if self.end_turn(action):
+                break
+
+        return self.finish()
+
+    async def decide_action(self):
+        actions = self.build_actions()
+        return await self.input_provider.decide_action(self, actions)
+
+    async def plant_crops(self):
+        """
+        Plant crops as Game.plant_crops does, awaiting each decision.
+        """
+
+        empty_fields = [field for field in self.farm.owned_fields
+                        if field.is_empty()]
+        selected_field = await self.input_provider.decide_field_to_plant(
+            Game.make_numbered_dictionary(empty_fields))
+
+        if selected_field is None:
+            return
+
+        affordable_crops = [crop for crop in self.available_crops
+                            if crop.cost <= self.farm.money]
+        selected_crop = await self.input_provider.decide_crop_to_plant(
+            Game.make_numbered_dictionary(affordable_crops))
+
+        if selected_crop is None:
+            return
+
+        maximum_crop_quantity = min(
+            math.floor(self.farm.money / selected_crop.cost),
+            selected_field.max_crop_quantity)
+        quantity_to_plant = await self.input_provider.decide_crop_quantity(
+            maximum_crop_quantity)
+
+        if quantity_to_plant is None:
+            return
+
+        selected_field.plant(selected_crop, quantity_to_plant)
+
+        total_crop_cost = selected_crop.cost * quantity_to_plant
+        self.farm.money -= total_crop_cost
+        self.farm.current_year_expenditure += total_crop_cost
+
+    async def buy_fields(self):
+        """
+        Buy a field as Game.buy_fields does, awaiting the decision.
+        """
+
+        affordable_fields = [field for field in self.available_fields
+                             if field.price < self.farm.money]
+        selected_field = await self.input_provider.decide_field_to_buy(
+            Game.make_numbered_dictionary(affordable_fields))
+
+        if selected_field is None:
+            return
+
+        self.available_fields.remove(selected_field)
+        self.farm.owned_fields.append(selected_field)
+
+        self.farm.money -= selected_field.price
+        self.farm.current_year_expenditure += selected_field.price
+        self.farm.current_year_new_assets += selected_field.price
+
+        if self.trace is not None:
+            self.trace.record_purchase(self.current_year, selected_field)
@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+
+from acs.data_reader import DataReader
+from acs.game import *
+from acs.launchers import Launcher
+
+
+class GameServer:
+    """
+    Class hosting interactive games for any number of players connected over
+    TCP, all on one event loop. Each connection plays one AsyncGame through a
+    StreamInputProvider, with its own copies of the fields, as Field objects
+    hold the state of the game they are in.
+    """
+
+    # Connections waiting to be accepted, enough for many players arriving
+    # at once.
+    BACKLOG = 1024
+
+    def __init__(self, max_years, initial_money, crops, fields,
+                 advisor_table=None):
+        self.max_years = max_years
+        self.initial_money = initial_money
+        self.crops = crops
+        self.fields = fields
+        self.advisor_table = advisor_table
+        self.active_sessions = 0
+        self.completed_sessions = 0
+        self.abandoned_sessions = 0
+
+    async def start(self, host, port):
+        """
+        Start listening, and return the asyncio Server.
+        """
+
+        return await asyncio.start_server(self.play_session, host, port,
+                                          backlog=GameServer.BACKLOG)
+
+    async def play_session(self, reader, writer):
+        advisor = None
+
+        if self.advisor_table is not None:
+            advisor = Advisor(self.advisor_table)
+
+        input_provider = StreamInputProvider(reader, writer, advisor)
+        game = AsyncGame(self.max_years, self.initial_money, input_provider,
+                         self.crops, [field.copy() for field in self.fields])
+        self.active_sessions += 1
+
+        try:
+            await game.run()
+            input_provider.output.flush()
+            await writer.drain()
+            self.completed_sessions += 1
+        except (EOFError, ConnectionError):
+            self.abandoned_sessions += 1
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(server, host, port):
+    listener = await server.start(host, port)
+    print("Serving games on", host, "port", port)
+
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Host interactive games for many players over TCP, e.g. "
+                    "with 'nc localhost 8023'.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8023)
+    parser.add_argument("--advice",
+                        help="decision table written by acs.advice_export")
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    advisor_table = None
+
+    if arguments.advice is not None:
+        advisor_table = DecisionTable.load(arguments.advice)
+
+    game_server = GameServer(Launcher.MAX_YEARS, Launcher.INITIAL_MONEY,
+                             data_reader.import_crops(),
+                             data_reader.import_fields(), advisor_table)
+
+    try:
+        asyncio.run(serve(game_server, arguments.host, arguments.port))
+    except KeyboardInterrupt:
+        pass
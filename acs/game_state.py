@@ -0,0 +1,248 @@
+import random
+
+from acs.weather import WeatherGenerator
+
+
+class GameState:
+    """
+    Class representing a compact, forkable snapshot of a Game: the year, the
+    farm's money, the owned fields in order of purchase, and the crop and
+    quantity growing in each of them. Fields and crops are held as indices
+    into a GameSimulator's catalog and the sequences are immutable tuples, so
+    forking copies four references and never touches the shared Field
+    objects.
+    """
+
+    __slots__ = ("year", "money", "owned", "planted", "quantities")
+
+    def __init__(self, year, money, owned, planted, quantities):
+        self.year = year
+        self.money = money
+        self.owned = owned
+        self.planted = planted
+        self.quantities = quantities
+
+    def fork(self):
+        return GameState(self.year, self.money, self.owned, self.planted,
+                         self.quantities)
+
+
+class GameSimulator:
+    """
+    Class playing the game on GameStates instead of Games, for lookahead.
+
+    Moves are small integers: PLAY advances to harvest, BUY + i buys catalog
+    field i and first_plant_move + j plants catalog crop j, at the maximum
+    affordable quantity, in the first empty field, as AIInputProviders do.
+    Weather is drawn from a pool sampled once from the game's weather
+    distribution, and the yield of every crop in every pooled year is
+    precomputed, so a harvest costs a table lookup per year and a product per
+    field.
+    """
+
+    PLAY = 0
+    BUY = 1
+
+    # Number of years of weather pre-drawn into the pool.
+    WEATHER_POOL_SIZE = 4096
+
+    # Rollouts buy fields costing less than money / FIELD_RATIO.
+    FIELD_RATIO = 2
+
+    def __init__(self, max_years, crops, fields, rng=None):
+        self.max_years = max_years
+        self.crops = crops
+        self.fields = fields
+        self.rng = rng or random.Random()
+        self.first_plant_move = GameSimulator.BUY + len(fields)
+
+        self.crop_indices = {crop.id: i for i, crop in enumerate(crops)}
+        self.field_indices = {field.id: i for i, field in enumerate(fields)}
+        self.costs = [crop.cost for crop in crops]
+        self.prices = [field.price for field in fields]
+        self.sizes = [field.max_crop_quantity for field in fields]
+        self.lowest_crop_cost = min(self.costs)
+
+        weather_generator = WeatherGenerator(self.rng)
+        self.yields = []
+
+        for i in range(GameSimulator.WEATHER_POOL_SIZE):
+            weather = weather_generator.generate()
+            self.yields.append([
+                1 - abs(weather.heat - crop.ideal_heat)
+                * crop.heat_sensitivity
+                - abs(weather.wetness - crop.ideal_wetness)
+                * crop.wetness_sensitivity
+                for crop in crops])
+
+        # Sale value of one unit of each crop grown in each field
+        self.unit_values = [
+            [crop.sale_price * field.soil_quality for crop in crops]
+            for field in fields]
+
+        # Crops worth planting in each field, best expected margin first
+        mean_yields = [sum(year[j] for year in self.yields) / len(self.yields)
+                       for j in range(len(crops))]
+        self.planting_choices = []
+
+        for values in self.unit_values:
+            margins = [(mean_yields[j] * values[j] - self.costs[j], j)
+                       for j in range(len(crops))]
+            self.planting_choices.append(
+                [(self.costs[j], j) for margin, j in sorted(margins,
+                                                            reverse=True)
+                 if margin > 0])
+
+        self.fields_by_price = sorted(range(len(fields)),
+                                      key=lambda i: self.prices[i])
+
+    def snapshot(self, game):
+        """
+        Return a GameState capturing the given Game.
+        """
+
+        owned_fields = game.farm.owned_fields
+
+        return GameState(
+            game.current_year,
+            game.farm.money,
+            tuple(self.field_indices[field.id] for field in owned_fields),
+            tuple(-1 if field.is_empty() else self.crop_indices[field.crop.id]
+                  for field in owned_fields),
+            tuple(field.crop_quantity or 0 for field in owned_fields))
+
+    def is_over(self, state):
+        return state.year >= self.max_years
+
+    def score(self, state):
+        return state.money + sum(self.prices[i] for i in state.owned)
+
+    def legal_moves(self, state):
+        """
+        Return the moves available in the given state. Crops expected to lose
+        money in the first empty field are left out.
+        """
+
+        if state.year >= self.max_years:
+            return []
+
+        money = state.money
+        moves = [GameSimulator.PLAY]
+
+        if money >= self.lowest_crop_cost and -1 in state.planted:
+            field = state.owned[state.planted.index(-1)]
+
+            for cost, crop in self.planting_choices[field]:
+                if cost <= money:
+                    moves.append(self.first_plant_move + crop)
+
+        for field, price in enumerate(self.prices):
+            if price < money and field not in state.owned:
+                moves.append(GameSimulator.BUY + field)
+
+        return moves
+
+    def apply(self, state, move):
+        """
+        Make the given move in the given state, which is changed in place.
+        """
+
+        if move == GameSimulator.PLAY:
+            self.harvest(state)
+        elif move < self.first_plant_move:
+            field = move - GameSimulator.BUY
+            state.money -= self.prices[field]
+            state.owned += (field,)
+            state.planted += (-1,)
+            state.quantities += (0,)
+        else:
+            crop = move - self.first_plant_move
+            position = state.planted.index(-1)
+            cost = self.costs[crop]
+            quantity = min(state.money // cost,
+                           self.sizes[state.owned[position]])
+            state.money -= cost * quantity
+            state.planted = (state.planted[:position] + (crop,)
+                             + state.planted[position + 1:])
+            state.quantities = (state.quantities[:position] + (quantity,)
+                                + state.quantities[position + 1:])
+
+    def harvest(self, state):
+        yields = self.yields[int(self.rng.random() * len(self.yields))]
+        income = 0
+
+        for field, crop, quantity in zip(state.owned, state.planted,
+                                         state.quantities):
+            if crop >= 0:
+                income += int(yields[crop] * quantity
+                              * self.unit_values[field][crop])
+
+        state.money += income
+        state.year += 1
+        state.planted = (-1,) * len(state.owned)
+        state.quantities = (0,) * len(state.owned)
+
+    def rollout(self, state):
+        """
+        Play the rest of the game from the given state, which is left
+        unchanged, and return the final score. Each year fields are bought
+        while they cost less than money / FIELD_RATIO, then every empty field
+        is planted with the affordable crop of the best expected margin.
+        """
+
+        random = self.rng.random
+        yields = self.yields
+        pool_size = len(yields)
+        unit_values = self.unit_values
+        planting_choices = self.planting_choices
+        sizes = self.sizes
+        prices = self.prices
+        lowest_crop_cost = self.lowest_crop_cost
+        field_ratio = GameSimulator.FIELD_RATIO
+
+        money = state.money
+        owned = list(state.owned)
+        available = [field for field in self.fields_by_price
+                     if field not in owned]
+
+        # Crops already growing, as (crop, field) pairs and their quantities
+        growing = [(crop, field, quantity) for field, crop, quantity
+                   in zip(owned, state.planted, state.quantities)
+                   if crop >= 0]
+        empty = [field for field, crop in zip(owned, state.planted)
+                 if crop < 0]
+
+        for year in range(state.year, self.max_years):
+
+            # Buy fields, cheapest first
+            while available and prices[available[0]] * field_ratio < money:
+                field = available.pop(0)
+                money -= prices[field]
+                owned.append(field)
+                empty.append(field)
+
+            # Plant empty fields
+            if money >= lowest_crop_cost:
+                for field in empty:
+                    for cost, crop in planting_choices[field]:
+                        if cost <= money:
+                            quantity = min(money // cost, sizes[field])
+                            money -= cost * quantity
+                            growing.append((crop, field, quantity))
+                            break
+
+            if not growing and money < lowest_crop_cost and \
+                    (not available or prices[available[0]] >= money):
+                break
+
+            # Harvest
+            year_yields = yields[int(random() * pool_size)]
+
+            for crop, field, quantity in growing:
+                money += int(year_yields[crop] * quantity
+                             * unit_values[field][crop])
+
+            growing = []
+            empty = owned.copy()
+
+        return money + sum(prices[field] for field in owned)
@@ -0,0 +1,125 @@
+import heapq
+import math
+
+from acs.seeding import derive_seed
+
+
+class HallOfFameEntry:
+    """
+    Class representing a distinct Strategy in the hall of fame, with the
+    fitness observed each generation it appeared in and the (zero-based)
+    generation it first appeared in.
+    """
+
+    __slots__ = ("strategy", "genome_hash", "first_generation",
+                 "observations", "total_fitness")
+
+    def __init__(self, strategy, genome_hash, first_generation):
+        self.strategy = strategy
+        self.genome_hash = genome_hash
+        self.first_generation = first_generation
+        self.observations = 0
+        self.total_fitness = 0
+
+    def record(self, fitness):
+        self.observations += 1
+        self.total_fitness += fitness
+
+    def mean_fitness(self):
+        return self.total_fitness / self.observations
+
+
+class HallOfFame:
+    """
+    Class archiving the best distinct Strategies seen in any generation,
+    indexed by genome hash so that repeat appearances of a Strategy are
+    merged in O(1). As fitness from a single generation is noisy, members are
+    re-evaluated together at the end of a run with many more games.
+    """
+
+    CAPACITY = 50
+    FINAL_NUM_GAMES = 1000
+
+    # Number of standard errors either side of the mean in reported
+    # confidence intervals (95%).
+    CONFIDENCE_Z = 1.96
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or HallOfFame.CAPACITY
+        self.entries = {}
+
+    def update(self, strategies, generation):
+        """
+        Record the fitness of each of the given Strategies, adding those not
+        yet archived, then evict all but the fittest members.
+        """
+
+        for strategy in strategies:
+            genome_hash = strategy.genome_hash()
+            entry = self.entries.get(genome_hash)
+
+            if entry is None:
+                entry = HallOfFameEntry(strategy.copy(), genome_hash,
+                                        generation)
+                self.entries[genome_hash] = entry
+
+            entry.record(strategy.fitness)
+
+        if len(self.entries) > self.capacity:
+            fittest = heapq.nlargest(self.capacity, self.entries.values(),
+                                     key=HallOfFameEntry.mean_fitness)
+            self.entries = {entry.genome_hash: entry for entry in fittest}
+
+    def reevaluate(self, evolver, num_games=None):
+        """
+        Play every member for the given number of games, with all members
+        facing the same weather, and return a list of (Strategy, confidence
+        interval half-width, first generation) tuples sorted by the
+        resulting fitness.
+        """
+
+        entries = list(self.entries.values())
+        strategies = [entry.strategy for entry in entries]
+        common_seed = derive_seed(evolver.seed, "hall of fame")
+
+        evolver.start_workers()
+
+        try:
+            all_statistics = evolver.evaluate_strategies(
+                strategies, [common_seed] * len(strategies),
+                num_games or HallOfFame.FINAL_NUM_GAMES)
+        finally:
+            evolver.stop_workers()
+
+        results = [(entry.strategy,
+                    HallOfFame.confidence_half_width(statistics),
+                    entry.first_generation)
+                   for entry, statistics in zip(entries, all_statistics)]
+        results.sort(key=lambda result: result[0])
+
+        return results
+
+    @staticmethod
+    def confidence_half_width(statistics):
+        """
+        Return the half-width of the confidence interval for the mean of the
+        scores summarised by the given ScoreStatistics.
+        """
+
+        if statistics.running.count < 2:
+            return math.inf
+
+        return HallOfFame.CONFIDENCE_Z * statistics.running.standard_error()
+
+    @staticmethod
+    def print_results(results, number_to_list):
+        """
+        List the top N re-evaluated Strategies with their confidence
+        intervals and the generation each was first seen in.
+        """
+
+        for strategy, half_width, first_generation in \
+                results[:number_to_list]:
+            strategy.describe()
+            print("    95% confidence interval: +/-", round(half_width))
+            print("    First seen in generation:", first_generation + 1)
@@ -1,10 +1,18 @@
 from acs.weather import WeatherGenerator
 from acs.actions import *
+from acs.advisor import *
+from acs.mcts import *
+from acs.rendering import *
+import io
 import random
 
 
 class InputProvider(ABC):
 
+    # Whether the game may skip years whose outcome is already fixed, instead
+    # of reporting them to this provider.
+    fast_forward = False
+
     def __init__(self):
         pass
 
@@ -76,9 +84,12 @@ class AIInputProvider(InputProvider):
     the AI.
     """
 
-    def __init__(self, strategy):
+    fast_forward = True
+
+    def __init__(self, strategy, rng=None):
         super().__init__()
         self.strategy = strategy
+        self.rng = rng or random
 
     def decide_action(self, game, numbered_actions):
         """
@@ -116,21 +127,13 @@ class AIInputProvider(InputProvider):
     def decide_crop_to_plant(self, numbered_crops):
         """
         Choose a crop to plant, with this decision weighted by the crop
-        weightings in the current Strategy.
+        weightings in the current Strategy and renormalised over the crops
+        offered. These are the crops the farm can afford, which are always the
+        cheapest len(numbered_crops) crops.
         """
 
-        r = random.random()
-        chance_to_choose_this_crop = 0
-
-        for crop in numbered_crops.values():
-
-            # Add the probability of picking this crop to the running total
-            chance_to_choose_this_crop += self.strategy.chances_to_plant[crop]
-
-            if r < chance_to_choose_this_crop:
-                return crop
-
-        return numbered_crops[len(numbered_crops)]
+        return self.strategy.crop_sampler.sample(
+            self.rng.random(), len(numbered_crops))
 
     def decide_crop_quantity(self, maximum):
         """
@@ -179,88 +182,256 @@ class AIInputProvider(InputProvider):
         pass
 
 
+class SolverInputProvider(AIInputProvider):
+    """
+    Class representing the decision engine for the policy computed by a
+    Solver. Decisions are taken at the start of each year (or after each field
+    purchase) and then followed until the year is over.
+    """
+
+    def __init__(self, solver):
+        super().__init__(None)
+        self.solver = solver
+        self.field_to_buy = None
+        self.crop_to_plant = None
+
+    def decide_action(self, game, numbered_actions):
+        """
+        Decide what to do, in this order:
+         - Buy the field chosen by the solver, if it has chosen one
+         - Plant the crop chosen by the solver, while it is affordable
+         - Advance to harvest, if there is nothing else to do
+        """
+
+        # Only revisit the plan before anything has been planted this year
+        if all(field.is_empty() for field in game.farm.owned_fields):
+            self.field_to_buy, self.crop_to_plant = self.solver.decide(
+                game.current_year, game.farm.money, game.farm.owned_fields)
+
+        for action in numbered_actions.values():
+            if type(action) is BuyFieldsAction and \
+                    self.field_to_buy is not None:
+                return action
+
+        for action in numbered_actions.values():
+            if type(action) is PlantCropsAction and \
+                    self.crop_to_plant is not None and \
+                    self.crop_to_plant.cost <= game.farm.money:
+                return action
+
+        for action in numbered_actions.values():
+            if type(action) is PlayAction:
+                return action
+
+    def decide_field_to_plant(self, numbered_fields):
+        """
+        Choose the most fertile available field for planting.
+        """
+
+        return max(numbered_fields.values(),
+                   key=lambda field: field.soil_quality)
+
+    def decide_crop_to_plant(self, numbered_crops):
+        """
+        Choose the crop selected by the solver.
+        """
+
+        return self.crop_to_plant
+
+    def decide_field_to_buy(self, numbered_fields):
+        """
+        Choose the field selected by the solver.
+        """
+
+        return self.field_to_buy
+
+
+class MCTSInputProvider(AIInputProvider):
+    """
+    Class representing a decision engine which chooses each purchase and
+    planting by Monte Carlo tree search over forks of the current game state,
+    given a budget of rollouts or seconds per decision.
+    """
+
+    def __init__(self, max_years, crops, fields, rollouts=None,
+                 time_limit=None, rng=None):
+        super().__init__(None, rng)
+        self.simulator = GameSimulator(max_years, crops, fields, self.rng)
+        self.search = MonteCarloTreeSearch(self.simulator, rollouts,
+                                           time_limit)
+        self.move = GameSimulator.PLAY
+
+    def decide_action(self, game, numbered_actions):
+        """
+        Search for the best move from the current state, and take the action
+        which makes it.
+        """
+
+        self.move = self.search.search(self.simulator.snapshot(game))
+
+        if self.move is None or self.move == GameSimulator.PLAY:
+            wanted = PlayAction
+        elif self.move < self.simulator.first_plant_move:
+            wanted = BuyFieldsAction
+        else:
+            wanted = PlantCropsAction
+
+        for action in numbered_actions.values():
+            if type(action) is wanted:
+                return action
+
+    def decide_crop_to_plant(self, numbered_crops):
+        """
+        Choose the crop of the move found by the search.
+        """
+
+        crop = self.simulator.crops[
+            self.move - self.simulator.first_plant_move]
+
+        for offered in numbered_crops.values():
+            if offered.id == crop.id:
+                return offered
+
+    def decide_field_to_buy(self, numbered_fields):
+        """
+        Choose the field of the move found by the search.
+        """
+
+        field = self.simulator.fields[self.move - GameSimulator.BUY]
+
+        for offered in numbered_fields.values():
+            if offered.id == field.id:
+                return offered
+
+
 class PlayerInputProvider(InputProvider):
+    """
+    Class representing a human player at a terminal. Output goes to the given
+    file (standard output by default), and the numbers typed are appended to
+    the given recording list, if any. Each decision is split into a prompt
+    and a choice, so that the prompts can be shared by providers reading
+    their choices from elsewhere.
+    """
+
+    def __init__(self, advisor=None, output=None, recording=None):
+        super().__init__()
+        self.advisor = advisor
+        self.advice = None
+        self.output = output
+        self.recording = recording
+
+    def show(self, *values):
+        print(*values, file=self.output)
 
     def decide_action(self, game, numbered_actions):
+        self.prompt_action(game, numbered_actions)
+
+        # Prompt for choice
+        return self.choose_from_numbered_list(numbered_actions)
+
+    def prompt_action(self, game, numbered_actions):
+
+        # Show the advisor's recommendation, if there is an advisor
+        if self.advisor is not None:
+            self.advice = self.advisor.advise(game)
+
+            if self.advice is not None:
+                self.show("\n" + self.advisor.describe(self.advice))
 
         # List available actions
-        PlayerInputProvider.list_action_options(numbered_actions)
+        self.list_action_options(numbered_actions)
+
+    def decide_field_to_plant(self, numbered_fields):
+        self.prompt_field_to_plant(numbered_fields)
 
         # Prompt for choice
-        return PlayerInputProvider.choose_from_numbered_list(numbered_actions)
+        return self.choose_from_numbered_list(numbered_fields)
 
-    def decide_field_to_plant(self, numbered_fields):
+    def prompt_field_to_plant(self, numbered_fields):
 
         # List available fields
-        print("\nWhich field would you like to plant in? Enter 0 to cancel.")
-        PlayerInputProvider.list_numbered_items(numbered_fields)
+        self.show("\nWhich field would you like to plant in? Enter 0 to "
+                  "cancel.")
+        self.list_numbered_items(numbered_fields)
+
+    def decide_crop_to_plant(self, numbered_crops):
+        self.prompt_crop_to_plant(numbered_crops)
 
         # Prompt for choice
-        return PlayerInputProvider.choose_from_numbered_list(numbered_fields)
+        return self.choose_from_numbered_list(numbered_crops)
 
-    def decide_crop_to_plant(self, numbered_crops):
+    def prompt_crop_to_plant(self, numbered_crops):
 
         # List available crops
-        print("\nWhich crop would you like to plant? Enter 0 to cancel.")
-        PlayerInputProvider.list_numbered_items(numbered_crops)
+        self.show("\nWhich crop would you like to plant? Enter 0 to cancel.")
+        self.list_numbered_items(numbered_crops)
+        self.show_recommendation(Advice.PLANT, numbered_crops)
+
+    def decide_crop_quantity(self, maximum):
+        self.prompt_crop_quantity(maximum)
 
         # Prompt for choice
-        return PlayerInputProvider.choose_from_numbered_list(numbered_crops)
+        return self.choose_quantity(maximum)
 
-    def decide_crop_quantity(self, maximum):
+    def prompt_crop_quantity(self, maximum):
 
         # Advise of available range
-        print("How many would you like to plant? "
-              "( 1 - ", maximum, "| to cancel.)")
+        self.show("How many would you like to plant? "
+                  "( 1 - ", maximum, "| to cancel.)")
+
+    def decide_field_to_buy(self, numbered_fields):
+        self.prompt_field_to_buy(numbered_fields)
 
         # Prompt for choice
-        return PlayerInputProvider.choose_quantity(maximum)
+        return self.choose_from_numbered_list(numbered_fields)
 
-    def decide_field_to_buy(self, numbered_fields):
+    def prompt_field_to_buy(self, numbered_fields):
 
         # List available fields
-        print("\nWhich field would you like to purchase? Enter 0 to cancel.")
+        self.show("\nWhich field would you like to purchase? Enter 0 to "
+                  "cancel.")
         for key, field in numbered_fields.items():
             first_line = (str(key) + ") " + field.name + " - " +
                                field.description)
-            print()
-            print(first_line)
-            print("Price:", field.price)
+            self.show()
+            self.show(first_line)
+            self.show("Price:", field.price)
 
-        print()
+        self.show()
+        self.show_recommendation(Advice.BUY, numbered_fields)
 
-        # Prompt for choice
-        return PlayerInputProvider.choose_from_numbered_list(numbered_fields)
+    def show_recommendation(self, action, numbered_items):
+        """
+        Show the number of the item recommended by the advisor, if its advice
+        is to take the given action with one of the given items.
+        """
+
+        if self.advice is None or self.advice.action != action:
+            return
+
+        for key, item in numbered_items.items():
+            if item.id == self.advice.item_id:
+                self.show("Advisor recommends:", str(key) + ")", item.name)
 
     def show_greeting(self, max_years):
-        print("\n\nWelcome to Agricultural Capitalism Simulator! \n")
-        print("You have", max_years, "years to make maximum profit.")
+        self.show("\n\nWelcome to Agricultural Capitalism Simulator! \n")
+        self.show("You have", max_years, "years to make maximum profit.")
 
     def list_available_crops_with_details(self, available_crops):
-        print("\nAvailable crops for planting:\n")
-        for crop in available_crops:
-            crop.describe()
+        write_report(render_crops(available_crops), self.output)
 
     def report_status(self, game):
-        print("\nYear:", game.current_year)
-        print("Balance:", game.farm.money)
-        print("Asset Value:", game.calculate_assets())
-        print("\nFields:\n")
-
-        for field in game.farm.owned_fields:
-            field.report_status()
+        write_report(render_status(game.current_year, game.farm.money,
+                                   game.calculate_assets(),
+                                   game.farm.owned_fields), self.output)
 
     def report_field_performance(self, owned_fields):
-        print()
-        for field in owned_fields:
-            field.report_performance()
+        write_report(render_field_performances(owned_fields), self.output)
 
-    @staticmethod
-    def show_year_results_header():
-        print("\n====== RESULTS ======")
+    def show_year_results_header(self):
+        self.show("\n====== RESULTS ======")
 
-    @staticmethod
-    def report_weather(weather, heat_bands, wetness_bands):
+    def report_weather(self, weather, heat_bands, wetness_bands):
 
         heat_message = PlayerInputProvider.find_weather_band(
             weather.heat,
@@ -272,60 +443,45 @@ class PlayerInputProvider(InputProvider):
             wetness_bands,
             WeatherGenerator.wetness_deviation
         )
-        print(heat_message, wetness_message, "\n")
-
-    @staticmethod
-    def report_financials(income, expenditure, new_assets):
-        print("Asset acquisitions:", new_assets)
-        print("Revenue:", income)
-        print("Expenses:", expenditure)
+        self.show(heat_message, wetness_message, "\n")
 
-        profit = income + new_assets - expenditure
+    def report_financials(self, income, expenditure, new_assets):
+        write_report(render_financials(income, expenditure, new_assets),
+                     self.output)
 
-        if profit < 0:
-            print("Commiserations... you made a loss of", profit)
-        else:
-            print("Congratulations! You made a profit of", profit)
+    def show_loss_message(self):
+        self.show("\nYou are bankrupt. You will have to find a job.")
 
-    @staticmethod
-    def show_loss_message():
-        print("\nYou are bankrupt. You will have to find a job.")
-
-    @staticmethod
-    def show_final_score(score):
-        print("\nWell played, capitalist - the rich get richer.")
-        print("Final total assets:", score)
+    def show_final_score(self, score):
+        self.show("\nWell played, capitalist - the rich get richer.")
+        self.show("Final total assets:", score)
 
     @staticmethod
     def find_weather_band(weather_component, weather_bands, deviation):
         """
         Given a component of some Weather and the deviation factor used when
         calculating said Weather component's value in this game, find the
-        correct band in a given list of WeatherBands to describe this result,
-        and return its message field.
+        correct band in the given WeatherBands to describe this result, and
+        return its message field.
         """
 
-        number_of_sd_from_mean = (weather_component - 1) / deviation
+        band = weather_bands.find((weather_component - 1) / deviation)
 
-        for band in reversed(weather_bands):
-            if number_of_sd_from_mean >= (band.min_value):
-                return band.message
+        if band is not None:
+            return band.message
 
-    @staticmethod
-    def list_action_options(action_options):
-        print()
+    def list_action_options(self, action_options):
+        self.show()
         for key, value in action_options.items():
             string_to_print = (str(key) + ") " + value.get_prompt())
-            print(string_to_print)
+            self.show(string_to_print)
 
-    @staticmethod
-    def list_numbered_items(numbered_items):
+    def list_numbered_items(self, numbered_items):
         for key, value in numbered_items.items():
             string_to_print = (str(key) + ") " + value.name)
-            print(string_to_print)
+            self.show(string_to_print)
 
-    @staticmethod
-    def choose_from_numbered_list(numbered_list):
+    def choose_from_numbered_list(self, numbered_list):
         """
         Prompt player to enter a number between 0 and the length of the supplied
         dictionary, and continue prompting until such an input is given. Return
@@ -333,15 +489,14 @@ class PlayerInputProvider(InputProvider):
         """
 
         while True:
-            selection = int(input())
+            selection = self.read_number()
 
             if selection in numbered_list.keys():
                 return numbered_list[selection]
             if selection == 0:
                 return None
 
-    @staticmethod
-    def choose_quantity(maximum):
+    def choose_quantity(self, maximum):
         """
         Prompt player to enter a number between 0 and the maximum, and continue
         prompting until such an input is given. Return the number selected, or
@@ -349,9 +504,138 @@ class PlayerInputProvider(InputProvider):
         """
 
         while True:
-            selection = int(input())
+            selection = self.read_number()
 
             if 0 < selection <= maximum:
                 return selection
             if selection == 0:
                 return None
+
+    def read_number(self):
+        """
+        Read a number typed by the player, adding it to the recording if this
+        session is being recorded.
+        """
+
+        selection = int(input())
+
+        if self.recording is not None:
+            self.recording.append(selection)
+
+        return selection
+
+
+class ScriptedInputProvider(PlayerInputProvider):
+    """
+    Class representing a player whose every entry is read from a script of
+    numbers, such as a recorded session, with output collected in memory
+    (unless another output is given). Running out of script ends the game
+    with EOFError, as running out of input would.
+    """
+
+    def __init__(self, decisions, output=None, advisor=None):
+        super().__init__(advisor, output if output is not None
+                         else io.StringIO())
+        self.decisions = iter(decisions)
+
+    def read_number(self):
+        selection = next(self.decisions, None)
+
+        if selection is None:
+            raise EOFError("Script ended")
+
+        return selection
+
+
+class StreamOutput:
+    """
+    Class adapting an asyncio StreamWriter to the file interface used by
+    print. Text is collected until flushed, so that each screen reaches the
+    transport in one write rather than one per printed value.
+    """
+
+    __slots__ = ("writer", "pieces")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.pieces = []
+
+    def write(self, text):
+        self.pieces.append(text)
+
+    def flush(self):
+        if self.pieces:
+            self.writer.write("".join(self.pieces).encode("utf-8"))
+            self.pieces = []
+
+
+class StreamInputProvider(PlayerInputProvider):
+    """
+    Class representing a human player connected over an asyncio stream, with
+    the same prompts as PlayerInputProvider. Its decide methods are
+    coroutines, to be awaited by an AsyncGame, which wait for a line of input
+    without blocking other players. Each wait is marked by the PROMPT, and
+    ends the game with EOFError if the player disconnects.
+    """
+
+    PROMPT = "> "
+
+    def __init__(self, reader, writer, advisor=None):
+        super().__init__(advisor, StreamOutput(writer))
+        self.reader = reader
+        self.writer = writer
+
+    async def decide_action(self, game, numbered_actions):
+        self.prompt_action(game, numbered_actions)
+        return await self.choose_from_numbered_list(numbered_actions)
+
+    async def decide_field_to_plant(self, numbered_fields):
+        self.prompt_field_to_plant(numbered_fields)
+        return await self.choose_from_numbered_list(numbered_fields)
+
+    async def decide_crop_to_plant(self, numbered_crops):
+        self.prompt_crop_to_plant(numbered_crops)
+        return await self.choose_from_numbered_list(numbered_crops)
+
+    async def decide_crop_quantity(self, maximum):
+        self.prompt_crop_quantity(maximum)
+
+        while True:
+            selection = await self.read_number()
+
+            if selection is not None and 0 < selection <= maximum:
+                return selection
+            if selection == 0:
+                return None
+
+    async def decide_field_to_buy(self, numbered_fields):
+        self.prompt_field_to_buy(numbered_fields)
+        return await self.choose_from_numbered_list(numbered_fields)
+
+    async def choose_from_numbered_list(self, numbered_list):
+        while True:
+            selection = await self.read_number()
+
+            if selection in numbered_list:
+                return numbered_list[selection]
+            if selection == 0:
+                return None
+
+    async def read_number(self):
+        """
+        Prompt for a line of input, and return it as a number, or None if it
+        is not one.
+        """
+
+        self.output.write(StreamInputProvider.PROMPT)
+        self.output.flush()
+        await self.writer.drain()
+        line = await self.reader.readline()
+
+        if not line:
+            raise EOFError("Player disconnected")
+
+        try:
+            return int(line)
+        except ValueError:
+            return None
@@ -2,6 +2,11 @@ from abc import ABC, abstractmethod
 from acs.data_reader import *
 from acs.game import *
 from acs.ai import *
+from acs.evaluation_store import *
+from acs.hall_of_fame import *
+from acs.progress_server import *
+from acs.solver import *
+import os
 
 
 class Launcher(ABC):
@@ -9,6 +14,9 @@ class Launcher(ABC):
     MAX_YEARS = 20
     INITIAL_MONEY = 500
 
+    # Decision table for the interactive game's advisor.
+    ADVICE_FILE = "advice.json"
+
     def __init__(self):
         self.data_reader = DataReader()
         self.crops = self.data_reader.import_crops()
@@ -21,20 +29,104 @@ class Launcher(ABC):
 
 class AILauncher(Launcher):
 
+    # Number of worker processes used to evaluate Strategies.
+    WORKERS = os.cpu_count()
+
+    # Master seed, random for each run if None.
+    SEED = None
+
+    # Store of evaluations shared between runs (e.g. "evaluations.db"), if
+    # any. As evaluations are keyed by seed, they are only reused by runs
+    # with the same master seed, so a store needs a fixed SEED to be of use.
+    EVALUATION_STORE_FILE = None
+
+    # Cheap evaluation stages (e.g. [FidelityStage(5, 5, 0.3)]) Strategies
+    # must pass before full evaluation, and how many generations apart the
+    # whole population is evaluated at every stage to check them.
+    FIDELITY_SCHEDULE = None
+    FIDELITY_AUDIT_INTERVAL = 10
+
+    # Local address ("HOST:PORT" or a Unix socket path) on which to serve
+    # live progress while evolving, if any.
+    PROGRESS_ADDRESS = None
+
     def __init__(self):
         super().__init__()
 
     def execute(self):
+        if AILauncher.EVALUATION_STORE_FILE is None:
+            self.evolve(None)
+            return
+
+        with EvaluationStore.for_catalog(
+                AILauncher.EVALUATION_STORE_FILE, self.crops, self.fields,
+                self.data_reader.crops_file_name,
+                self.data_reader.fields_file_name) as evaluation_store:
+            self.evolve(evaluation_store)
+
+    def evolve(self, evaluation_store):
+        hall_of_fame = HallOfFame()
+        progress_monitor = None
+
+        if AILauncher.PROGRESS_ADDRESS is not None:
+            progress_monitor = ProgressMonitor(
+                ProgressMonitor.parse_address(AILauncher.PROGRESS_ADDRESS))
+            print("Serving progress on", progress_monitor.start())
+
         algorithm = Evolver(
             Launcher.MAX_YEARS,
             Launcher.INITIAL_MONEY,
             self.crops,
-            self.fields)
-        winners = algorithm.evolve()
+            self.fields,
+            seed=AILauncher.SEED,
+            workers=AILauncher.WORKERS,
+            hall_of_fame=hall_of_fame,
+            evaluation_store=evaluation_store,
+            fidelity_schedule=AILauncher.FIDELITY_SCHEDULE,
+            fidelity_audit_interval=AILauncher.FIDELITY_AUDIT_INTERVAL,
+            progress_monitor=progress_monitor)
+
+        try:
+            winners = algorithm.evolve()
+        finally:
+            if progress_monitor is not None:
+                progress_monitor.stop()
 
         print("\n\n********* Top Strategies *********\n")
         Evolver.print_top_strategies(winners, 5)
 
+        # Re-evaluate the best Strategies of the whole run with many games
+        results = hall_of_fame.reevaluate(algorithm)
+
+        print("\n\n********* Hall of Fame ("
+              + str(HallOfFame.FINAL_NUM_GAMES) + " games each) *********\n")
+        HallOfFame.print_results(results, 5)
+
+        print("\nGame years fast-forwarded:", algorithm.years_skipped)
+
+        if evaluation_store is not None:
+            print("Evaluations reused from previous runs:",
+                  algorithm.store_hits)
+
+        self.report_baseline(results[0][0])
+
+    def report_baseline(self, best_strategy):
+        """
+        Compare the best evolved Strategy against the expected score of the
+        solver's near-optimal policy.
+        """
+
+        solver = Solver(
+            Launcher.MAX_YEARS,
+            Launcher.INITIAL_MONEY,
+            self.crops,
+            self.fields)
+        baseline = solver.solve()
+
+        print("\nSolver baseline expected score:", round(baseline))
+        print("Best evolved strategy reaches {:.1f}% of baseline".format(
+            100 * best_strategy.fitness / baseline))
+
 
 class PlayerLauncher(Launcher):
 
@@ -42,7 +134,7 @@ class PlayerLauncher(Launcher):
         super().__init__()
 
     def execute(self):
-        input_provider = PlayerInputProvider()
+        input_provider = PlayerInputProvider(self.load_advisor())
         game = Game(
             Launcher.MAX_YEARS,
             Launcher.INITIAL_MONEY,
@@ -50,3 +142,21 @@ class PlayerLauncher(Launcher):
             self.crops,
             self.fields)
         game.run()
+
+    def load_advisor(self):
+        """
+        Return an Advisor using the decision table written by
+        acs.advice_export, or None if there is no table for this game.
+        """
+
+        if not os.path.exists(Launcher.ADVICE_FILE):
+            return None
+
+        table = DecisionTable.load(Launcher.ADVICE_FILE)
+
+        if table.max_years != Launcher.MAX_YEARS:
+            return None
+
+        print("Using advice from the", table.source)
+
+        return Advisor(table)
@@ -0,0 +1,147 @@
+import argparse
+import asyncio
+import re
+import time
+
+from acs.data_reader import DataReader
+from acs.game_server import GameServer
+from acs.input_providers import StreamInputProvider
+from acs.launchers import Launcher
+
+
+class ScriptedClient:
+    """
+    Class representing a simulated player of a GameServer, which reads each
+    screen up to the prompt and answers it by a fixed script: plant the first
+    crop offered at the maximum quantity in the first empty field while it
+    can, and otherwise advance to harvest. The time from each answer to the
+    next prompt is recorded as a latency.
+    """
+
+    QUANTITY_PATTERN = re.compile(r"\( 1 - +(\d+) ")
+    FINAL_SCORE_PATTERN = re.compile(r"Final total assets: (\d+)")
+
+    def __init__(self):
+        self.latencies = []
+        self.final_score = None
+
+    def answer(self, screen):
+        if "How many would you like to plant?" in screen:
+            return ScriptedClient.QUANTITY_PATTERN.search(screen).group(1)
+
+        if "Which crop would you like to plant?" in screen or \
+                "Which field would you like to plant in?" in screen:
+            return "1"
+
+        if "Which field would you like to purchase?" in screen:
+            return "0"
+
+        for option in ["Buy and plant crops", "Advance to harvest time"]:
+            match = re.search(r"(\d+)\) " + option, screen)
+
+            if match:
+                return match.group(1)
+
+        raise ValueError("Unexpected screen: " + screen)
+
+    async def play(self, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        prompt = StreamInputProvider.PROMPT.encode("utf-8")
+        sent_at = None
+
+        try:
+            while True:
+                try:
+                    screen = await reader.readuntil(prompt)
+                except asyncio.IncompleteReadError as error:
+                    screen = error.partial
+                    break
+
+                if sent_at is not None:
+                    self.latencies.append(time.perf_counter() - sent_at)
+
+                answer = self.answer(screen.decode("utf-8"))
+                writer.write((answer + "\n").encode("utf-8"))
+                sent_at = time.perf_counter()
+        finally:
+            writer.close()
+
+        match = ScriptedClient.FINAL_SCORE_PATTERN.search(
+            screen.decode("utf-8"))
+
+        if match:
+            self.final_score = int(match.group(1))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+
+    return sorted_values[min(len(sorted_values) - 1,
+                             int(fraction * len(sorted_values)))]
+
+
+async def run_load_test(num_clients, host, port, server=None):
+    """
+    Play num_clients scripted games at once against the server at the given
+    address, or against the given GameServer, started here on a free port,
+    and return the clients and the time taken.
+    """
+
+    listener = None
+
+    if server is not None:
+        listener = await server.start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    clients = [ScriptedClient() for i in range(num_clients)]
+    start_time = time.perf_counter()
+
+    try:
+        await asyncio.gather(*[client.play(host, port)
+                               for client in clients])
+    finally:
+        if listener is not None:
+            listener.close()
+            await listener.wait_closed()
+
+    return clients, time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the throughput and latency of the game server "
+                    "under many concurrent scripted players.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int,
+                        help="port of a running server (default: start one "
+                             "in this process)")
+    arguments = parser.parse_args()
+
+    game_server = None
+
+    if arguments.port is None:
+        data_reader = DataReader()
+        game_server = GameServer(Launcher.MAX_YEARS, Launcher.INITIAL_MONEY,
+                                 data_reader.import_crops(),
+                                 data_reader.import_fields())
+
+    clients, seconds = asyncio.run(run_load_test(
+        arguments.clients, arguments.host, arguments.port, game_server))
+
+    latencies = sorted(latency for client in clients
+                       for latency in client.latencies)
+    scores = [client.final_score for client in clients
+              if client.final_score is not None]
+
+    print("{} of {} games completed in {:.2f}s".format(
+        len(scores), len(clients), seconds))
+    print("{} decisions, {:.0f}/s".format(len(latencies),
+                                          len(latencies) / seconds))
+    print("Latency ms: p50 {:.2f}, p95 {:.2f}, p99 {:.2f}, max {:.2f}".format(
+        *[1000 * percentile(latencies, fraction)
+          for fraction in (0.5, 0.95, 0.99, 1)]))
+
+    if scores:
+        print("Mean final score:", round(sum(scores) / len(scores)))
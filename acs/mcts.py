@@ -0,0 +1,141 @@
+import math
+import time
+
+from acs.game_state import *
+
+
+class SearchNode:
+    """
+    Class representing a sequence of moves in an open-loop search tree. As
+    harvests are random, the states reached by the sequence vary between
+    iterations, and so do the moves legal at the end of it.
+    """
+
+    __slots__ = ("children", "visits", "total_score")
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.total_score = 0
+
+
+class MonteCarloTreeSearch:
+    """
+    Class choosing moves by open-loop UCT: each iteration follows the tree
+    from a fork of the root state, sampling fresh weather at each harvest,
+    adds one node, and scores it by a GameSimulator rollout. Scores are
+    normalised by the range seen in the current search, so EXPLORATION is
+    independent of the catalog.
+
+    Each decision is given a budget of rollouts, of seconds, or both.
+    """
+
+    EXPLORATION = 0.5
+
+    # Number of iterations between checks of the time budget.
+    TIME_CHECK_INTERVAL = 64
+
+    def __init__(self, simulator, rollouts=None, time_limit=None):
+        if rollouts is None and time_limit is None:
+            raise ValueError("A rollout or time budget is required")
+
+        self.simulator = simulator
+        self.rollouts = rollouts
+        self.time_limit = time_limit
+
+        # Totals over all searches, for reporting throughput
+        self.rollouts_done = 0
+        self.search_seconds = 0
+
+    def search(self, state):
+        """
+        Return the most visited move from the given state, or None if the
+        game is over.
+        """
+
+        moves = self.simulator.legal_moves(state)
+
+        if len(moves) <= 1:
+            return moves[0] if moves else None
+
+        start_time = time.perf_counter()
+        deadline = None if self.time_limit is None \
+            else start_time + self.time_limit
+        root = SearchNode()
+        score_range = [math.inf, -math.inf]
+        iterations = 0
+
+        while self.rollouts is None or iterations < self.rollouts:
+            if deadline is not None and \
+                    iterations % MonteCarloTreeSearch.TIME_CHECK_INTERVAL \
+                    == 0 and time.perf_counter() >= deadline:
+                break
+
+            self.iterate(root, state.fork(), score_range)
+            iterations += 1
+
+        self.rollouts_done += iterations
+        self.search_seconds += time.perf_counter() - start_time
+
+        return max(moves, key=lambda move: root.children[move].visits
+                   if move in root.children else -1)
+
+    def iterate(self, root, state, score_range):
+        simulator = self.simulator
+        node = root
+        path = [root]
+
+        while True:
+            moves = simulator.legal_moves(state)
+
+            if not moves:
+                score = simulator.score(state)
+                break
+
+            untried = [move for move in moves if move not in node.children]
+
+            if untried:
+                move = untried[int(simulator.rng.random() * len(untried))]
+                child = SearchNode()
+                node.children[move] = child
+                path.append(child)
+                simulator.apply(state, move)
+                score = simulator.rollout(state)
+                break
+
+            move = self.select(node, moves, score_range)
+            node = node.children[move]
+            path.append(node)
+            simulator.apply(state, move)
+
+        score_range[0] = min(score_range[0], score)
+        score_range[1] = max(score_range[1], score)
+
+        for visited in path:
+            visited.visits += 1
+            visited.total_score += score
+
+    @staticmethod
+    def select(node, moves, score_range):
+        """
+        Return the legal move with the highest upper confidence bound.
+        """
+
+        lowest, highest = score_range
+        spread = highest - lowest or 1
+        log_visits = math.log(node.visits)
+        best_move = None
+        best_bound = -math.inf
+
+        for move in moves:
+            child = node.children[move]
+            bound = ((child.total_score / child.visits - lowest) / spread
+                     + MonteCarloTreeSearch.EXPLORATION
+                     * math.sqrt(log_visits / child.visits))
+
+            if bound > best_bound:
+                best_move = move
+                best_bound = bound
+
+        return best_move
+
@@ -0,0 +1,46 @@
+import argparse
+import random
+
+from acs.data_reader import DataReader
+from acs.game import Game
+from acs.input_providers import MCTSInputProvider
+from acs.launchers import Launcher
+from acs.seeding import derive_seed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Play games with the Monte Carlo tree search player and "
+                    "report its scores and rollout throughput.")
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--rollouts", type=int, default=None,
+                        help="rollouts per decision (default 1000, unless "
+                             "--seconds is given)")
+    parser.add_argument("--seconds", type=float, default=None,
+                        help="seconds per decision")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    if arguments.rollouts is None and arguments.seconds is None:
+        arguments.rollouts = 1000
+
+    data_reader = DataReader()
+    crops = data_reader.import_crops()
+    fields = data_reader.import_fields()
+    provider = MCTSInputProvider(
+        Launcher.MAX_YEARS, crops, fields, rollouts=arguments.rollouts,
+        time_limit=arguments.seconds,
+        rng=random.Random(derive_seed(arguments.seed, "search")))
+    scores = []
+
+    for game_number in range(arguments.games):
+        game = Game(Launcher.MAX_YEARS, Launcher.INITIAL_MONEY, provider,
+                    crops, fields, rng=random.Random(
+                        derive_seed(arguments.seed, "weather", game_number)))
+        scores.append(game.run())
+        print("Game", game_number + 1, "score:", scores[-1])
+
+    search = provider.search
+    print("Mean score:", round(sum(scores) / len(scores)))
+    print("Rollouts: {} at {:.0f}/s".format(
+        search.rollouts_done, search.rollouts_done / search.search_seconds))
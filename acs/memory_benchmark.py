@@ -0,0 +1,98 @@
+import argparse
+import resource
+import sys
+import time
+import tracemalloc
+
+from acs.ai import *
+from acs.data_reader import DataReader
+from acs.launchers import Launcher
+
+
+class MemoryBenchmark:
+    """
+    Class measuring the memory used by a large population of Strategies and
+    by the games played to evaluate them, using tracemalloc for Python-level
+    allocations and the peak resident set size of the process.
+    """
+
+    def __init__(self, population_size, games_to_play, crops, fields,
+                 seed=0):
+        self.population_size = population_size
+        self.games_to_play = games_to_play
+        self.evolver = Evolver(Launcher.MAX_YEARS, Launcher.INITIAL_MONEY,
+                               crops, fields, verbose=False, seed=seed)
+
+    def run(self):
+        """
+        Return a dictionary of measurements.
+        """
+
+        tracemalloc.start()
+
+        # Memory retained by the population itself
+        baseline = tracemalloc.get_traced_memory()[0]
+        population = [self.evolver.generate_random_strategy()
+                      for i in range(self.population_size)]
+        population_bytes = tracemalloc.get_traced_memory()[0] - baseline
+
+        # Peak memory while playing games, above the retained population
+        tracemalloc.reset_peak()
+        retained = tracemalloc.get_traced_memory()[0]
+        input_provider = acs.input_providers.AIInputProvider(
+            population[0], make_rng(self.evolver.seed, "decisions"))
+        start_time = time.perf_counter()
+
+        for i in range(self.games_to_play):
+            Game(self.evolver.max_years, self.evolver.initial_money,
+                 input_provider, self.evolver.crops, self.evolver.fields,
+                 rng=make_rng(self.evolver.seed, "weather", i)).run()
+
+        elapsed = time.perf_counter() - start_time
+        game_peak_bytes = tracemalloc.get_traced_memory()[1] - retained
+        tracemalloc.stop()
+
+        return {
+            "bytes_per_strategy": population_bytes / self.population_size,
+            "game_peak_bytes": game_peak_bytes,
+            "games_per_second": self.games_to_play / elapsed,
+
+            # Linux reports the peak resident set size in kilobytes
+            "peak_rss_mb": resource.getrusage(
+                resource.RUSAGE_SELF).ru_maxrss / 1024
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure memory use of Strategies and games.")
+    parser.add_argument("--population", type=int, default=100000)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--max-bytes-per-strategy", type=float,
+                        help="fail if a Strategy uses more than this")
+    parser.add_argument("--max-peak-rss-mb", type=float,
+                        help="fail if peak resident memory exceeds this")
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    benchmark = MemoryBenchmark(arguments.population, arguments.games,
+                                data_reader.import_crops(),
+                                data_reader.import_fields())
+    results = benchmark.run()
+
+    for name, value in results.items():
+        print("{}: {:.1f}".format(name, value))
+
+    failures = []
+
+    if arguments.max_bytes_per_strategy is not None and \
+            results["bytes_per_strategy"] > arguments.max_bytes_per_strategy:
+        failures.append("bytes_per_strategy")
+
+    if arguments.max_peak_rss_mb is not None and \
+            results["peak_rss_mb"] > arguments.max_peak_rss_mb:
+        failures.append("peak_rss_mb")
+
+    if failures:
+        print("Over budget:", ", ".join(failures))
+        sys.exit(1)
@@ -0,0 +1,215 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+
+from acs.ai import *
+from acs.data_reader import DataReader
+from acs.launchers import Launcher
+
+
+# Range of each Evolver hyperparameter searched by the MetaTuner. The
+# selection pressure is the multiple of the uniform probability given to the
+# fittest parent, and sets initial_selection_probability.
+SEARCH_SPACE = {
+    "population_size": (20, 200),
+    "num_games": (5, 40),
+    "chance_to_mutate_crop": (0.05, 0.6),
+    "chance_to_mutate_field": (0.05, 0.6),
+    "field_mutation_size": (0.1, 1.5),
+    "selection_pressure": (1.2, 4)
+}
+
+
+def evolver_arguments(configuration):
+    """
+    Return the Evolver keyword arguments for a sampled configuration.
+    """
+
+    arguments = dict(configuration)
+    arguments["initial_selection_probability"] = (
+        arguments.pop("selection_pressure") / arguments["population_size"])
+
+    return arguments
+
+
+def run_configuration(max_years, initial_money, crops, fields, configuration,
+                      num_generations, target_fitness, seed):
+    """
+    Worker entry point: evolve Strategies with the given hyperparameters
+    until the target fitness is reached or the generations run out, and
+    return whether the target was reached, the games played and the best
+    fitness found.
+    """
+
+    evolver = Evolver(max_years, initial_money, crops, fields,
+                      num_generations=num_generations, verbose=False,
+                      seed=seed, target_fitness=target_fitness,
+                      **evolver_arguments(configuration))
+    best = evolver.evolve()[0]
+
+    return (best.fitness >= target_fitness, evolver.games_played,
+            best.fitness)
+
+
+class MetaTuner:
+    """
+    Class searching for the Evolver hyperparameters that reach a target
+    fitness with the fewest games simulated, by successive halving: many
+    randomly sampled configurations are given a few generations each, and
+    only the best fraction of each round goes on to a round with more
+    generations. Runs are spread over a pool of worker processes.
+    """
+
+    NUM_CONFIGURATIONS = 27
+    MIN_GENERATIONS = 5
+    REDUCTION_FACTOR = 3
+
+    def __init__(self, max_years, initial_money, crops, fields,
+                 target_fitness, num_configurations=None, min_generations=None,
+                 reduction_factor=None, workers=None, seed=None, verbose=True):
+        self.max_years = max_years
+        self.initial_money = initial_money
+        self.crops = crops
+        self.fields = fields
+        self.target_fitness = target_fitness
+        self.num_configurations = (num_configurations
+                                   or MetaTuner.NUM_CONFIGURATIONS)
+        self.min_generations = min_generations or MetaTuner.MIN_GENERATIONS
+        self.reduction_factor = (reduction_factor
+                                 or MetaTuner.REDUCTION_FACTOR)
+        self.workers = workers
+        self.seed = seed if seed is not None else generate_master_seed()
+        self.rng = make_rng(self.seed, "meta tuner")
+        self.verbose = verbose
+
+    def sample_configuration(self):
+        configuration = {}
+
+        for name, (low, high) in SEARCH_SPACE.items():
+            if isinstance(low, int):
+                configuration[name] = self.rng.randint(low, high)
+            else:
+                configuration[name] = self.rng.uniform(low, high)
+
+        return configuration
+
+    def configuration_seed(self, configuration):
+        """
+        Return the seed to evolve with the given configuration, which is
+        derived from its values, so that it keeps the same seed in every
+        round wherever it is ranked.
+        """
+
+        return derive_seed(self.seed, "configuration",
+                           *sorted(configuration.items()))
+
+    @staticmethod
+    def rank_key(result):
+        """
+        Order results so that configurations which reached the target come
+        first, by fewest games, followed by the rest, by best fitness.
+        """
+
+        reached, games_played, best_fitness = result
+
+        if reached:
+            return 0, games_played
+
+        return 1, -best_fitness
+
+    def run(self):
+        """
+        Run successive halving, and return a list of (configuration, result)
+        pairs from the final round, best first. Each result is a tuple of
+        whether the target was reached, the games played and the best
+        fitness found.
+        """
+
+        candidates = [(self.sample_configuration(), None)
+                      for i in range(self.num_configurations)]
+        num_generations = self.min_generations
+        round_number = 0
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            while True:
+                candidates = self.run_round(executor, candidates,
+                                            num_generations, round_number)
+
+                if len(candidates) <= 1:
+                    return candidates
+
+                survivors = max(1, len(candidates) // self.reduction_factor)
+
+                # A configuration that has already reached the target would
+                # do so identically with more generations, so is not rerun
+                if all(result[0] for configuration, result
+                       in candidates[:survivors]):
+                    return candidates
+
+                candidates = candidates[:survivors]
+                num_generations *= self.reduction_factor
+                round_number += 1
+
+    def run_round(self, executor, candidates, num_generations, round_number):
+        """
+        Give each configuration that has not yet reached the target the
+        given number of generations, and return all of them ranked.
+        """
+
+        pending = [index for index, (configuration, result)
+                   in enumerate(candidates)
+                   if result is None or not result[0]]
+        futures = {
+            index: executor.submit(
+                run_configuration, self.max_years, self.initial_money,
+                self.crops, self.fields, candidates[index][0],
+                num_generations, self.target_fitness,
+                self.configuration_seed(candidates[index][0]))
+            for index in pending}
+
+        results = [result for configuration, result in candidates]
+
+        for index, future in futures.items():
+            results[index] = future.result()
+
+        ranked = sorted(zip([configuration for configuration, result
+                             in candidates], results),
+                        key=lambda candidate: MetaTuner.rank_key(
+                            candidate[1]))
+
+        if self.verbose:
+            reached = sum(1 for configuration, result in ranked if result[0])
+            print("Round", round_number + 1, "-", len(ranked),
+                  "configurations,", num_generations, "generations,",
+                  reached, "reached the target")
+
+        return ranked
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Tune Evolver hyperparameters by successive halving.")
+    parser.add_argument("--target", type=float, required=True,
+                        help="fitness to reach with the fewest games")
+    parser.add_argument("--configurations", type=int)
+    parser.add_argument("--min-generations", type=int)
+    parser.add_argument("--reduction-factor", type=int)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int)
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    tuner = MetaTuner(Launcher.MAX_YEARS, Launcher.INITIAL_MONEY,
+                      data_reader.import_crops(), data_reader.import_fields(),
+                      arguments.target, arguments.configurations,
+                      arguments.min_generations, arguments.reduction_factor,
+                      arguments.workers, arguments.seed)
+    ranked = tuner.run()
+
+    configuration, (reached, games_played, best_fitness) = ranked[0]
+    print("Best configuration:")
+
+    for name, value in configuration.items():
+        print("    {}: {}".format(name, value))
+
+    print("Reached target:", reached, " Games played:", games_played,
+          " Best fitness:", round(best_fitness))
@@ -0,0 +1,123 @@
+import math
+
+
+# Divisor applied to field ratios so that the spread of initial field ratios
+# is comparable to the spread of planting probabilities.
+FIELD_RATIO_SCALE = 2
+
+
+def genome_vector(strategy, crops):
+    """
+    Return the point in genome space of the given Strategy: its planting
+    probabilities in catalog order, followed by its scaled field ratio.
+    """
+
+    vector = [strategy.chances_to_plant[crop] for crop in crops]
+    vector.append(strategy.field_ratio / FIELD_RATIO_SCALE)
+
+    return vector
+
+
+class GenomeIndex:
+    """
+    Class representing a KD-tree over a set of genome vectors, answering
+    "which genomes lie within distance r of this one" without comparing every
+    pair. Each split is on the axis with the greatest spread, as genomes tend
+    to cluster along a few crops.
+    """
+
+    LEAF_SIZE = 8
+
+    __slots__ = ("points", "root")
+
+    def __init__(self, points):
+        self.points = points
+        self.root = self.build(list(range(len(points))))
+
+    def build(self, indices):
+        """
+        Build the subtree holding the points with the given indices. Leaves
+        are lists of indices; internal nodes are (axis, split, left, right).
+        """
+
+        if len(indices) <= GenomeIndex.LEAF_SIZE:
+            return indices
+
+        points = self.points
+        axis = max(range(len(points[indices[0]])),
+                   key=lambda a: (max(points[i][a] for i in indices)
+                                  - min(points[i][a] for i in indices)))
+
+        indices.sort(key=lambda i: points[i][axis])
+        middle = len(indices) // 2
+        split = points[indices[middle]][axis]
+
+        # All points are identical along every axis, so cannot be split
+        if points[indices[0]][axis] == points[indices[-1]][axis]:
+            return indices
+
+        return (axis, split, self.build(indices[:middle]),
+                self.build(indices[middle:]))
+
+    def within(self, point, radius):
+        """
+        Return a list of (index, distance) pairs for the points within the
+        given distance of the given point, including the point itself if it
+        is in the index.
+        """
+
+        found = []
+        squared_radius = radius * radius
+        pending = [self.root]
+
+        while pending:
+            node = pending.pop()
+
+            if isinstance(node, list):
+                for index in node:
+                    other = self.points[index]
+                    squared_distance = sum((a - b) * (a - b) for a, b
+                                           in zip(point, other))
+
+                    if squared_distance <= squared_radius:
+                        found.append((index, math.sqrt(squared_distance)))
+                continue
+
+            axis, split, left, right = node
+            offset = point[axis] - split
+
+            if offset < 0:
+                pending.append(left)
+                if -offset <= radius:
+                    pending.append(right)
+            else:
+                pending.append(right)
+                if offset <= radius:
+                    pending.append(left)
+
+        return found
+
+
+def niche_counts(points, radius):
+    """
+    Return the niche count of each of the given genome vectors: the sum of
+    the triangular sharing function 1 - d / radius over every genome within
+    the radius, including itself. A genome with no neighbours has a niche
+    count of 1.
+    """
+
+    index = GenomeIndex(points)
+
+    return [sum(1 - distance / radius for other, distance
+                in index.within(point, radius))
+            for point in points]
+
+
+def effective_niches(counts):
+    """
+    Return the effective number of niches given the niche counts of a
+    population: each cluster of identical genomes contributes one niche,
+    however large it is.
+    """
+
+    return sum(1 / count for count in counts)
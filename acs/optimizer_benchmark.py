@@ -0,0 +1,97 @@
+import argparse
+import statistics
+
+from acs.optimizers import *
+from acs.data_reader import DataReader
+from acs.launchers import Launcher
+
+
+class OptimizerBenchmark:
+    """
+    Class comparing Optimizers by the number of games they simulate before
+    first proposing a Strategy that reaches a target fitness. As a single
+    evaluation is noisy, the best Strategy of each run is also re-evaluated
+    with more games, with the same weather for every run.
+    """
+
+    CONFIRMATION_GAMES = 200
+
+    def __init__(self, crops, fields, target_fitness, max_games, runs=3,
+                 seed=0, workers=None):
+        self.crops = crops
+        self.fields = fields
+        self.target_fitness = target_fitness
+        self.max_games = max_games
+        self.runs = runs
+        self.seed = seed
+        self.workers = workers
+
+    def run(self, optimizer_names):
+        """
+        Return a dictionary of results for each of the named Optimizers: the
+        games simulated in each run (None where the target was not reached)
+        and the confirmed fitness of the best Strategy of each run.
+        """
+
+        results = {}
+
+        for name in optimizer_names:
+            games_to_target = []
+            confirmed_fitness = []
+
+            for run in range(self.runs):
+                evolver = Evolver(Launcher.MAX_YEARS, Launcher.INITIAL_MONEY,
+                                  self.crops, self.fields, verbose=False,
+                                  seed=derive_seed(self.seed, name, run),
+                                  workers=self.workers)
+                games, best = optimise(OPTIMIZERS[name](evolver),
+                                       self.max_games, self.target_fitness)
+
+                reached = best.fitness >= self.target_fitness
+                games_to_target.append(games if reached else None)
+
+                evolver.evaluate_strategy(
+                    best, derive_seed(self.seed, "confirmation"),
+                    OptimizerBenchmark.CONFIRMATION_GAMES)
+                confirmed_fitness.append(best.fitness)
+
+            results[name] = {
+                "games_to_target": games_to_target,
+                "confirmed_fitness": confirmed_fitness
+            }
+
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare optimizers by games simulated to reach a target "
+                    "fitness.")
+    parser.add_argument("--optimizer", action="append",
+                        choices=sorted(OPTIMIZERS),
+                        help="optimizer to benchmark (repeatable; default "
+                             "all)")
+    parser.add_argument("--target", type=float, default=30000)
+    parser.add_argument("--max-games", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    benchmark = OptimizerBenchmark(data_reader.import_crops(),
+                                   data_reader.import_fields(),
+                                   arguments.target, arguments.max_games,
+                                   arguments.runs, arguments.seed,
+                                   arguments.workers)
+    results = benchmark.run(arguments.optimizer or sorted(OPTIMIZERS))
+
+    for name, result in results.items():
+        reached = [games for games in result["games_to_target"]
+                   if games is not None]
+        median = statistics.median(reached) if reached else "-"
+
+        print("{}: reached target in {}/{} runs, median games {}, "
+              "confirmed fitness {}".format(
+                  name, len(reached), len(result["games_to_target"]), median,
+                  round(statistics.mean(result["confirmed_fitness"]))))
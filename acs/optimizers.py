@@ -0,0 +1,360 @@
+from abc import ABC, abstractmethod
+import math
+
+from acs.ai import *
+
+
+def strategy_from_vector(vector, crops):
+    """
+    Create a Strategy from a point in continuous genome space: the logarithm
+    of each crop weighting in catalog order, followed by the field ratio.
+    """
+
+    crop_weightings = {crop: math.exp(min(value, 50))
+                       for crop, value in zip(crops, vector)}
+
+    return Strategy(crop_weightings, vector[len(crops)])
+
+
+def vector_from_strategy(strategy, crops):
+    """
+    Return the point in continuous genome space of the given Strategy.
+    """
+
+    vector = [math.log(max(strategy.crop_weightings[crop], 1e-6))
+              for crop in crops]
+    vector.append(strategy.field_ratio)
+
+    return vector
+
+
+class Optimizer(ABC):
+    """
+    Class representing a search algorithm over Strategies, separated from the
+    playing of games: each iteration it proposes candidate Strategies, which
+    are evaluated elsewhere, and is then told their fitness.
+    """
+
+    def __init__(self, evolver):
+        self.evolver = evolver
+        self.best = None
+
+    @abstractmethod
+    def ask(self):
+        """
+        Return a list of new candidate Strategies to be evaluated.
+        """
+
+        pass
+
+    @abstractmethod
+    def tell(self, candidates):
+        """
+        Update the search given the candidates from the last call to ask,
+        whose fitness has now been determined.
+        """
+
+        pass
+
+    def record_best(self, candidates):
+        for candidate in candidates:
+            if self.best is None or candidate.fitness > self.best.fitness:
+                self.best = candidate
+
+
+class GeneticOptimizer(Optimizer):
+    """
+    Optimizer using the Evolver's own genetic algorithm: geometric parent
+    selection, odd/even crossover and random-reset mutation.
+    """
+
+    def __init__(self, evolver):
+        super().__init__(evolver)
+        self.generation = None
+
+    def ask(self):
+        if self.generation is None:
+            return self.evolver.generate_initial_population()
+
+        next_generation = self.evolver.breed_generation(self.generation)
+        self.evolver.mutate(next_generation)
+
+        return next_generation
+
+    def tell(self, candidates):
+        self.generation = sorted(candidates)
+        self.record_best(candidates)
+
+
+class DifferentialEvolutionOptimizer(Optimizer):
+    """
+    Optimizer using differential evolution (DE/rand/1/bin) over the
+    continuous genome: each member of the population is challenged by a trial
+    vector built from the difference of two others, and replaced if beaten.
+    """
+
+    POPULATION_SIZE = 40
+    DIFFERENTIAL_WEIGHT = 0.6
+    CROSSOVER_PROBABILITY = 0.9
+
+    def __init__(self, evolver, population_size=None):
+        super().__init__(evolver)
+        self.population_size = (population_size
+                                or DifferentialEvolutionOptimizer
+                                .POPULATION_SIZE)
+        self.population = None
+
+    def ask(self):
+        rng = self.evolver.rng
+
+        if self.population is None:
+            return [self.evolver.generate_random_strategy()
+                    for i in range(self.population_size)]
+
+        vectors = [vector_from_strategy(member, self.evolver.crops)
+                   for member in self.population]
+        dimensions = len(vectors[0])
+        trials = []
+
+        for i, target in enumerate(vectors):
+            a, b, c = rng.sample([j for j in range(len(vectors)) if j != i],
+                                 3)
+            forced = rng.randrange(dimensions)
+            trial = []
+
+            for d in range(dimensions):
+                if d == forced or \
+                        rng.random() < DifferentialEvolutionOptimizer \
+                        .CROSSOVER_PROBABILITY:
+                    trial.append(vectors[a][d]
+                                 + DifferentialEvolutionOptimizer
+                                 .DIFFERENTIAL_WEIGHT
+                                 * (vectors[b][d] - vectors[c][d]))
+                else:
+                    trial.append(target[d])
+
+            trials.append(strategy_from_vector(trial, self.evolver.crops))
+
+        return trials
+
+    def tell(self, candidates):
+        if self.population is None:
+            self.population = list(candidates)
+        else:
+            for i, trial in enumerate(candidates):
+                if trial.fitness >= self.population[i].fitness:
+                    self.population[i] = trial
+
+        self.record_best(candidates)
+
+
+def symmetric_eigen(matrix, sweeps=50):
+    """
+    Return the eigenvalues and eigenvectors (as the columns of a matrix) of
+    the given symmetric matrix, using the cyclic Jacobi method.
+    """
+
+    n = len(matrix)
+    a = [list(row) for row in matrix]
+    vectors = [[float(i == j) for j in range(n)] for i in range(n)]
+
+    for sweep in range(sweeps):
+        off_diagonal = sum(a[i][j] * a[i][j] for i in range(n)
+                           for j in range(i + 1, n))
+
+        if off_diagonal < 1e-22:
+            break
+
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                if abs(a[p][q]) < 1e-300:
+                    continue
+
+                theta = (a[q][q] - a[p][p]) / (2 * a[p][q])
+                t = math.copysign(1, theta) / (abs(theta)
+                                               + math.sqrt(theta * theta + 1))
+                c = 1 / math.sqrt(t * t + 1)
+                s = t * c
+
+                for k in range(n):
+                    akp = a[k][p]
+                    akq = a[k][q]
+                    a[k][p] = c * akp - s * akq
+                    a[k][q] = s * akp + c * akq
+
+                for k in range(n):
+                    apk = a[p][k]
+                    aqk = a[q][k]
+                    a[p][k] = c * apk - s * aqk
+                    a[q][k] = s * apk + c * aqk
+
+                for k in range(n):
+                    vkp = vectors[k][p]
+                    vkq = vectors[k][q]
+                    vectors[k][p] = c * vkp - s * vkq
+                    vectors[k][q] = s * vkp + c * vkq
+
+    return [a[i][i] for i in range(n)], vectors
+
+
+class CMAESOptimizer(Optimizer):
+    """
+    Optimizer using the covariance matrix adaptation evolution strategy over
+    the continuous genome, with the standard default parameters. Candidates
+    are drawn from a multivariate normal distribution whose mean, covariance
+    and step size are adapted towards the fittest candidates.
+    """
+
+    INITIAL_STEP_SIZE = 1.0
+    INITIAL_FIELD_RATIO = 2.0
+
+    def __init__(self, evolver, population_size=None):
+        super().__init__(evolver)
+        n = len(evolver.crops) + 1
+        self.dimensions = n
+        self.population_size = population_size or 4 + int(3 * math.log(n))
+        self.parents = self.population_size // 2
+
+        weights = [math.log(self.parents + 0.5) - math.log(i + 1)
+                   for i in range(self.parents)]
+        total = sum(weights)
+        self.weights = [weight / total for weight in weights]
+        self.mu_eff = 1 / sum(weight * weight for weight in self.weights)
+
+        mu_eff = self.mu_eff
+        self.c_sigma = (mu_eff + 2) / (n + mu_eff + 5)
+        self.d_sigma = (1 + 2 * max(0, math.sqrt((mu_eff - 1) / (n + 1)) - 1)
+                        + self.c_sigma)
+        self.c_c = (4 + mu_eff / n) / (n + 4 + 2 * mu_eff / n)
+        self.c_1 = 2 / ((n + 1.3) ** 2 + mu_eff)
+        self.c_mu = min(1 - self.c_1, 2 * (mu_eff - 2 + 1 / mu_eff)
+                        / ((n + 2) ** 2 + mu_eff))
+        self.expected_norm = math.sqrt(n) * (1 - 1 / (4 * n)
+                                             + 1 / (21 * n * n))
+
+        self.mean = [0.0] * (n - 1) + [CMAESOptimizer.INITIAL_FIELD_RATIO]
+        self.step_size = CMAESOptimizer.INITIAL_STEP_SIZE
+        self.covariance = [[float(i == j) for j in range(n)]
+                           for i in range(n)]
+        self.eigenvalues = [1.0] * n
+        self.eigenvectors = [[float(i == j) for j in range(n)]
+                             for i in range(n)]
+        self.sigma_path = [0.0] * n
+        self.covariance_path = [0.0] * n
+        self.iteration = 0
+        self.steps = None
+
+    def ask(self):
+        n = self.dimensions
+        rng = self.evolver.rng
+        scales = [math.sqrt(max(value, 0)) for value in self.eigenvalues]
+        self.steps = []
+        candidates = []
+
+        for k in range(self.population_size):
+            z = [rng.gauss(0, 1) * scale for scale in scales]
+            y = [sum(self.eigenvectors[i][j] * z[j] for j in range(n))
+                 for i in range(n)]
+            self.steps.append(y)
+            candidates.append(strategy_from_vector(
+                [m + self.step_size * step for m, step in zip(self.mean, y)],
+                self.evolver.crops))
+
+        return candidates
+
+    def tell(self, candidates):
+        n = self.dimensions
+        self.iteration += 1
+        self.record_best(candidates)
+
+        ranked = sorted(range(len(candidates)),
+                        key=lambda k: -candidates[k].fitness)
+        selected = [self.steps[k] for k in ranked[:self.parents]]
+        mean_step = [sum(weight * step[i] for weight, step
+                         in zip(self.weights, selected)) for i in range(n)]
+        self.mean = [m + self.step_size * step
+                     for m, step in zip(self.mean, mean_step)]
+
+        # Whiten the mean step using C^-1/2 = B D^-1 B^T
+        projected = [sum(self.eigenvectors[j][i] * mean_step[j]
+                         for j in range(n))
+                     / math.sqrt(max(self.eigenvalues[i], 1e-20))
+                     for i in range(n)]
+        whitened = [sum(self.eigenvectors[i][j] * projected[j]
+                        for j in range(n)) for i in range(n)]
+
+        sigma_scale = math.sqrt(self.c_sigma * (2 - self.c_sigma)
+                                * self.mu_eff)
+        self.sigma_path = [(1 - self.c_sigma) * p + sigma_scale * w
+                           for p, w in zip(self.sigma_path, whitened)]
+        sigma_norm = math.sqrt(sum(p * p for p in self.sigma_path))
+
+        stalled = (sigma_norm / math.sqrt(
+            1 - (1 - self.c_sigma) ** (2 * self.iteration))
+            < (1.4 + 2 / (n + 1)) * self.expected_norm)
+        h_sigma = 1.0 if stalled else 0.0
+
+        covariance_scale = math.sqrt(self.c_c * (2 - self.c_c) * self.mu_eff)
+        self.covariance_path = [
+            (1 - self.c_c) * p + h_sigma * covariance_scale * step
+            for p, step in zip(self.covariance_path, mean_step)]
+
+        correction = (1 - h_sigma) * self.c_c * (2 - self.c_c)
+        pc = self.covariance_path
+
+        for i in range(n):
+            for j in range(i + 1):
+                rank_mu = sum(weight * step[i] * step[j] for weight, step
+                              in zip(self.weights, selected))
+                value = ((1 - self.c_1 - self.c_mu) * self.covariance[i][j]
+                         + self.c_1 * (pc[i] * pc[j]
+                                       + correction * self.covariance[i][j])
+                         + self.c_mu * rank_mu)
+                self.covariance[i][j] = value
+                self.covariance[j][i] = value
+
+        self.step_size *= math.exp(self.c_sigma / self.d_sigma
+                                   * (sigma_norm / self.expected_norm - 1))
+        self.eigenvalues, self.eigenvectors = symmetric_eigen(self.covariance)
+
+
+OPTIMIZERS = {
+    "genetic": GeneticOptimizer,
+    "differential-evolution": DifferentialEvolutionOptimizer,
+    "cma-es": CMAESOptimizer
+}
+
+
+def optimise(optimizer, max_games, target_fitness=None):
+    """
+    Run the given Optimizer, evaluating its candidates with its Evolver,
+    until the target fitness is reached or the given number of games has been
+    simulated. Return the number of games simulated and the best Strategy
+    found.
+    """
+
+    evolver = optimizer.evolver
+    num_games = evolver.num_games
+    games_played = 0
+    iteration = 0
+
+    evolver.start_workers()
+
+    try:
+        while games_played < max_games:
+            candidates = optimizer.ask()
+            seeds = [derive_seed(evolver.seed, "optimiser", iteration, index)
+                     for index in range(len(candidates))]
+            evolver.evaluate_strategies(candidates, seeds, num_games)
+            optimizer.tell(candidates)
+
+            games_played += len(candidates) * num_games
+            iteration += 1
+
+            if target_fitness is not None and \
+                    optimizer.best.fitness >= target_fitness:
+                break
+    finally:
+        evolver.stop_workers()
+
+    return games_played, optimizer.best
@@ -0,0 +1,226 @@
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+
+
+class ProgressSnapshot:
+    """
+    Class representing the state of an evolution run at the end of one
+    generation. Snapshots are never modified once built, so the server thread
+    can read whichever one is current without locking.
+    """
+
+    __slots__ = ("generation", "games_played", "elapsed_seconds",
+                 "best_fitness", "average_fitness", "history",
+                 "top_strategies")
+
+    def __init__(self, generation, games_played, elapsed_seconds,
+                 best_fitness, average_fitness, history, top_strategies):
+        self.generation = generation
+        self.games_played = games_played
+        self.elapsed_seconds = elapsed_seconds
+        self.best_fitness = best_fitness
+        self.average_fitness = average_fitness
+        self.history = history
+        self.top_strategies = top_strategies
+
+    def to_dict(self):
+        return {
+            "generation": self.generation,
+            "games_played": self.games_played,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "games_per_second": round(self.games_played
+                                      / max(self.elapsed_seconds, 1e-9), 1),
+            "best_fitness": self.best_fitness,
+            "average_fitness": self.average_fitness,
+            "history": [{"generation": generation, "best_fitness": best,
+                         "average_fitness": average}
+                        for generation, best, average in self.history],
+            "top_strategies": self.top_strategies
+        }
+
+
+class ProgressMonitor:
+    """
+    Class publishing the progress of an Evolver to a local HTTP endpoint,
+    served from a daemon thread. The Evolver calls update once per
+    generation, which appends to a fixed-length ring buffer of fitness
+    history and swaps in a new ProgressSnapshot; requests only ever read the
+    current snapshot, so they never hold up evaluation. The endpoint listens
+    on a TCP address or a Unix socket path.
+    """
+
+    # Number of generations of fitness history kept.
+    HISTORY_LENGTH = 1000
+
+    # Number of Strategies included in each snapshot.
+    TOP_STRATEGIES = 5
+
+    def __init__(self, address, history_length=None):
+        self.address = address
+        self.history = deque(maxlen=history_length
+                             or ProgressMonitor.HISTORY_LENGTH)
+        self.snapshot = None
+        self.server = None
+        self.thread = None
+
+        # Inode of the Unix socket this monitor created, so that only that
+        # socket is removed when it stops.
+        self.socket_inode = None
+
+    @staticmethod
+    def parse_address(text):
+        """
+        Return the address given by "HOST:PORT", ":PORT" (on localhost) or
+        the path of a Unix socket.
+        """
+
+        host, separator, port = text.rpartition(":")
+
+        if separator and port.isdigit():
+            return host or "127.0.0.1", int(port)
+
+        return text
+
+    def start(self):
+        """
+        Start serving progress, and return the address listened on.
+        """
+
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                if not ProgressMonitor.is_socket(self.address):
+                    raise ValueError(self.address + " exists and is not a "
+                                     "socket")
+
+                if ProgressMonitor.is_listening(self.address):
+                    raise ValueError(self.address + " is in use by another "
+                                     "server")
+
+                # Left behind by an earlier run
+                os.remove(self.address)
+
+            self.server = UnixProgressServer(self.address, self)
+            self.socket_inode = os.stat(self.address).st_ino
+        else:
+            self.server = TCPProgressServer(self.address, self)
+
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       name="progress-server", daemon=True)
+        self.thread.start()
+
+        return self.server.server_address
+
+    @staticmethod
+    def is_socket(path):
+        try:
+            return stat.S_ISSOCK(os.stat(path).st_mode)
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def is_listening(path):
+        """
+        Return whether a server is accepting connections on the Unix socket
+        at the given path.
+        """
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(path)
+            except ConnectionRefusedError:
+                return False
+
+        return True
+
+    def stop(self):
+        if self.server is None:
+            return
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+        if self.socket_inode is not None and \
+                ProgressMonitor.is_socket(self.address) and \
+                os.stat(self.address).st_ino == self.socket_inode:
+            os.remove(self.address)
+
+        self.server = None
+        self.thread = None
+        self.socket_inode = None
+
+    def update(self, evolver, generation, strategies):
+        """
+        Publish the state of the given Evolver after the given generation,
+        whose Strategies are sorted by fitness.
+        """
+
+        average_fitness = round(evolver.fitness_statistics.running.mean, 2)
+        best_fitness = round(strategies[0].fitness, 2)
+        elapsed_seconds = evolver.elapsed_seconds
+
+        if evolver.start_time is not None:
+            elapsed_seconds += time.perf_counter() - evolver.start_time
+
+        self.history.append((generation + 1, best_fitness, average_fitness))
+        self.snapshot = ProgressSnapshot(
+            generation + 1, evolver.games_played, elapsed_seconds,
+            best_fitness, average_fitness, tuple(self.history),
+            [{"fitness": round(strategy.fitness, 2),
+              "strategy": strategy.to_dict()}
+             for strategy in strategies[:ProgressMonitor.TOP_STRATEGIES]])
+
+    def render(self):
+        """
+        Return the current snapshot as a JSON document.
+        """
+
+        snapshot = self.snapshot
+
+        if snapshot is None:
+            return json.dumps({"generation": 0})
+
+        return json.dumps(snapshot.to_dict())
+
+
+class ProgressRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = self.server.monitor.render().encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no host address.
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+
+        return "local"
+
+    def log_message(self, format, *arguments):
+        pass
+
+
+class TCPProgressServer(HTTPServer):
+
+    def __init__(self, address, monitor):
+        self.monitor = monitor
+        super().__init__(address, ProgressRequestHandler)
+
+
+class UnixProgressServer(socketserver.UnixStreamServer):
+
+    def __init__(self, path, monitor):
+        self.monitor = monitor
+        super().__init__(path, ProgressRequestHandler)
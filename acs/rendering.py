@@ -0,0 +1,104 @@
+import sys
+
+
+# Precompiled templates for the reports shown to players, each producing the
+# text the equivalent print calls would.
+FIELD_STATUS = "{0} - {1}\nValue: {2}  Size: {3}\nContents: None\n\n".format
+PLANTED_FIELD_STATUS = ("{0} - {1}\nValue: {2}  Size: {3}\n"
+                        "Contents: {4} ( {5} )\n\n").format
+FIELD_PERFORMANCE = "{0} - {1} , Revenue {2} , Cost {3}\n".format
+CROP_DETAILS = "{0} - {1}\nCost: {2}   Sale price: {3} \n\n".format
+STATUS_HEADER = ("\nYear: {0}\nBalance: {1}\nAsset Value: {2}\n"
+                 "\nFields:\n\n").format
+CROPS_HEADER = "\nAvailable crops for planting:\n\n"
+FINANCIALS = "Asset acquisitions: {0}\nRevenue: {1}\nExpenses: {2}\n".format
+LOSS = "Commiserations... you made a loss of {0}\n".format
+PROFIT = "Congratulations! You made a profit of {0}\n".format
+STRATEGY_HEADER = "SCORE: {0}  Field ratio: {1:.3f} || ".format
+CROP_CHANCE = "{0}: {1}%  ".format
+
+
+class SocketOutput:
+    """
+    Class adapting a connected socket to the file interface, so that reports
+    can be written straight to a remote player. Each write is sent whole.
+    """
+
+    __slots__ = ("socket",)
+
+    def __init__(self, socket):
+        self.socket = socket
+
+    def write(self, text):
+        self.socket.sendall(text.encode("utf-8"))
+
+    def flush(self):
+        pass
+
+
+def write_report(text, output=None):
+    """
+    Write a rendered report to the given file, socket adapter or stream
+    (standard output by default) in a single write.
+    """
+
+    if output is None:
+        output = sys.stdout
+
+    output.write(text)
+
+
+def render_field_status(field):
+    if field.crop is None:
+        return FIELD_STATUS(field.name, field.description, field.price,
+                            field.max_crop_quantity)
+
+    return PLANTED_FIELD_STATUS(field.name, field.description, field.price,
+                                field.max_crop_quantity, field.crop.name,
+                                field.crop_quantity)
+
+
+def render_field_performance(field):
+    if field.is_empty():
+        return ""
+
+    return FIELD_PERFORMANCE(field.name, field.crop.name, field.last_revenue,
+                             field.crop.cost * field.crop_quantity)
+
+
+def render_crop(crop):
+    return CROP_DETAILS(crop.name, crop.description, crop.cost,
+                        crop.sale_price)
+
+
+def render_status(year, money, assets, fields):
+    return STATUS_HEADER(year, money, assets) + "".join(
+        [render_field_status(field) for field in fields])
+
+
+def render_crops(crops):
+    return CROPS_HEADER + "".join([render_crop(crop) for crop in crops])
+
+
+def render_field_performances(fields):
+    return "\n" + "".join([render_field_performance(field)
+                           for field in fields])
+
+
+def render_financials(income, expenditure, new_assets):
+    profit = income + new_assets - expenditure
+    outcome = LOSS(profit) if profit < 0 else PROFIT(profit)
+
+    return FINANCIALS(new_assets, income, expenditure) + outcome
+
+
+def render_strategy(fitness, field_ratio, crop_chances):
+    """
+    Given a Strategy's fitness and field ratio and its CropChances in the
+    order to report them, return its one-line summary.
+    """
+
+    return STRATEGY_HEADER(round(fitness), round(field_ratio, 3)) + "".join(
+        [CROP_CHANCE(crop_chance.crop.name,
+                     int(round(crop_chance.chance * 100)))
+         for crop_chance in crop_chances])
@@ -0,0 +1,34 @@
+import hashlib
+import random
+
+
+def derive_seed(master_seed, *path):
+    """
+    Return a 64-bit seed for the random stream identified by the given path
+    (e.g. "generation", 3, 17) under a master seed. Derivation hashes the path
+    rather than drawing from a shared generator, so that every stream is
+    independent of the order, process and platform in which it is requested.
+    """
+
+    key = repr((master_seed,) + path).encode("utf-8")
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+
+    return int.from_bytes(digest, "little")
+
+
+def make_rng(master_seed, *path):
+    """
+    Return a new random number generator for the stream identified by the
+    given path under a master seed.
+    """
+
+    return random.Random(derive_seed(master_seed, *path))
+
+
+def generate_master_seed():
+    """
+    Return a fresh master seed for runs which were not given one, so that they
+    can still be reproduced once the seed is reported.
+    """
+
+    return random.SystemRandom().getrandbits(64)
@@ -0,0 +1,207 @@
+import argparse
+import hashlib
+import json
+import time
+
+from acs.data_reader import DataReader
+from acs.game import *
+from acs.launchers import Launcher
+from acs.seeding import derive_seed, make_rng
+
+
+class Session:
+    """
+    Class representing a recorded interactive game: its parameters, the seed
+    of its weather, every number the player entered, and the final score and
+    a digest of the output it produced, against which replays are checked.
+    """
+
+    __slots__ = ("max_years", "initial_money", "seed", "decisions",
+                 "final_score", "output_digest")
+
+    def __init__(self, max_years, initial_money, seed, decisions,
+                 final_score=None, output_digest=None):
+        self.max_years = max_years
+        self.initial_money = initial_money
+        self.seed = seed
+        self.decisions = decisions
+        self.final_score = final_score
+        self.output_digest = output_digest
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in Session.__slots__}
+
+    @staticmethod
+    def from_dict(data):
+        return Session(*[data[name] for name in Session.__slots__])
+
+    def replay(self, crops, fields):
+        """
+        Play this session again, and return its final score (None if it ran
+        out of decisions) and the digest of its output.
+        """
+
+        input_provider = ScriptedInputProvider(self.decisions)
+        game = Game(self.max_years, self.initial_money, input_provider, crops,
+                    [field.copy() for field in fields],
+                    rng=make_rng(self.seed, "weather"))
+
+        try:
+            score = game.run()
+        except EOFError:
+            score = None
+
+        return score, Session.digest(input_provider.output.getvalue())
+
+    @staticmethod
+    def digest(output):
+        return hashlib.blake2b(output.encode("utf-8"),
+                               digest_size=16).hexdigest()
+
+
+class RandomInputProvider(ScriptedInputProvider):
+    """
+    Class representing a random player, for generating sessions which cover
+    the whole interactive path: every menu option, cancelling, and numbers
+    out of range, which are ignored. Retiring is rare, so that most games
+    run to the end.
+    """
+
+    # Chances of entering a number out of range, and of cancelling.
+    CHANCE_OF_INVALID = 0.05
+    CHANCE_OF_CANCEL = 0.05
+    CHANCE_OF_RETIRING = 0.002
+
+    def __init__(self, rng):
+        super().__init__([])
+        self.rng = rng
+        self.recording = []
+        self.choices = []
+        self.first_invalid = 1
+
+    def choose_from_numbered_list(self, numbered_list):
+        choices = [key for key, value in numbered_list.items()
+                   if value is not EXIT_ACTION or
+                   self.rng.random() < RandomInputProvider.CHANCE_OF_RETIRING]
+        self.choices = choices or list(numbered_list)
+        self.first_invalid = len(numbered_list) + 1
+
+        return super().choose_from_numbered_list(numbered_list)
+
+    def choose_quantity(self, maximum):
+        self.choices = list(range(1, maximum + 1))
+        self.first_invalid = maximum + 1
+
+        return super().choose_quantity(maximum)
+
+    def read_number(self):
+        r = self.rng.random()
+
+        # Numbers out of range start above every option, including the
+        # Exit option left out of the choices
+        if r < RandomInputProvider.CHANCE_OF_INVALID:
+            selection = self.first_invalid + self.rng.randrange(5)
+        elif r < (RandomInputProvider.CHANCE_OF_INVALID
+                  + RandomInputProvider.CHANCE_OF_CANCEL):
+            selection = 0
+        else:
+            selection = self.rng.choice(self.choices)
+
+        self.recording.append(selection)
+
+        return selection
+
+
+def record_sessions(num_sessions, max_years, initial_money, crops, fields,
+                    seed):
+    """
+    Return the given number of Sessions played by random players.
+    """
+
+    sessions = []
+
+    for index in range(num_sessions):
+        session_seed = derive_seed(seed, "session", index)
+        input_provider = RandomInputProvider(make_rng(session_seed,
+                                                      "decisions"))
+        game = Game(max_years, initial_money, input_provider, crops,
+                    [field.copy() for field in fields],
+                    rng=make_rng(session_seed, "weather"))
+        score = game.run()
+
+        sessions.append(Session(
+            max_years, initial_money, session_seed, input_provider.recording,
+            score, Session.digest(input_provider.output.getvalue())))
+
+    return sessions
+
+
+def save_sessions(sessions, file_name):
+    with open(file_name, "w", encoding="utf-8") as sessions_file:
+        for session in sessions:
+            sessions_file.write(json.dumps(session.to_dict()) + "\n")
+
+
+def load_sessions(file_name):
+    with open(file_name, encoding="utf-8") as sessions_file:
+        return [Session.from_dict(json.loads(line))
+                for line in sessions_file if line.strip()]
+
+
+def replay_sessions(sessions, crops, fields):
+    """
+    Replay the given Sessions, and return those whose score or output has
+    changed, the number of decisions replayed and the time taken.
+    """
+
+    changed = []
+    start_time = time.perf_counter()
+
+    for session in sessions:
+        score, output_digest = session.replay(crops, fields)
+
+        if score != session.final_score or \
+                output_digest != session.output_digest:
+            changed.append(session)
+
+    return (changed, sum(len(session.decisions) for session in sessions),
+            time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Record random interactive sessions, or replay recorded "
+                    "sessions as a regression test and benchmark of the "
+                    "interactive game.")
+    parser.add_argument("command", choices=["record", "replay"])
+    parser.add_argument("file", help="sessions file (JSON lines)")
+    parser.add_argument("--sessions", type=int, default=1000,
+                        help="number of sessions to record")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    crops = data_reader.import_crops()
+    fields = data_reader.import_fields()
+
+    if arguments.command == "record":
+        sessions = record_sessions(arguments.sessions, Launcher.MAX_YEARS,
+                                   Launcher.INITIAL_MONEY, crops, fields,
+                                   arguments.seed)
+        save_sessions(sessions, arguments.file)
+        print("Recorded", len(sessions), "sessions in", arguments.file)
+    else:
+        sessions = load_sessions(arguments.file)
+        changed, num_decisions, seconds = replay_sessions(sessions, crops,
+                                                          fields)
+
+        print("Replayed {} sessions ({} decisions) in {:.2f}s: {:.0f} "
+              "sessions/s, {:.0f} decisions/s".format(
+                  len(sessions), num_decisions, seconds,
+                  len(sessions) / seconds, num_decisions / seconds))
+
+        for session in changed:
+            print("Changed: session with seed", session.seed)
+
+        if changed:
+            raise SystemExit(1)
@@ -0,0 +1,192 @@
+from multiprocessing import shared_memory
+import json
+import os
+import secrets
+import struct
+import weakref
+
+from acs.data_reader import DataReader
+from acs.farm import Crop, Field
+from acs.weather import WeatherTable
+
+
+# Magic, layout version, catalog digest, crop count, field count, weather
+# scenario count, years per scenario, length of the encoded names
+HEADER = struct.Struct("<8sI64sIIIII")
+MAGIC = b"ACSTABLE"
+LAYOUT_VERSION = 1
+
+# ID, cost, sale price, ideal heat, ideal wetness, heat and wetness
+# sensitivity
+CROP_COLUMNS = 7
+
+# ID, max crop quantity, soil quality, price
+FIELD_COLUMNS = 4
+DOUBLE_SIZE = 8
+
+
+def as_number(value):
+    """
+    Return a value read back from a table of doubles as an int if it holds a
+    whole number, as catalog quantities and prices are.
+    """
+
+    return int(value) if value.is_integer() else value
+
+
+def release_block(block, views, owned):
+    """
+    Release any views of a shared memory block and close it, unlinking it if
+    this process created it.
+    """
+
+    for view in views:
+        view.release()
+
+    block.close()
+
+    if owned:
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedTables:
+    """
+    Class publishing the numeric crop and field catalog, and a WeatherTable
+    of pre-drawn weather, in one block of shared memory. Worker processes
+    attach to the block by name and read the tables in place, without copying
+    or unpickling them.
+
+    The catalog digest is stored in the header so that workers can refuse a
+    block built from a different version of the catalog. The creating process
+    unlinks the block when it is closed, garbage collected or exits, and if it
+    crashes, multiprocessing's resource tracker unlinks the block instead.
+    """
+
+    def __init__(self, block, owned):
+        self.block = block
+        self.views = []
+        self.finalizer = weakref.finalize(self, release_block, block,
+                                          self.views, owned)
+
+        (magic, layout_version, digest, num_crops, num_fields, num_scenarios,
+         years, names_length) = HEADER.unpack_from(block.buf, 0)
+
+        if magic != MAGIC or layout_version != LAYOUT_VERSION:
+            self.close()
+            raise ValueError("Not a shared table block: " + block.name)
+
+        self.catalog_digest = digest.decode("ascii")
+        offset = HEADER.size
+
+        crop_values = self.view_doubles(offset, num_crops * CROP_COLUMNS)
+        offset += num_crops * CROP_COLUMNS * DOUBLE_SIZE
+
+        field_values = self.view_doubles(offset, num_fields * FIELD_COLUMNS)
+        offset += num_fields * FIELD_COLUMNS * DOUBLE_SIZE
+
+        weather_values = self.view_doubles(offset, num_scenarios * years * 2)
+        offset += num_scenarios * years * 2 * DOUBLE_SIZE
+
+        names = json.loads(bytes(block.buf[offset:offset + names_length]))
+
+        self.crops = [
+            Crop(row[0], name, "", *row[1:]) for name, row in zip(
+                names["crops"], SharedTables.rows(crop_values, CROP_COLUMNS))]
+        self.fields = [
+            Field(row[0], name, "", *row[1:]) for name, row in zip(
+                names["fields"],
+                SharedTables.rows(field_values, FIELD_COLUMNS))]
+        self.weather_table = WeatherTable(weather_values, num_scenarios, years)
+
+    @staticmethod
+    def block_name(catalog_digest):
+        """
+        Return a new block name, unique to this publication but showing which
+        catalog it holds.
+        """
+
+        return "acs_{}_{}_{}".format(catalog_digest[:16], os.getpid(),
+                                     secrets.token_hex(4))
+
+    @staticmethod
+    def rows(values, columns):
+        """
+        Return the given table of doubles as lists of numbers, row by row.
+        """
+
+        return [[as_number(values[i + column]) for column in range(columns)]
+                for i in range(0, len(values), columns)]
+
+    def view_doubles(self, offset, count):
+        view = self.block.buf[offset:offset + count * DOUBLE_SIZE].cast("d")
+        self.views.append(view)
+        return view
+
+    @staticmethod
+    def publish(crops, fields, weather_table):
+        """
+        Create a shared memory block holding the given catalog and weather,
+        and return the SharedTables owning it.
+        """
+
+        digest = DataReader.catalog_digest(crops, fields)
+        names = json.dumps({
+            "crops": [crop.name for crop in crops],
+            "fields": [field.name for field in fields]
+        }).encode("utf-8")
+
+        crop_values = [value for crop in crops for value in (
+            crop.id, crop.cost, crop.sale_price, crop.ideal_heat,
+            crop.ideal_wetness, crop.heat_sensitivity,
+            crop.wetness_sensitivity)]
+        field_values = [value for field in fields for value in (
+            field.id, field.max_crop_quantity, field.soil_quality,
+            field.price)]
+
+        tables = struct.pack(
+            "<{}d".format(len(crop_values) + len(field_values)
+                          + len(weather_table.values)),
+            *crop_values, *field_values, *weather_table.values)
+        header = HEADER.pack(MAGIC, LAYOUT_VERSION, digest.encode("ascii"),
+                             len(crops), len(fields),
+                             weather_table.num_scenarios, weather_table.years,
+                             len(names))
+        contents = header + tables + names
+
+        block = shared_memory.SharedMemory(SharedTables.block_name(digest),
+                                           create=True, size=len(contents))
+        block.buf[:len(contents)] = contents
+
+        return SharedTables(block, True)
+
+    @staticmethod
+    def attach(name, expected_digest=None):
+        """
+        Attach to a published block, checking that it was built from the
+        expected catalog if a digest is given.
+        """
+
+        tables = SharedTables(shared_memory.SharedMemory(name), False)
+
+        if expected_digest is not None and \
+                tables.catalog_digest != expected_digest:
+            tables.close()
+            raise ValueError("Shared tables are for a different catalog")
+
+        return tables
+
+    @property
+    def name(self):
+        return self.block.name
+
+    def close(self):
+        self.finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
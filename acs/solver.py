@@ -0,0 +1,300 @@
+import math
+
+from acs.weather import WeatherGenerator
+
+
+class Solver:
+    """
+    Class computing a near-optimal expected-value policy for the game by
+    backward induction. Money is discretised onto a geometric grid, weather
+    onto a quadrature of the truncated normals used by WeatherGenerator, and
+    the value of every (year, money, owned fields) state is memoised in a table
+    which is interpolated between grid points.
+
+    Each year the solver may buy any affordable fields, then either plants a
+    single crop across its empty fields (most fertile first) at the maximum
+    affordable quantity, or plants nothing.
+    """
+
+    # Number of quadrature points used for each weather component.
+    WEATHER_POINTS = 5
+
+    # Money grid points are MONEY_SCALE * (MONEY_GROWTH ^ i - 1).
+    MONEY_BUCKETS = 120
+    MONEY_SCALE = 50
+    MONEY_GROWTH = 1.08
+
+    # Solved value tables, keyed by game parameters and catalog contents.
+    solution_cache = {}
+
+    def __init__(self, max_years, initial_money, crops, fields):
+        self.max_years = max_years
+        self.initial_money = initial_money
+        self.crops = crops
+        self.starting_field = fields[0]
+        self.purchasable_fields = fields[1:]
+
+        self.lowest_crop_cost = min(crop.cost for crop in crops)
+        self.weather_scenarios = Solver.discretise_weather()
+        self.money_grid = [
+            Solver.MONEY_SCALE * (Solver.MONEY_GROWTH ** i - 1)
+            for i in range(Solver.MONEY_BUCKETS)]
+        self.log_growth = math.log(Solver.MONEY_GROWTH)
+
+        # Income per unit planted of each crop in each field, per scenario.
+        self.unit_incomes = {}
+        for crop in crops:
+            for field in fields:
+                self.unit_incomes[(crop, field)] = [
+                    Solver.unit_income(crop, field, heat, wetness)
+                    for probability, heat, wetness in self.weather_scenarios]
+
+        self.probabilities = [scenario[0] for scenario in
+                              self.weather_scenarios]
+
+        # Asset value and planting order (most fertile first) per field set
+        masks = range(2 ** len(self.purchasable_fields))
+        self.mask_assets = [
+            sum(field.price for field in self.owned_fields(mask))
+            for mask in masks]
+        self.planting_orders = [
+            sorted(self.owned_fields(mask),
+                   key=lambda field: -field.soil_quality)
+            for mask in masks]
+
+        self.value_tables = None
+
+    @staticmethod
+    def discretise_weather():
+        """
+        Split the truncated normal range of each weather component into equal
+        bins, and return a list of (probability, heat, wetness) scenarios using
+        the bin midpoints.
+        """
+
+        def component_points(deviation, minimum, maximum):
+            width = (maximum - minimum) / Solver.WEATHER_POINTS
+            points = []
+
+            for i in range(Solver.WEATHER_POINTS):
+                lower = minimum + i * width
+                upper = lower + width
+                mass = (Solver.normal_cdf((upper - 1) / deviation)
+                        - Solver.normal_cdf((lower - 1) / deviation))
+                points.append((mass, lower + width / 2))
+
+            total_mass = sum(mass for mass, value in points)
+            return [(mass / total_mass, value) for mass, value in points]
+
+        heat_points = component_points(WeatherGenerator.heat_deviation,
+                                       WeatherGenerator.heat_min,
+                                       WeatherGenerator.heat_max)
+        wetness_points = component_points(WeatherGenerator.wetness_deviation,
+                                          WeatherGenerator.wetness_min,
+                                          WeatherGenerator.wetness_max)
+
+        return [(heat_mass * wetness_mass, heat, wetness)
+                for heat_mass, heat in heat_points
+                for wetness_mass, wetness in wetness_points]
+
+    @staticmethod
+    def normal_cdf(x):
+        return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+    @staticmethod
+    def unit_income(crop, field, heat, wetness):
+        """
+        Return the revenue of a single unit of the given crop in the given
+        field under the given weather, mirroring Field.calculate_income.
+        """
+
+        crop_yield = (1 - abs(heat - crop.ideal_heat) * crop.heat_sensitivity
+                      - abs(wetness - crop.ideal_wetness)
+                      * crop.wetness_sensitivity)
+
+        return crop_yield * crop.sale_price * field.soil_quality
+
+    def cache_key(self):
+        crops = tuple((crop.id, crop.cost, crop.sale_price, crop.ideal_heat,
+                       crop.ideal_wetness, crop.heat_sensitivity,
+                       crop.wetness_sensitivity) for crop in self.crops)
+        fields = tuple((field.id, field.max_crop_quantity, field.soil_quality,
+                        field.price) for field in
+                       [self.starting_field] + self.purchasable_fields)
+
+        return (self.max_years, crops, fields, Solver.WEATHER_POINTS,
+                Solver.MONEY_BUCKETS, Solver.MONEY_SCALE, Solver.MONEY_GROWTH)
+
+    def solve(self):
+        """
+        Fill the value tables by backward induction, and return the expected
+        final score of optimal play from the starting state.
+        """
+
+        key = self.cache_key()
+
+        if key not in Solver.solution_cache:
+            self.value_tables = {}
+
+            masks = sorted(range(2 ** len(self.purchasable_fields)),
+                           key=lambda mask: -bin(mask).count("1"))
+
+            for year in range(self.max_years - 1, 0, -1):
+
+                # Larger field sets first, as buying leads into them
+                for mask in masks:
+                    table = [self.best_decision(year, money, mask)[0]
+                             for money in self.money_grid]
+                    self.value_tables[(year, mask)] = \
+                        (table, self.slopes(table))
+
+            Solver.solution_cache[key] = self.value_tables
+
+        self.value_tables = Solver.solution_cache[key]
+
+        return self.value(1, self.initial_money, 0)
+
+    def slopes(self, table):
+        """
+        Return the gradient of a value table between each pair of adjacent
+        money grid points.
+        """
+
+        grid = self.money_grid
+
+        return [(table[i + 1] - table[i]) / (grid[i + 1] - grid[i])
+                for i in range(len(grid) - 1)]
+
+    def decide(self, year, money, owned_fields):
+        """
+        Return the (field to buy, crop to plant) decision for the given state.
+        At most one of these is set; both are None if the best option is to
+        plant nothing and advance to harvest.
+        """
+
+        if self.value_tables is None:
+            self.solve()
+
+        mask = self.field_mask(owned_fields)
+        value, field, crop = self.best_decision(year, money, mask)
+
+        return field, crop
+
+    def field_mask(self, owned_fields):
+        mask = 0
+
+        for index, field in enumerate(self.purchasable_fields):
+            if field in owned_fields:
+                mask |= 1 << index
+
+        return mask
+
+    def owned_fields(self, mask):
+        fields = [self.starting_field]
+
+        for index, field in enumerate(self.purchasable_fields):
+            if mask & (1 << index):
+                fields.append(field)
+
+        return fields
+
+    def best_decision(self, year, money, mask):
+        """
+        Return the (value, field to buy, crop to plant) of the best option
+        available at the start of the given year.
+        """
+
+        best = (self.value(year + 1, money, mask), None, None)
+
+        # Buy a field, then continue deciding within the same year
+        for index, field in enumerate(self.purchasable_fields):
+            bit = 1 << index
+
+            if not mask & bit and field.price < money:
+                value = self.value(year, money - field.price, mask | bit)
+
+                if value > best[0]:
+                    best = (value, field, None)
+
+        # Plant a crop across all owned fields
+        fields = self.planting_orders[mask]
+
+        for crop in self.crops:
+            if crop.cost <= money and money >= self.lowest_crop_cost:
+                value = self.planting_value(year, money, mask, fields, crop)
+
+                if value > best[0]:
+                    best = (value, None, crop)
+
+        return best
+
+    def planting_value(self, year, money, mask, fields, crop):
+        """
+        Return the expected value of planting the given crop at the maximum
+        affordable quantity in each of the given fields, in order.
+        """
+
+        remaining = money
+        incomes = [0] * len(self.weather_scenarios)
+
+        for field in fields:
+            quantity = min(math.floor(remaining / crop.cost),
+                           field.max_crop_quantity)
+
+            if quantity <= 0:
+                break
+
+            remaining -= quantity * crop.cost
+            incomes = [income + int(quantity * unit) for income, unit
+                       in zip(incomes, self.unit_incomes[(crop, field)])]
+
+        values = self.values(year + 1, [remaining + income
+                                        for income in incomes], mask)
+
+        return sum(probability * value for probability, value
+                   in zip(self.probabilities, values))
+
+    def value(self, year, money, mask):
+        """
+        Return the expected final score from the start of the given year.
+        """
+
+        return self.values(year, [money], mask)[0]
+
+    def values(self, year, moneys, mask):
+        """
+        Return the expected final scores from the start of the given year for
+        a list of money amounts, interpolating the value table linearly
+        between money grid points.
+        """
+
+        assets = self.mask_assets[mask]
+
+        # Nothing can be done once the game is over
+        if year >= self.max_years:
+            return [money + assets for money in moneys]
+
+        table, slopes = self.value_tables[(year, mask)]
+        grid = self.money_grid
+        last_index = len(grid) - 2
+        scale = Solver.MONEY_SCALE
+        log_growth = self.log_growth
+        lowest_crop_cost = self.lowest_crop_cost
+        log = math.log
+        values = []
+
+        for money in moneys:
+
+            # Nothing can be done without enough money to plant any crop
+            if money < lowest_crop_cost:
+                values.append(money + assets)
+                continue
+
+            # Extrapolate linearly beyond the end of the grid
+            index = int(log(money / scale + 1) / log_growth)
+            if index > last_index:
+                index = last_index
+
+            values.append(table[index] + (money - grid[index]) * slopes[index])
+
+        return values
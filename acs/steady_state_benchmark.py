@@ -0,0 +1,53 @@
+import argparse
+import os
+
+from acs.ai import *
+from acs.data_reader import DataReader
+from acs.launchers import Launcher
+
+
+def run_mode(mode, crops, fields, num_generations, workers, seed):
+    """
+    Evolve Strategies in the given mode ("generational" or "steady-state")
+    and return the Evolver and the best Strategy found.
+    """
+
+    evolver = Evolver(Launcher.MAX_YEARS, Launcher.INITIAL_MONEY, crops,
+                      fields, num_generations=num_generations, verbose=False,
+                      seed=seed, workers=workers)
+
+    if mode == "generational":
+        best = evolver.evolve()[0]
+    else:
+        best = evolver.evolve_steady_state()[0]
+
+    return evolver, best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare worker utilisation and throughput of "
+                    "generational and steady-state evolution.")
+    parser.add_argument("--generations", type=int, default=10,
+                        help="generations (or their equivalent number of "
+                             "evaluations) to run in each mode")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    crops = data_reader.import_crops()
+    fields = data_reader.import_fields()
+    throughputs = {}
+
+    for mode in ["generational", "steady-state"]:
+        evolver, best = run_mode(mode, crops, fields, arguments.generations,
+                                 arguments.workers, arguments.seed)
+        throughputs[mode] = evolver.games_played / evolver.elapsed_seconds
+
+        print("{}: {:.0f} games/s, worker utilisation {:.0%}, best fitness "
+              "{}".format(mode, throughputs[mode], evolver.utilisation(),
+                          round(best.fitness)))
+
+    print("Steady-state throughput relative to generational: {:.2f}x".format(
+        throughputs["steady-state"] / throughputs["generational"]))
@@ -0,0 +1,197 @@
+import bisect
+import math
+
+
+class RunningStatistics:
+    """
+    Class accumulating the count, mean, variance, minimum and maximum of a
+    stream of values in constant memory, using Welford's algorithm.
+    """
+
+    __slots__ = ("count", "mean", "sum_of_squares", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.sum_of_squares = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.sum_of_squares += delta * (value - self.mean)
+
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        """
+        Combine another set of running statistics into this one, as if its
+        values had been added here (Chan et al.'s parallel algorithm).
+        """
+
+        if other.count == 0:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.sum_of_squares += (other.sum_of_squares
+                                + delta * delta * self.count * other.count
+                                / count)
+        self.mean += delta * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def variance(self):
+        if self.count < 2:
+            return 0.0
+
+        return self.sum_of_squares / (self.count - 1)
+
+    def standard_deviation(self):
+        return math.sqrt(self.variance())
+
+    def standard_error(self):
+        if self.count == 0:
+            return math.inf
+
+        return math.sqrt(self.variance() / self.count)
+
+
+class P2Quantile:
+    """
+    Class estimating a single quantile of a stream of values in constant
+    memory, using the P-squared algorithm of Jain and Chlamtac. Five markers
+    track the minimum, maximum, target quantile and the quantiles halfway to
+    either extreme, and are adjusted by piecewise-parabolic interpolation.
+    """
+
+    __slots__ = ("quantile", "count", "heights", "positions", "desired",
+                 "increments")
+
+    def __init__(self, quantile):
+        self.quantile = quantile
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * quantile, 1 + 4 * quantile,
+                        3 + 2 * quantile, 5]
+        self.increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value):
+        self.count += 1
+        heights = self.heights
+
+        # Use the first five values as the initial markers
+        if self.count <= 5:
+            bisect.insort(heights, value)
+            return
+
+        # Find the cell holding the value, extending the extremes if needed
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = bisect.bisect_right(heights, value) - 1
+
+        positions = self.positions
+
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self.desired[i] - positions[i]
+
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self.parabolic(i, step)
+
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = (heights[i] + step
+                              * (heights[i + step] - heights[i])
+                              / (positions[i + step] - positions[i]))
+
+                heights[i] = height
+                positions[i] += step
+
+    def parabolic(self, i, step):
+        heights = self.heights
+        positions = self.positions
+
+        return heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+            (positions[i] - positions[i - 1] + step)
+            * (heights[i + 1] - heights[i])
+            / (positions[i + 1] - positions[i])
+            + (positions[i + 1] - positions[i] - step)
+            * (heights[i] - heights[i - 1])
+            / (positions[i] - positions[i - 1]))
+
+    def value(self):
+        """
+        Return the current estimate of the quantile, which is exact while
+        fewer than six values have been seen.
+        """
+
+        if self.count == 0:
+            return math.nan
+
+        if self.count <= 5:
+            return self.heights[round(self.quantile * (self.count - 1))]
+
+        return self.heights[2]
+
+
+class ScoreStatistics:
+    """
+    Class summarising a stream of scores in constant memory: running
+    statistics plus quantile estimates for each of the given quantiles.
+    """
+
+    __slots__ = ("running", "quantiles")
+
+    def __init__(self, quantiles=(0.5,)):
+        self.running = RunningStatistics()
+        self.quantiles = [P2Quantile(quantile) for quantile in quantiles]
+
+    def add(self, score):
+        self.running.add(score)
+
+        for quantile in self.quantiles:
+            quantile.add(score)
+
+    def quantile(self, quantile):
+        for estimator in self.quantiles:
+            if estimator.quantile == quantile:
+                return estimator.value()
+
+        raise KeyError(quantile)
+
+    def summarise(self):
+        """
+        Return a one-line summary of the scores.
+        """
+
+        running = self.running
+        summary = "mean {} sd {} min {} max {}".format(
+            round(running.mean), round(running.standard_deviation()),
+            round(running.minimum), round(running.maximum))
+
+        for estimator in self.quantiles:
+            summary += " p{} {}".format(round(estimator.quantile * 100),
+                                        round(estimator.value()))
+
+        return summary
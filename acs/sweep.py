@@ -0,0 +1,289 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+
+from acs.ai import *
+from acs.data_reader import *
+from acs.evaluation_store import EvaluationStore
+from acs.launchers import Launcher
+from acs.seeding import derive_seed
+
+
+# Catalogs already loaded by this (worker) process, keyed by file names and
+# modification times, so that warm workers reuse them across cells.
+loaded_catalogs = {}
+
+
+def load_catalog(crops_file_name, fields_file_name):
+    """
+    Return the (crops, fields) catalog stored in the given files, reading them
+    only if this process has not already done so since they last changed.
+    """
+
+    key = (crops_file_name, os.path.getmtime(crops_file_name),
+           fields_file_name, os.path.getmtime(fields_file_name))
+
+    if key not in loaded_catalogs:
+        data_reader = DataReader(crops_file_name, fields_file_name)
+        loaded_catalogs[key] = (data_reader.import_crops(),
+                                data_reader.import_fields())
+
+    return loaded_catalogs[key]
+
+
+def sweep_settings(num_generations, strategy_data, seed):
+    """
+    Return the settings distinguishing the results of one sweep from
+    another's for the same cell: the mode, the number of generations evolved
+    (if evolving), a digest of the fixed Strategy (if evaluating one) and the
+    master seed (if any).
+    """
+
+    if strategy_data is None:
+        mode, strategy_key = "evolve", ""
+    else:
+        mode, num_generations = "evaluate", ""
+        strategy_key = hashlib.blake2b(
+            json.dumps(strategy_data, sort_keys=True).encode("utf-8"),
+            digest_size=8).hexdigest()
+
+    return (mode, str(num_generations), strategy_key,
+            "" if seed is None else str(seed))
+
+
+class SweepCell:
+    """
+    Class representing a single combination of game parameters and catalog
+    files to be evaluated by a Sweep.
+    """
+
+    def __init__(self, crops_file_name, fields_file_name, max_years,
+                 initial_money):
+        self.crops_file_name = crops_file_name
+        self.fields_file_name = fields_file_name
+        self.max_years = max_years
+        self.initial_money = initial_money
+
+    def key(self, settings):
+        return (self.crops_file_name, self.fields_file_name,
+                str(self.max_years), str(self.initial_money)) + settings
+
+    def run(self, num_generations, strategy_data, seed,
+            store_file_name=None):
+        """
+        Evolve Strategies for this cell, or evaluate the given fixed Strategy
+        if there is one, and return the best Strategy found. Evaluations are
+        shared with other cells and sweeps through the named store, if any.
+        """
+
+        crops, fields = load_catalog(self.crops_file_name,
+                                     self.fields_file_name)
+        evaluation_store = None
+
+        if store_file_name is not None:
+            evaluation_store = EvaluationStore.for_catalog(
+                store_file_name, crops, fields, self.crops_file_name,
+                self.fields_file_name)
+
+        evolver = Evolver(self.max_years, self.initial_money, crops, fields,
+                          num_generations=num_generations, verbose=False,
+                          seed=seed, evaluation_store=evaluation_store)
+
+        try:
+            if strategy_data is None:
+                return evolver.evolve()[0]
+
+            strategy = Strategy.from_dict(strategy_data, crops)
+            evolver.evaluate_strategy(strategy)
+            return strategy
+        finally:
+            if evaluation_store is not None:
+                evaluation_store.close()
+
+
+def run_cell(cell, num_generations, strategy_data, seed,
+             store_file_name=None):
+    """
+    Worker entry point: run a single SweepCell and return its results row.
+    Each cell derives its own seed from the sweep's master seed and its key.
+    """
+
+    key = cell.key(sweep_settings(num_generations, strategy_data, seed))
+
+    if seed is not None:
+        seed = derive_seed(seed, *key)
+
+    start_time = time.perf_counter()
+    strategy = cell.run(num_generations, strategy_data, seed,
+                        store_file_name)
+    scores = strategy.score_statistics
+
+    return list(key) + [
+        round(strategy.fitness, 2),
+        round(scores.running.standard_deviation(), 2),
+        round(scores.running.minimum, 2),
+        round(scores.quantile(0.5), 2),
+        round(scores.running.maximum, 2),
+        json.dumps(strategy.to_dict()),
+        round(time.perf_counter() - start_time, 2)
+    ]
+
+
+class Sweep:
+    """
+    Class representing a batch of Evolver runs (or fixed Strategy evaluations)
+    over a grid of game parameters and catalogs. Cells are run in parallel by
+    a pool of worker processes, and each result is appended to a single
+    results table as soon as it is available. Cells already present in the
+    results table with the same settings are skipped.
+    """
+
+    RESULT_COLUMNS = ["crops_file", "fields_file", "max_years",
+                      "initial_money", "mode", "generations", "strategy_key",
+                      "seed", "fitness", "score_sd", "score_min",
+                      "score_median", "score_max", "strategy",
+                      "elapsed_seconds"]
+
+    # Number of leading columns identifying a cell and its settings.
+    KEY_LENGTH = 8
+
+    def __init__(self, catalogs, max_years_values, initial_money_values,
+                 results_file_name, workers=None, num_generations=None,
+                 strategy_data=None, seed=None, store_file_name=None):
+        self.catalogs = catalogs
+        self.max_years_values = max_years_values
+        self.initial_money_values = initial_money_values
+        self.results_file_name = results_file_name
+        self.workers = workers
+        self.num_generations = (num_generations if num_generations is not None
+                                else Evolver.NUM_GENERATIONS)
+
+        if self.num_generations < 1:
+            raise ValueError("A sweep must evolve at least one generation")
+
+        self.strategy_data = strategy_data
+        self.seed = seed
+        self.store_file_name = store_file_name
+
+    def build_cells(self):
+        """
+        Return every cell in the grid, longest-running (most years) first so
+        that the pool is not left waiting on a long cell at the end.
+        """
+
+        cells = [SweepCell(crops_file_name, fields_file_name, max_years,
+                           initial_money)
+                 for (crops_file_name, fields_file_name), max_years,
+                 initial_money in itertools.product(
+                     self.catalogs, self.max_years_values,
+                     self.initial_money_values)]
+
+        cells.sort(key=lambda cell: -cell.max_years)
+        return cells
+
+    def read_completed_keys(self):
+        """
+        Return the keys of all cells already recorded in the results table,
+        which must have been written with the current columns.
+        """
+
+        if not os.path.exists(self.results_file_name):
+            return set()
+
+        with open(self.results_file_name, newline="") as results_file:
+            rows = list(csv.reader(results_file))
+
+        if rows and rows[0] != Sweep.RESULT_COLUMNS:
+            raise ValueError(self.results_file_name + " has different "
+                             "columns; write the results to a new file")
+
+        return {tuple(row[:Sweep.KEY_LENGTH]) for row in rows[1:] if row}
+
+    def run(self):
+        """
+        Run every cell not yet in the results table, and return the number of
+        cells run.
+        """
+
+        completed_keys = self.read_completed_keys()
+        settings = sweep_settings(self.num_generations, self.strategy_data,
+                                  self.seed)
+        cells = self.build_cells()
+        pending_cells = [cell for cell in cells
+                         if cell.key(settings) not in completed_keys]
+
+        print(len(cells) - len(pending_cells), "cells already complete,",
+              len(pending_cells), "to run.")
+
+        if not pending_cells:
+            return 0
+
+        write_header = not os.path.exists(self.results_file_name) or \
+            os.path.getsize(self.results_file_name) == 0
+
+        with open(self.results_file_name, "a", newline="") as results_file, \
+                ProcessPoolExecutor(self.workers) as executor:
+            writer = csv.writer(results_file)
+
+            if write_header:
+                writer.writerow(Sweep.RESULT_COLUMNS)
+
+            futures = [executor.submit(run_cell, cell, self.num_generations,
+                                       self.strategy_data, self.seed,
+                                       self.store_file_name)
+                       for cell in pending_cells]
+
+            # Record each cell as it completes, so interrupted sweeps resume
+            for future in as_completed(futures):
+                row = future.result()
+                writer.writerow(row)
+                results_file.flush()
+                print("Completed", row[:Sweep.KEY_LENGTH], "fitness",
+                      row[Sweep.KEY_LENGTH])
+
+        return len(pending_cells)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run Evolver over a grid of game parameters and catalogs.")
+    parser.add_argument("--catalog", nargs=2, action="append",
+                        metavar=("CROPS_FILE", "FIELDS_FILE"),
+                        help="crop and field catalog files (repeatable)")
+    parser.add_argument("--max-years", type=int, nargs="+",
+                        default=[Launcher.MAX_YEARS])
+    parser.add_argument("--initial-money", type=int, nargs="+",
+                        default=[Launcher.INITIAL_MONEY])
+    parser.add_argument("--generations", type=int)
+    parser.add_argument("--strategy",
+                        help="JSON file of a fixed Strategy to evaluate")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int,
+                        help="master seed making every cell reproducible")
+    parser.add_argument("--results", default="sweep_results.csv")
+    parser.add_argument("--store",
+                        help="evaluation store file shared between sweeps")
+    arguments = parser.parse_args()
+
+    fixed_strategy = None
+    if arguments.strategy:
+        with open(arguments.strategy, encoding="utf-8") as strategy_file:
+            fixed_strategy = json.load(strategy_file)
+
+    sweep = Sweep(
+        arguments.catalog or [(DataReader.crops_file_name,
+                               DataReader.fields_file_name)],
+        arguments.max_years,
+        arguments.initial_money,
+        arguments.results,
+        arguments.workers,
+        arguments.generations,
+        fixed_strategy,
+        arguments.seed,
+        arguments.store)
+    sweep.run()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import acs.advice_export as advice_export
+import acs.advisor as advisor
+import acs.ai as ai
+import acs.farm as farm
+import acs.game as game
+import acs.solver as solver
+
+
+class TestAdvisor(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 4, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [
+            farm.Field(1, 'Field 1', '', 100, 1, 1000),
+            farm.Field(2, 'Field 2', '', 100, 1, 800)
+        ]
+        self.solver = solver.Solver(5, 500, self.crops, self.fields)
+
+    def test_saved_table_matches_solver(self):
+        # GIVEN the solver's policy exported and reloaded
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        file_name = os.path.join(directory.name, "advice.json")
+        advice_export.export_table(self.solver, "solver").save(file_name)
+        table = advisor.DecisionTable.load(file_name)
+
+        # WHEN I look up the first decision
+        advice = table.lookup(1, 500, [1])
+
+        # THEN it plants the profitable crop, expecting the solver's score
+        self.assertEqual(advisor.Advice.PLANT, advice.action)
+        self.assertEqual(1, advice.item_id)
+        self.assertAlmostEqual(self.solver.solve(), advice.expected_score,
+                               delta=1)
+
+    def test_advisor_follows_plan_within_year(self):
+        # GIVEN an advisor, and a game in which one field has been planted
+        table = advice_export.export_table(self.solver, "solver")
+        new_game = game.Game(5, 500, None, self.crops, self.fields)
+        new_game.farm.owned_fields.append(new_game.available_fields.pop(0))
+        advice = advisor.Advisor(table)
+        advice.advise(new_game)
+        new_game.farm.owned_fields[0].plant(self.crops[0], 50)
+        new_game.farm.money = 0
+
+        # WHEN I ask for advice with no money left
+        # THEN it is to advance to harvest
+        self.assertEqual(advisor.Advice.ADVANCE,
+                         advice.advise(new_game).action)
+
+    def test_strategy_policy_values_its_own_play(self):
+        # GIVEN a Strategy which only plants the profitable crop
+        strategy = ai.Strategy({self.crops[0]: 1, self.crops[1]: 0}, 100)
+        policy = advice_export.StrategyPolicy(strategy, 5, 500, self.crops,
+                                              self.fields)
+
+        # WHEN I export its decisions
+        table = advice_export.export_table(policy, "strategy")
+        advice = table.lookup(1, 500, [1])
+
+        # THEN it plants that crop, expecting no more than the solver does
+        self.assertEqual(advisor.Advice.PLANT, advice.action)
+        self.assertEqual(1, advice.item_id)
+        self.assertTrue(advice.expected_score <= self.solver.solve() + 1)
+
+    def test_strategy_policy_with_low_field_ratio(self):
+        # GIVEN a Strategy which would buy fields costing more than its money
+        strategy = ai.Strategy({self.crops[0]: 1, self.crops[1]: 1}, 0.5)
+        policy = advice_export.StrategyPolicy(strategy, 5, 500, self.crops,
+                                              self.fields)
+
+        # WHEN I export its decisions
+        table = advice_export.export_table(policy, "strategy")
+        advice = table.lookup(1, 500, [1])
+
+        # THEN it only buys fields it can afford, so plants first
+        self.assertEqual(advisor.Advice.PLANT, advice.action)
+
@@ -1,6 +1,12 @@
+import json
+import os
+import signal
+import tempfile
 import unittest
 import acs.ai as ai
 import acs.farm as farm
+import acs.seeding as seeding
+import acs.weather as weather
 
 
 class TestCropChance(unittest.TestCase):
@@ -40,6 +46,40 @@ class TestCropChance(unittest.TestCase):
         self.assertFalse(self.crop_chance_1.__lt__(self.crop_chance_2))
 
 
+class TestCropSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.cheap_crop = farm.Crop(1, 'Crop 1', 'Crop 1', 5, 20, 1, 1, 1, 1)
+        self.middle_crop = farm.Crop(2, 'Crop 2', 'Crop 2', 10, 20, 1, 1, 1, 1)
+        self.dear_crop = farm.Crop(3, 'Crop 3', 'Crop 3', 20, 20, 1, 1, 1, 1)
+
+        self.sampler = ai.CropSampler({self.dear_crop: 0.5,
+                                       self.cheap_crop: 0.25,
+                                       self.middle_crop: 0.25})
+
+    def test_sample_all_affordable(self):
+        # GIVEN all crops are affordable
+        # WHEN I sample with random numbers across the range
+        samples = [self.sampler.sample(r, 3) for r in (0.1, 0.3, 0.6, 0.99)]
+
+        # THEN crops are chosen in proportion to their chances, cheapest first
+        self.assertEqual([self.cheap_crop, self.middle_crop, self.dear_crop,
+                          self.dear_crop], samples)
+
+    def test_sample_renormalises_over_affordable_crops(self):
+        # GIVEN only the two cheapest crops are affordable
+        # WHEN I sample with random numbers either side of one half
+        # THEN each affordable crop takes half of the range
+        self.assertEqual(self.cheap_crop, self.sampler.sample(0.49, 2))
+        self.assertEqual(self.middle_crop, self.sampler.sample(0.51, 2))
+
+    def test_sample_never_exceeds_affordable_crops(self):
+        # GIVEN only the cheapest crop is affordable
+        # WHEN I sample with the largest random number
+        # THEN the cheapest crop is chosen
+        self.assertEqual(self.cheap_crop, self.sampler.sample(0.999999, 1))
+
+
 class TestStrategy(unittest.TestCase):
 
     def setUp(self):
@@ -155,9 +195,214 @@ class TestEvolver(unittest.TestCase):
         remaining_probability = 1
         current_probability = self.evolver.initial_selection_probability
 
-        for i in range(ai.Evolver.POPULATION_SIZE):
+        for i in range(self.evolver.population_size):
             remaining_probability -= current_probability
             current_probability *= self.evolver.common_ratio
 
         # THEN the sequence tends to 1
         self.assertTrue(remaining_probability < 0.01)
+
+
+class TestEvolverSeeding(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+
+    def run_evolver(self, seed, workers, weather_table=None):
+        evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                             num_generations=2, verbose=False, seed=seed,
+                             workers=workers, weather_table=weather_table)
+        return [(strategy.fitness, strategy.to_dict())
+                for strategy in evolver.evolve()]
+
+    def test_hyperparameters_are_per_evolver(self):
+        # GIVEN an Evolver with its own population size and number of games
+        evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                             num_generations=3, verbose=False, seed=1,
+                             population_size=10, num_games=4)
+
+        # WHEN I run it
+        generation = evolver.evolve()
+
+        # THEN it uses them instead of the defaults
+        self.assertEqual(10, len(generation))
+        self.assertEqual(3 * 10 * 4, evolver.games_played)
+
+    def test_evolution_stops_at_target_fitness(self):
+        # GIVEN an Evolver with a target any Strategy will reach
+        evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                             num_generations=10, verbose=False, seed=1,
+                             population_size=10, num_games=4,
+                             target_fitness=0)
+
+        # WHEN I run it
+        evolver.evolve()
+
+        # THEN it stops after the first generation
+        self.assertEqual(10 * 4, evolver.games_played)
+
+    def test_game_budget_stops_evolution(self):
+        # GIVEN an Evolver with a budget of games rather than generations
+        evolver = ai.Evolver(5, 500, self.crops, self.fields, verbose=False,
+                             seed=1, population_size=10, num_games=4,
+                             game_budget=2000)
+
+        # WHEN I run it
+        evolver.evolve()
+
+        # THEN it spends most of the budget, without overrunning it by more
+        # than a generation, and keeps the best Strategy seen
+        self.assertTrue(1500 <= evolver.games_played <= 2000 + 500)
+        self.assertIsNotNone(evolver.best_strategy)
+
+    def test_saved_best_strategy_is_confirmed(self):
+        # GIVEN an Evolver measuring fitness with few games, saving its best
+        # Strategy to a file
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "best.json")
+            evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                                 num_generations=3, verbose=False, seed=1,
+                                 population_size=10, num_games=2,
+                                 best_file_name=file_name)
+
+            # WHEN I run it
+            evolver.evolve()
+
+            with open(file_name, encoding="utf-8") as best_file:
+                saved = json.load(best_file)
+
+        # THEN the saved fitness is that of the confirmation games
+        strategy = ai.Strategy.from_dict(saved["strategy"], self.crops)
+        fitness = evolver.confirm_fitness(strategy)
+        self.assertEqual(fitness, saved["fitness"])
+        self.assertEqual(fitness, evolver.best_strategy.fitness)
+
+    def test_only_measured_improvements_are_confirmed(self):
+        # GIVEN an Evolver saving its best Strategy to a file, counting the
+        # Strategies it confirms
+        with tempfile.TemporaryDirectory() as directory:
+            evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                                 num_generations=20, verbose=False, seed=1,
+                                 population_size=10, num_games=2,
+                                 best_file_name=os.path.join(directory,
+                                                             "best.json"))
+            measured_fitnesses = []
+            confirm_fitness = evolver.confirm_fitness
+
+            def count_confirmation(strategy):
+                measured_fitnesses.append(strategy.fitness)
+                return confirm_fitness(strategy)
+
+            evolver.confirm_fitness = count_confirmation
+
+            # WHEN I run it
+            evolver.evolve()
+
+        # THEN each confirmed Strategy measured fitter than the last, so
+        # not every generation needs a confirmation
+        self.assertEqual(sorted(set(measured_fitnesses)), measured_fitnesses)
+        self.assertTrue(len(measured_fitnesses) < 20)
+
+    def test_workers_ignore_termination(self):
+        # GIVEN the current termination handler
+        previous_handler = signal.getsignal(signal.SIGTERM)
+
+        try:
+            # WHEN a worker is initialised
+            ai.initialise_worker(5, 500, self.crops, self.fields)
+
+            # THEN it leaves stopping to the parent process
+            self.assertEqual(signal.SIG_IGN, signal.getsignal(signal.SIGTERM))
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+    def test_stop_request_ends_evolution(self):
+        # GIVEN an Evolver which has been asked to stop
+        evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                             num_generations=10, verbose=False, seed=1,
+                             population_size=10, num_games=4)
+        evolver.stop_requested = True
+
+        # WHEN I run it
+        evolver.evolve()
+
+        # THEN it stops after the generation in progress
+        self.assertEqual(10 * 4, evolver.games_played)
+
+    def test_steady_state_evolution(self):
+        for workers in [None, 2]:
+            with self.subTest(workers=workers):
+                # GIVEN an Evolver
+                evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                                     verbose=False, seed=1,
+                                     population_size=10, num_games=4,
+                                     workers=workers)
+
+                # WHEN I evolve it asynchronously
+                population = evolver.evolve_steady_state(30)
+
+                # THEN every evaluation is played, and the population is
+                # ranked by fitness
+                self.assertEqual(30 * 4, evolver.games_played)
+                self.assertEqual(10, len(population))
+                self.assertTrue(population[0].fitness
+                                >= population[-1].fitness)
+                self.assertTrue(evolver.utilisation() > 0)
+
+    def test_steady_state_evolution_with_tiny_population(self):
+        # GIVEN an Evolver with a population smaller than a tournament
+        evolver = ai.Evolver(5, 500, self.crops, self.fields, verbose=False,
+                             seed=1, population_size=2, num_games=2)
+
+        # WHEN I evolve it asynchronously
+        population = evolver.evolve_steady_state(6)
+
+        # THEN parents are chosen from the whole population
+        self.assertEqual(2, len(population))
+        self.assertEqual(6 * 2, evolver.games_played)
+
+    def test_seeded_runs_are_identical(self):
+        # GIVEN two Evolvers with the same seed
+        # WHEN I run them both
+        # THEN they produce identical results
+        self.assertEqual(self.run_evolver(42, None),
+                         self.run_evolver(42, None))
+
+    def test_seeded_parallel_run_matches_serial_run(self):
+        # GIVEN two Evolvers with the same seed, one using worker processes
+        # WHEN I run them both
+        # THEN they produce bit-identical results
+        self.assertEqual(self.run_evolver(42, None),
+                         self.run_evolver(42, 2))
+
+    def test_shared_weather_table_matches_serial_run(self):
+        # GIVEN a table of pre-drawn weather
+        weather_table = weather.WeatherTable.draw(
+            50, 5, seeding.make_rng(7, "weather table"))
+
+        # WHEN I run seeded Evolvers using it, one sharing it with workers
+        # THEN they produce bit-identical results
+        self.assertEqual(self.run_evolver(42, None, weather_table),
+                         self.run_evolver(42, 2, weather_table))
+
+    def test_short_weather_table_is_rejected(self):
+        # GIVEN a weather table whose scenarios are shorter than a game
+        weather_table = weather.WeatherTable.draw(
+            3, 5, seeding.make_rng(7, "weather table"))
+
+        # WHEN I create an Evolver for 20-year games using it
+        # THEN it is rejected
+        with self.assertRaises(ValueError):
+            ai.Evolver(20, 500, self.crops, self.fields,
+                       weather_table=weather_table)
+
+    def test_different_seeds_give_different_results(self):
+        # GIVEN two Evolvers with different seeds
+        # WHEN I run them both
+        # THEN their results differ
+        self.assertNotEqual(self.run_evolver(1, None),
+                            self.run_evolver(2, None))
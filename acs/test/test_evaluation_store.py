@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+import acs.ai as ai
+import acs.evaluation_store as evaluation_store
+import acs.farm as farm
+
+
+class TestEvaluationStore(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "evaluations.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def open_store(self, crops):
+        return evaluation_store.EvaluationStore.for_catalog(
+            self.file_name, crops, self.fields, "crops.dat", "fields.dat")
+
+    def run_evolver(self, store):
+        evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                             num_generations=2, verbose=False, seed=1,
+                             population_size=10, num_games=4,
+                             evaluation_store=store)
+        return evolver, evolver.evolve()[0]
+
+    def test_second_run_reuses_evaluations(self):
+        # GIVEN a run whose evaluations have been stored
+        with self.open_store(self.crops) as store:
+            first_evolver, first_best = self.run_evolver(store)
+
+        # WHEN I repeat it with the same seed
+        with self.open_store(self.crops) as store:
+            second_evolver, second_best = self.run_evolver(store)
+
+        # THEN no games are played, and the results are the same
+        self.assertEqual(0, second_evolver.games_played)
+        self.assertEqual(20, second_evolver.store_hits)
+        self.assertEqual(first_best.fitness, second_best.fitness)
+        self.assertEqual(first_evolver.years_skipped,
+                         second_evolver.years_skipped)
+
+    def test_steady_state_workers_use_store(self):
+        # GIVEN a steady-state run with workers whose evaluations have been
+        # stored
+        with self.open_store(self.crops) as store:
+            evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                                 verbose=False, seed=1, population_size=10,
+                                 num_games=4, workers=2,
+                                 evaluation_store=store)
+            evolver.evolve_steady_state(30)
+
+        # WHEN I repeat it with the same seed
+        with self.open_store(self.crops) as store:
+            count = store.connection.execute(
+                "SELECT COUNT(*) FROM evaluations").fetchone()[0]
+            evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                                 verbose=False, seed=1, population_size=10,
+                                 num_games=4, workers=2,
+                                 evaluation_store=store)
+            evolver.evolve_steady_state(30)
+
+        # THEN every evaluation was stored, and at least the random initial
+        # population is found in the store instead of being played
+        self.assertEqual(30, count)
+        self.assertTrue(evolver.store_hits >= 10)
+        self.assertEqual((30 - evolver.store_hits) * 4, evolver.games_played)
+
+    def test_changed_catalog_invalidates_evaluations(self):
+        # GIVEN a run whose evaluations have been stored
+        with self.open_store(self.crops) as store:
+            self.run_evolver(store)
+
+        # WHEN the catalog files change
+        changed_crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 25, 1.1, 0.9, 2, 0.5),
+            self.crops[1]
+        ]
+
+        with self.open_store(changed_crops) as store:
+
+            # THEN the old evaluations are gone
+            count = store.connection.execute(
+                "SELECT COUNT(*) FROM evaluations").fetchone()[0]
+            self.assertEqual(0, count)
@@ -0,0 +1,90 @@
+import unittest
+import acs.ai as ai
+import acs.farm as farm
+import acs.fidelity as fidelity
+import acs.hall_of_fame as hall_of_fame
+
+
+class TestSpearmanCorrelation(unittest.TestCase):
+
+    def test_monotonic_values_are_perfectly_correlated(self):
+        # GIVEN values in the same order but on different scales
+        # WHEN I correlate them
+        # THEN the correlation is 1
+        self.assertAlmostEqual(1, fidelity.spearman_correlation(
+            [1, 2, 3, 4], [10, 200, 3000, 40000]))
+
+    def test_reversed_values_are_anticorrelated(self):
+        self.assertAlmostEqual(-1, fidelity.spearman_correlation(
+            [1, 2, 3, 4], [4, 3, 2, 1]))
+
+    def test_ties_share_ranks(self):
+        self.assertEqual([0.5, 0.5, 2], fidelity.ranks([7, 7, 9]))
+
+
+class TestMultiFidelityEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+
+    def test_only_promoted_strategies_are_evaluated_in_full(self):
+        # GIVEN an Evolver with a short-horizon stage promoting a fifth
+        evolver = ai.Evolver(
+            6, 500, self.crops, self.fields, num_generations=1,
+            verbose=False, seed=1, population_size=20, num_games=10,
+            fidelity_schedule=[fidelity.FidelityStage(2, 2, 0.2)])
+
+        # WHEN I run a generation
+        generation = evolver.evolve()
+
+        # THEN everyone plays the short stage, and only 4 play in full
+        self.assertEqual(20 * 2 + 4 * 10, evolver.games_played)
+
+        # AND the promoted Strategies rank above the rest
+        full_evaluations = [strategy.score_statistics.running.count
+                            for strategy in generation]
+        self.assertEqual([10] * 4 + [2] * 16, full_evaluations)
+
+    def test_eliminated_strategies_are_kept_out_of_statistics(self):
+        # GIVEN an Evolver with a hall of fame and a short-horizon stage
+        # promoting a fifth, without audits
+        archive = hall_of_fame.HallOfFame()
+        evolver = ai.Evolver(
+            6, 500, self.crops, self.fields, num_generations=1,
+            verbose=False, seed=1, population_size=20, num_games=10,
+            hall_of_fame=archive,
+            fidelity_schedule=[fidelity.FidelityStage(2, 2, 0.2)])
+
+        # WHEN I run a generation
+        generation = evolver.evolve()
+
+        # THEN the eliminated Strategies are marked with their stage
+        self.assertEqual([None] * 4 + [0] * 16,
+                         [strategy.fidelity_stage for strategy in generation])
+
+        # AND only those evaluated in full are summarised and archived
+        self.assertEqual(4, evolver.fitness_statistics.running.count)
+        self.assertEqual(4, len(archive.entries))
+
+        # AND no biased correlation is reported
+        self.assertIsNone(evolver.fidelity_correlations)
+
+    def test_audit_generations_measure_correlation(self):
+        # GIVEN an Evolver auditing every generation
+        evolver = ai.Evolver(
+            6, 500, self.crops, self.fields, num_generations=1,
+            verbose=False, seed=1, population_size=20, num_games=10,
+            fidelity_schedule=[fidelity.FidelityStage(2, 2, 0.2)],
+            fidelity_audit_interval=1)
+
+        # WHEN I run a generation
+        evolver.evolve()
+
+        # THEN everyone is evaluated in full, and the correlation is known
+        self.assertEqual(20 * 2 + 20 * 10, evolver.games_played)
+        self.assertEqual(1, len(evolver.fidelity_correlations))
+        self.assertIsNotNone(evolver.fidelity_correlations[0])
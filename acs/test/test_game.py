@@ -0,0 +1,66 @@
+import random
+import unittest
+import acs.ai as ai
+import acs.farm as farm
+import acs.game as game
+import acs.input_providers as input_providers
+
+
+class TestGameFastForward(unittest.TestCase):
+
+    def setUp(self):
+        # A crop which always loses money, so that the farm goes bankrupt
+        self.crops = [farm.Crop(1, 'Crop 1', 'Crop 1', 10, 1, 1, 1, 1, 1)]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000),
+                       farm.Field(2, 'Field 2', '', 100, 1, 5000)]
+        self.strategy = ai.Strategy({self.crops[0]: 1}, 2)
+
+    def play_game(self, fast_forward):
+        input_provider = input_providers.AIInputProvider(
+            self.strategy, random.Random(1))
+        input_provider.fast_forward = fast_forward
+
+        played_game = game.Game(20, 500, input_provider, self.crops,
+                                self.fields, rng=random.Random(2))
+        score = played_game.run()
+
+        return played_game, score
+
+    def test_bankrupt_game_skips_remaining_years(self):
+        # GIVEN a game in which the farm goes bankrupt
+        # WHEN I play it with fast-forwarding
+        played_game, score = self.play_game(True)
+
+        # THEN the years after bankruptcy are skipped
+        self.assertTrue(played_game.is_absorbed())
+        self.assertEqual(20 - played_game.current_year,
+                         played_game.years_skipped)
+        self.assertTrue(played_game.years_skipped > 0)
+
+    def test_fast_forward_keeps_final_score(self):
+        # GIVEN a game in which the farm goes bankrupt
+        # WHEN I play it with and without fast-forwarding
+        fast_game, fast_score = self.play_game(True)
+        slow_game, slow_score = self.play_game(False)
+
+        # THEN the final score is the same
+        self.assertEqual(slow_score, fast_score)
+        self.assertEqual(0, slow_game.years_skipped)
+
+
+class TestGameNumberedActions(unittest.TestCase):
+
+    def test_numbered_actions_are_read_only(self):
+        # GIVEN a game
+        crops = [farm.Crop(1, 'Crop 1', 'Crop 1', 10, 1, 1, 1, 1, 1)]
+        fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+        input_provider = input_providers.ScriptedInputProvider([])
+        played_game = game.Game(5, 500, input_provider, crops, fields,
+                                rng=random.Random(1))
+
+        # WHEN I get its numbered actions
+        numbered_actions = played_game.build_actions()
+
+        # THEN they cannot be modified by an input provider
+        with self.assertRaises(TypeError):
+            numbered_actions[1] = None
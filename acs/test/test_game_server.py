@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+import acs.farm as farm
+import acs.game_server as game_server
+import acs.load_test as load_test
+
+
+class TestGameServer(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+        self.server = game_server.GameServer(5, 500, self.crops, self.fields)
+
+    def test_concurrent_sessions_complete(self):
+        # GIVEN a server
+        # WHEN 20 scripted players play on it at once
+        clients, seconds = asyncio.run(load_test.run_load_test(
+            20, "127.0.0.1", None, self.server))
+
+        # THEN every game finishes
+        self.assertEqual(20, self.server.completed_sessions)
+        self.assertEqual(0, self.server.active_sessions)
+
+        for client in clients:
+            self.assertIsNotNone(client.final_score)
+            self.assertTrue(client.latencies)
+
+        # AND the shared catalog fields were never planted
+        self.assertTrue(self.fields[0].is_empty())
+
+    def test_disconnected_session_is_abandoned(self):
+        # GIVEN a server
+        async def connect_and_leave():
+            listener = await self.server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+
+            # WHEN a player connects and leaves at the first prompt
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await reader.readuntil(b"> ")
+            writer.close()
+            await reader.read()
+
+            listener.close()
+            await listener.wait_closed()
+
+        asyncio.run(connect_and_leave())
+
+        # THEN the session is counted as abandoned
+        self.assertEqual(1, self.server.abandoned_sessions)
+        self.assertEqual(0, self.server.active_sessions)
@@ -0,0 +1,64 @@
+import unittest
+import acs.ai as ai
+import acs.farm as farm
+import acs.hall_of_fame as hall_of_fame
+
+
+class TestHallOfFame(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+        self.hall_of_fame = hall_of_fame.HallOfFame(2)
+
+    def make_strategy(self, weighting, fitness):
+        strategy = ai.Strategy({self.crops[0]: weighting, self.crops[1]: 10},
+                               2)
+        strategy.fitness = fitness
+        return strategy
+
+    def test_update_merges_identical_genomes(self):
+        # GIVEN the same genome appears in two generations
+        self.hall_of_fame.update([self.make_strategy(5, 100)], 0)
+        self.hall_of_fame.update([self.make_strategy(5, 200)], 1)
+
+        # WHEN I look at the archive
+        entries = list(self.hall_of_fame.entries.values())
+
+        # THEN it holds one member with the mean of both fitnesses
+        self.assertEqual(1, len(entries))
+        self.assertEqual(150, entries[0].mean_fitness())
+
+    def test_update_keeps_fittest_members(self):
+        # GIVEN more distinct Strategies than the archive can hold
+        self.hall_of_fame.update([self.make_strategy(1, 300),
+                                  self.make_strategy(2, 100),
+                                  self.make_strategy(3, 200)], 0)
+
+        # WHEN I look at the archive
+        fitnesses = sorted(entry.mean_fitness() for entry
+                           in self.hall_of_fame.entries.values())
+
+        # THEN only the fittest Strategies remain
+        self.assertEqual([200, 300], fitnesses)
+
+    def test_reevaluate_ranks_members(self):
+        # GIVEN an archive of two Strategies, first seen in different
+        # generations
+        self.hall_of_fame.update([self.make_strategy(1, 300)], 0)
+        self.hall_of_fame.update([self.make_strategy(50, 100)], 3)
+        evolver = ai.Evolver(5, 500, self.crops, self.fields, seed=1,
+                             verbose=False)
+
+        # WHEN I re-evaluate them
+        results = self.hall_of_fame.reevaluate(evolver, 30)
+
+        # THEN they are ranked by their new fitness, with confidence intervals
+        # and the generations they were first seen in
+        self.assertEqual(2, len(results))
+        self.assertTrue(results[0][0].fitness >= results[1][0].fitness)
+        self.assertTrue(results[0][1] > 0)
+        self.assertEqual({0, 3}, {result[2] for result in results})
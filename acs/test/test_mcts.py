@@ -0,0 +1,69 @@
+import random
+import unittest
+import acs.farm as farm
+import acs.game as game
+import acs.game_state as game_state
+import acs.input_providers as input_providers
+import acs.mcts as mcts
+
+
+class TestMCTS(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 4, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [
+            farm.Field(1, 'Field 1', '', 100, 1, 1000),
+            farm.Field(2, 'Field 2', '', 100, 1, 800)
+        ]
+        self.simulator = game_state.GameSimulator(
+            5, self.crops, self.fields, random.Random(1))
+
+    def test_fork_is_independent(self):
+        # GIVEN a snapshot of a new game
+        new_game = game.Game(5, 500, None, self.crops, self.fields)
+        state = self.simulator.snapshot(new_game)
+
+        # WHEN I plant in a fork of it
+        fork = state.fork()
+        self.simulator.apply(fork, self.simulator.first_plant_move)
+
+        # THEN the fork has changed, but neither the snapshot nor the game has
+        self.assertEqual((0,), fork.planted)
+        self.assertEqual(0, fork.money)
+        self.assertEqual((-1,), state.planted)
+        self.assertEqual(500, state.money)
+        self.assertTrue(self.fields[0].is_empty())
+
+    def test_unprofitable_crops_are_not_offered(self):
+        # GIVEN a new game, in which crop 2 always makes a loss
+        state = game_state.GameState(1, 500, (0,), (-1,), (0,))
+
+        # WHEN I list the legal moves
+        moves = self.simulator.legal_moves(state)
+
+        # THEN I may only play or plant crop 1, as field 2 is unaffordable
+        self.assertEqual([game_state.GameSimulator.PLAY,
+                          self.simulator.first_plant_move], moves)
+
+    def test_search_requires_budget(self):
+        # GIVEN no rollout or time budget
+        # WHEN I create a search
+        # THEN it is refused
+        with self.assertRaises(ValueError):
+            mcts.MonteCarloTreeSearch(self.simulator)
+
+    def test_mcts_input_provider_plays_game(self):
+        # GIVEN an input provider searching 200 rollouts per decision
+        provider = input_providers.MCTSInputProvider(
+            5, self.crops, self.fields, rollouts=200, rng=random.Random(1))
+
+        # WHEN I use it to play a game with seeded weather
+        score = game.Game(5, 500, provider, self.crops, self.fields,
+                          rng=random.Random(1)).run()
+
+        # THEN it finishes with more than it started with
+        self.assertTrue(score > 500 + 1000)
+        self.assertTrue(provider.search.rollouts_done > 0)
@@ -0,0 +1,46 @@
+import unittest
+import acs.ai as ai
+import acs.farm as farm
+import acs.memory_benchmark as memory_benchmark
+
+
+class TestMemoryBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [farm.Crop(1, 'Crop 1', 'Crop 1', 10, 50, 5, 5, 1, 1),
+                      farm.Crop(2, 'Crop 2', 'Crop 2', 20, 80, 5, 5, 1, 1)]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+
+    def test_benchmark_reports_measurements(self):
+        # GIVEN a benchmark of a small population and a few games
+        benchmark = memory_benchmark.MemoryBenchmark(20, 3, self.crops,
+                                                     self.fields)
+
+        # WHEN I run it
+        results = benchmark.run()
+
+        # THEN every measurement is reported
+        self.assertEqual({"bytes_per_strategy", "game_peak_bytes",
+                          "games_per_second", "peak_rss_mb"}, set(results))
+        self.assertTrue(results["bytes_per_strategy"] > 0)
+        self.assertTrue(results["games_per_second"] > 0)
+
+    def test_strategies_share_cost_order(self):
+        # GIVEN an Evolver
+        evolver = ai.Evolver(5, 500, self.crops, self.fields, verbose=False,
+                             seed=1)
+
+        # WHEN it creates Strategies, and they are copied and mutated
+        first = evolver.generate_random_strategy()
+        second = first.copy()
+        second.replace_weighting(self.crops[0], 1)
+
+        # THEN their samplers share the Evolver's tuple of crops in order of
+        # cost
+        self.assertEqual((self.crops[0], self.crops[1]), evolver.cost_order)
+        self.assertIs(evolver.cost_order, first.crop_sampler.crops)
+        self.assertIs(evolver.cost_order, second.crop_sampler.crops)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import acs.farm as farm
+import acs.meta_tuning as meta_tuning
+
+
+class TestMetaTuner(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+
+    def test_rank_key_prefers_fewest_games_to_target(self):
+        # GIVEN results which did and did not reach the target
+        results = [(False, 100, 900), (True, 500, 1000), (True, 200, 1000),
+                   (False, 100, 950)]
+
+        # WHEN I rank them
+        results.sort(key=meta_tuning.MetaTuner.rank_key)
+
+        # THEN those reaching it with fewest games come first
+        self.assertEqual([(True, 200, 1000), (True, 500, 1000),
+                          (False, 100, 950), (False, 100, 900)], results)
+
+    def test_configuration_seed_is_stable(self):
+        # GIVEN a tuner and two sampled configurations
+        tuner = meta_tuning.MetaTuner(5, 500, self.crops, self.fields,
+                                      target_fitness=1000, seed=1)
+        first = tuner.sample_configuration()
+        second = tuner.sample_configuration()
+
+        # WHEN I derive their seeds, then derive them again in the other
+        # order, as after re-ranking
+        seeds = [tuner.configuration_seed(first),
+                 tuner.configuration_seed(second)]
+        reranked = [tuner.configuration_seed(dict(second)),
+                    tuner.configuration_seed(dict(first))]
+
+        # THEN each configuration keeps its own seed
+        self.assertEqual(seeds, reranked[::-1])
+        self.assertNotEqual(seeds[0], seeds[1])
+
+    def test_run_returns_ranked_configurations(self):
+        # GIVEN a small tuning run
+        tuner = meta_tuning.MetaTuner(5, 500, self.crops, self.fields,
+                                      target_fitness=10 ** 9,
+                                      num_configurations=4,
+                                      min_generations=1, reduction_factor=2,
+                                      workers=2, seed=1, verbose=False)
+
+        # WHEN I run it
+        ranked = tuner.run()
+
+        # THEN it halves the configurations down to one
+        self.assertEqual(1, len(ranked))
+        self.assertEqual(set(meta_tuning.SEARCH_SPACE), set(ranked[0][0]))
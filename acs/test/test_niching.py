@@ -0,0 +1,71 @@
+import math
+import random
+import unittest
+import acs.ai as ai
+import acs.farm as farm
+import acs.niching as niching
+
+
+class TestGenomeIndex(unittest.TestCase):
+
+    def test_within_matches_brute_force(self):
+        # GIVEN an index over some random genome vectors
+        rng = random.Random(1)
+        points = [[rng.random() for i in range(5)] for j in range(200)]
+        index = niching.GenomeIndex(points)
+
+        for point in points[:20]:
+
+            # WHEN I look for neighbours of a genome
+            found = sorted(other for other, distance
+                           in index.within(point, 0.4))
+
+            # THEN they are the genomes within the radius
+            expected = [other for other in range(len(points))
+                        if math.dist(point, points[other]) <= 0.4]
+            self.assertEqual(expected, found)
+
+    def test_identical_genomes_share_a_niche(self):
+        # GIVEN a cluster of identical genomes and a distant genome
+        points = [[0.5, 0.5]] * 20 + [[0, 0]]
+
+        # WHEN I count the niches
+        counts = niching.niche_counts(points, 0.1)
+
+        # THEN the cluster is one niche and the distant genome another
+        self.assertEqual(20, counts[0])
+        self.assertEqual(1, counts[-1])
+        self.assertAlmostEqual(2, niching.effective_niches(counts))
+
+
+class TestFitnessSharing(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+
+    def test_selection_order_penalises_crowded_genomes(self):
+        # GIVEN a fit genome repeated three times, and a less fit loner
+        evolver = ai.Evolver(5, 500, self.crops, self.fields, seed=1,
+                             verbose=False, niche_radius=0.1)
+        generation = []
+
+        for fitness in [300, 300, 300]:
+            strategy = ai.Strategy({self.crops[0]: 1, self.crops[1]: 1}, 2)
+            strategy.fitness = fitness
+            generation.append(strategy)
+
+        loner = ai.Strategy({self.crops[0]: 1, self.crops[1]: 100}, 2)
+        loner.fitness = 200
+        generation.append(loner)
+
+        # WHEN I order them for parent selection
+        evolver.measure_diversity(generation)
+        order = evolver.selection_order(generation)
+
+        # THEN the loner comes first
+        self.assertIs(loner, order[0])
+        self.assertAlmostEqual(2, evolver.diversity)
@@ -0,0 +1,62 @@
+import random
+import unittest
+import acs.ai as ai
+import acs.farm as farm
+import acs.optimizers as optimizers
+
+
+class TestOptimizers(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+
+    def test_vector_round_trip(self):
+        # GIVEN a Strategy
+        strategy = ai.Strategy({self.crops[0]: 30, self.crops[1]: 70}, 1.5)
+
+        # WHEN I convert it to a genome vector and back
+        vector = optimizers.vector_from_strategy(strategy, self.crops)
+        copy = optimizers.strategy_from_vector(vector, self.crops)
+
+        # THEN it has the same planting probabilities and field ratio
+        self.assertAlmostEqual(0.3, copy.chances_to_plant[self.crops[0]])
+        self.assertAlmostEqual(1.5, copy.field_ratio)
+
+    def test_symmetric_eigen_reconstructs_matrix(self):
+        # GIVEN a random symmetric matrix
+        rng = random.Random(1)
+        n = 4
+        matrix = [[0.0] * n for i in range(n)]
+        for i in range(n):
+            for j in range(i + 1):
+                matrix[i][j] = matrix[j][i] = rng.random()
+
+        # WHEN I decompose it
+        values, vectors = optimizers.symmetric_eigen(matrix)
+
+        # THEN B D B^T is the original matrix
+        for i in range(n):
+            for j in range(n):
+                self.assertAlmostEqual(
+                    matrix[i][j],
+                    sum(vectors[i][k] * values[k] * vectors[j][k]
+                        for k in range(n)))
+
+    def test_optimise_with_each_backend(self):
+        for name, optimizer_class in optimizers.OPTIMIZERS.items():
+            with self.subTest(name):
+                # GIVEN an Optimizer
+                evolver = ai.Evolver(5, 500, self.crops, self.fields, seed=1,
+                                     verbose=False)
+                optimizer = optimizer_class(evolver)
+
+                # WHEN I run it for a few iterations
+                games, best = optimizers.optimise(optimizer, 3000)
+
+                # THEN it stops within its budget and has found a Strategy
+                self.assertTrue(3000 <= games < 3000 + 100 * 20)
+                self.assertTrue(best.fitness > 0)
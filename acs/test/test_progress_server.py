@@ -0,0 +1,177 @@
+import http.client
+import json
+import os
+import socket
+import tempfile
+import unittest
+import acs.ai as ai
+import acs.farm as farm
+import acs.progress_server as progress_server
+
+
+class TestProgressServer(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+
+    def evolve(self, monitor, steady_state=False):
+        evolver = ai.Evolver(5, 500, self.crops, self.fields,
+                             num_generations=3, verbose=False, seed=1,
+                             population_size=10, num_games=4,
+                             progress_monitor=monitor)
+
+        if steady_state:
+            evolver.evolve_steady_state()
+        else:
+            evolver.evolve()
+
+        return evolver
+
+    def test_progress_served_over_http(self):
+        # GIVEN a progress monitor serving on a free local port
+        monitor = progress_server.ProgressMonitor(("127.0.0.1", 0))
+        host, port = monitor.start()
+
+        try:
+            # WHEN an Evolver publishes to it
+            evolver = self.evolve(monitor)
+
+            connection = http.client.HTTPConnection(host, port, timeout=5)
+            connection.request("GET", "/")
+            response = connection.getresponse()
+            progress = json.loads(response.read())
+            connection.close()
+        finally:
+            monitor.stop()
+
+        # THEN the last generation's progress is served
+        self.assertEqual(200, response.status)
+        self.assertEqual(3, progress["generation"])
+        self.assertEqual(evolver.games_played, progress["games_played"])
+        self.assertEqual([1, 2, 3], [entry["generation"]
+                                     for entry in progress["history"]])
+        self.assertEqual(5, len(progress["top_strategies"]))
+        self.assertGreater(progress["games_per_second"], 0)
+
+    def test_history_is_bounded(self):
+        # GIVEN a monitor keeping two generations of history
+        monitor = progress_server.ProgressMonitor(None, history_length=2)
+
+        # WHEN three generations are published
+        self.evolve(monitor)
+
+        # THEN only the latest two are kept
+        self.assertEqual([2, 3], [entry[0]
+                                  for entry in monitor.snapshot.history])
+
+    def test_steady_state_progress(self):
+        # GIVEN a monitor
+        monitor = progress_server.ProgressMonitor(None)
+
+        # WHEN steady-state evolution publishes to it
+        self.evolve(monitor, steady_state=True)
+
+        # THEN a snapshot is published per population's worth of evaluations
+        self.assertEqual(3, monitor.snapshot.generation)
+
+    def test_progress_served_over_unix_socket(self):
+        # GIVEN a progress monitor serving on a Unix socket, before any
+        # generation has finished
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "progress.sock")
+            monitor = progress_server.ProgressMonitor(path)
+            monitor.start()
+
+            # WHEN it is queried
+            try:
+                with socket.socket(socket.AF_UNIX) as client:
+                    client.connect(path)
+                    client.sendall(b"GET / HTTP/1.0\r\n\r\n")
+                    response = b""
+
+                    while True:
+                        data = client.recv(4096)
+
+                        if not data:
+                            break
+
+                        response += data
+            finally:
+                monitor.stop()
+
+            # THEN the empty progress is served, and the socket removed
+            self.assertEqual({"generation": 0},
+                             json.loads(response.split(b"\r\n\r\n", 1)[1]))
+            self.assertFalse(os.path.exists(path))
+
+    def test_existing_file_is_not_replaced(self):
+        # GIVEN an ordinary file
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "best.json")
+
+            with open(path, "w", encoding="utf-8") as existing_file:
+                existing_file.write("{}")
+
+            # WHEN a monitor is asked to serve on its path
+            # THEN it refuses, and the file is kept
+            with self.assertRaises(ValueError):
+                progress_server.ProgressMonitor(path).start()
+
+            self.assertTrue(os.path.exists(path))
+
+    def test_socket_in_use_is_not_taken_over(self):
+        # GIVEN a monitor serving on a Unix socket
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "progress.sock")
+            monitor = progress_server.ProgressMonitor(path)
+            monitor.start()
+
+            try:
+                # WHEN a second monitor is asked to serve on the same path
+                # THEN it refuses, and the first keeps its socket
+                with self.assertRaises(ValueError):
+                    progress_server.ProgressMonitor(path).start()
+
+                self.assertTrue(
+                    progress_server.ProgressMonitor.is_listening(path))
+            finally:
+                monitor.stop()
+
+    def test_stale_socket_is_replaced(self):
+        # GIVEN a socket left behind by a server which has exited
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "progress.sock")
+
+            with socket.socket(socket.AF_UNIX) as stale:
+                stale.bind(path)
+
+            # WHEN a monitor is asked to serve on its path
+            monitor = progress_server.ProgressMonitor(path)
+            monitor.start()
+
+            # THEN it serves there, and removes its own socket when stopped
+            try:
+                self.assertTrue(
+                    progress_server.ProgressMonitor.is_listening(path))
+            finally:
+                monitor.stop()
+
+            self.assertFalse(os.path.exists(path))
+
+    def test_parse_address(self):
+        # GIVEN TCP addresses and a Unix socket path
+        # WHEN they are parsed
+        # THEN ports are read, and the host defaults to localhost
+        parse_address = progress_server.ProgressMonitor.parse_address
+        self.assertEqual(("127.0.0.1", 8080), parse_address(":8080"))
+        self.assertEqual(("0.0.0.0", 80), parse_address("0.0.0.0:80"))
+        self.assertEqual("/tmp/progress.sock",
+                         parse_address("/tmp/progress.sock"))
+
+
+if __name__ == '__main__':
+    unittest.main()
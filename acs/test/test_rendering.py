@@ -0,0 +1,87 @@
+import io
+import socket
+import unittest
+import acs.farm as farm
+import acs.input_providers as input_providers
+import acs.rendering as rendering
+import acs.weather as weather
+
+
+class TestRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.crop = farm.Crop(1, 'Wheat', 'Golden', 10, 20, 1.1, 0.9, 2, 0.5)
+        self.field = farm.Field(1, 'Field 1', 'Flat', 100, 1, 1000)
+
+    def test_field_status_matches_printed_report(self):
+        # GIVEN a planted field
+        self.field.plant(self.crop, 5)
+        expected = io.StringIO()
+        print("Field 1 - Flat", file=expected)
+        print("Value:", 1000, " Size:", 100, file=expected)
+        print("Contents:", "Wheat", "(", 5, ")\n", file=expected)
+
+        # WHEN its status is reported
+        output = io.StringIO()
+        self.field.report_status(output)
+
+        # THEN the text is what the equivalent print calls would produce
+        self.assertEqual(expected.getvalue(), output.getvalue())
+
+    def test_report_is_written_once(self):
+        # GIVEN an output recording each write
+        class CountingOutput(io.StringIO):
+            writes = 0
+
+            def write(self, text):
+                CountingOutput.writes += 1
+                return super().write(text)
+
+        output = CountingOutput()
+        input_provider = input_providers.PlayerInputProvider(output=output)
+
+        # WHEN the details of several crops are listed
+        input_provider.list_available_crops_with_details([self.crop] * 3)
+
+        # THEN they reach the output in a single write
+        self.assertEqual(1, CountingOutput.writes)
+        self.assertEqual(3, output.getvalue().count("Wheat - Golden"))
+
+    def test_financials_report_loss(self):
+        # GIVEN a year which cost more than it made
+        # WHEN its financials are rendered
+        text = rendering.render_financials(100, 250, 50)
+
+        # THEN the loss is reported
+        self.assertEqual("Asset acquisitions: 50\nRevenue: 100\n"
+                         "Expenses: 250\n"
+                         "Commiserations... you made a loss of -100\n", text)
+
+    def test_socket_output(self):
+        # GIVEN a connected pair of sockets
+        sending, receiving = socket.socketpair()
+
+        # WHEN a crop is described to one of them
+        with sending, receiving:
+            self.crop.describe(rendering.SocketOutput(sending))
+
+            # THEN the description arrives at the other
+            self.assertEqual(b"Wheat - Golden\nCost: 10   Sale price: 20 \n\n",
+                             receiving.recv(1024))
+
+    def test_weather_band_lookup(self):
+        # GIVEN a set of weather bands
+        bands = weather.WeatherBands([weather.WeatherBand(-1.0, "cold"),
+                                      weather.WeatherBand(0.0, "mild"),
+                                      weather.WeatherBand(1.0, "hot")])
+
+        # WHEN values are looked up
+        # THEN each falls in the highest band starting at or below it
+        self.assertIsNone(bands.find(-1.5))
+        self.assertEqual("cold", bands.find(-1.0).message)
+        self.assertEqual("mild", bands.find(0.5).message)
+        self.assertEqual("hot", bands.find(3.0).message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import io
+import os
+import tempfile
+import unittest
+import acs.actions as actions
+import acs.farm as farm
+import acs.game as game
+import acs.input_providers as input_providers
+import acs.sessions as sessions
+
+
+class TestSessions(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000),
+                       farm.Field(2, 'Field 2', '', 100, 1, 200)]
+
+    def test_scripted_player_plants_and_advances(self):
+        # GIVEN a script which enters an invalid action, then plants 10 of
+        # the first crop in the first field, then advances every year
+        script = [9, 3, 1, 1, 10, 4] + [5] * 4
+        input_provider = input_providers.ScriptedInputProvider(script)
+        game_instance = game.Game(5, 500, input_provider, self.crops,
+                                  [field.copy() for field in self.fields])
+
+        # WHEN the game is run
+        game_instance.run()
+
+        # THEN the whole game was played and its output collected
+        output = input_provider.output.getvalue()
+        self.assertEqual(5, game_instance.current_year)
+        self.assertIn("How many would you like to plant?", output)
+        self.assertIn("Final total assets", output)
+
+    def test_exhausted_script_raises_eof(self):
+        # GIVEN a script shorter than the game
+        input_provider = input_providers.ScriptedInputProvider([5, 5])
+        game_instance = game.Game(5, 500, input_provider, self.crops,
+                                  [field.copy() for field in self.fields])
+
+        # WHEN the game is run
+        # THEN it ends as a player closing the input would
+        with self.assertRaises(EOFError):
+            game_instance.run()
+
+    def test_recorded_sessions_replay_identically(self):
+        # GIVEN sessions played by random players
+        recorded = sessions.record_sessions(20, 5, 500, self.crops,
+                                            self.fields, seed=7)
+
+        # WHEN they are saved, loaded and replayed
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "sessions.jsonl")
+            sessions.save_sessions(recorded, file_name)
+            loaded = sessions.load_sessions(file_name)
+
+        changed, num_decisions, seconds = sessions.replay_sessions(
+            loaded, self.crops, self.fields)
+
+        # THEN every score and output is reproduced
+        self.assertEqual([], changed)
+        self.assertEqual(sum(len(session.decisions) for session in recorded),
+                         num_decisions)
+
+        # AND the shared catalog fields were never planted
+        for field in self.fields:
+            self.assertTrue(field.is_empty())
+
+    def test_changed_output_is_detected(self):
+        # GIVEN a recorded session whose output digest no longer matches
+        session = sessions.record_sessions(1, 5, 500, self.crops,
+                                           self.fields, seed=7)[0]
+        session.output_digest = sessions.Session.digest("")
+
+        # WHEN it is replayed
+        changed, num_decisions, seconds = sessions.replay_sessions(
+            [session], self.crops, self.fields)
+
+        # THEN it is reported as changed
+        self.assertEqual([session], changed)
+
+    def test_random_invalid_entry_is_not_exit(self):
+        # GIVEN a random player who will first enter a number out of range
+        class FixedRandom:
+            def __init__(self):
+                self.values = [0.5, 0.0, 0.5]
+
+            def random(self):
+                return self.values.pop(0)
+
+            def randrange(self, stop):
+                return 0
+
+            def choice(self, choices):
+                return choices[0]
+
+        input_provider = sessions.RandomInputProvider(FixedRandom())
+
+        # WHEN they choose from a menu whose last option is Exit
+        choice = input_provider.choose_from_numbered_list(
+            {1: actions.PLAY_ACTION, 2: actions.EXIT_ACTION})
+
+        # THEN their out of range number is above Exit, and is ignored
+        self.assertEqual([3, 1], input_provider.recording)
+        self.assertIs(actions.PLAY_ACTION, choice)
+
+    def test_quantity_ignores_out_of_range_entries(self):
+        # GIVEN a player who enters 3, then 2, then 0
+        input_provider = input_providers.ScriptedInputProvider([3, 2, 0])
+
+        # WHEN they are asked twice for a quantity up to 2
+        # THEN the out of range entry is ignored, and 0 cancels
+        self.assertEqual(2, input_provider.choose_quantity(2))
+        self.assertIsNone(input_provider.choose_quantity(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import random
+import unittest
+import acs.farm as farm
+import acs.shared_tables as shared_tables
+import acs.weather as weather
+
+
+class TestSharedTables(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1.5, 1000)]
+        self.weather_table = weather.WeatherTable.draw(3, 4, random.Random(1))
+        self.tables = shared_tables.SharedTables.publish(
+            self.crops, self.fields, self.weather_table)
+
+    def tearDown(self):
+        self.tables.close()
+
+    def test_attach_reads_catalog(self):
+        # GIVEN published tables
+        # WHEN I attach to them
+        with shared_tables.SharedTables.attach(self.tables.name) as attached:
+
+            # THEN the catalog is the same as the one published
+            self.assertEqual('Crop 2', attached.crops[1].name)
+            self.assertEqual(5, attached.crops[1].cost)
+            self.assertEqual(0.8, attached.crops[1].ideal_wetness)
+            self.assertEqual(1.5, attached.fields[0].soil_quality)
+
+    def test_attach_reads_weather(self):
+        # GIVEN published tables
+        # WHEN I attach to them and replay a weather scenario
+        with shared_tables.SharedTables.attach(self.tables.name) as attached:
+            shared_weather = attached.weather_table.generator(2).generate()
+            local_weather = self.weather_table.generator(2).generate()
+
+            # THEN it matches the weather published
+            self.assertEqual(local_weather.heat, shared_weather.heat)
+            self.assertEqual(local_weather.wetness, shared_weather.wetness)
+
+    def test_attach_refuses_different_catalog(self):
+        # GIVEN published tables
+        # WHEN I attach expecting a different catalog
+        # THEN I am refused
+        with self.assertRaises(ValueError):
+            shared_tables.SharedTables.attach(self.tables.name, "0" * 64)
@@ -0,0 +1,50 @@
+import random
+import unittest
+import acs.farm as farm
+import acs.game as game
+import acs.input_providers as input_providers
+import acs.solver as solver
+
+
+class TestSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 4, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [
+            farm.Field(1, 'Field 1', '', 100, 1, 1000),
+            farm.Field(2, 'Field 2', '', 100, 1, 800)
+        ]
+        self.solver = solver.Solver(5, 500, self.crops, self.fields)
+
+    def test_solve_beats_doing_nothing(self):
+        # GIVEN a catalog with a profitable crop
+        # WHEN I solve the game
+        expected_score = self.solver.solve()
+
+        # THEN the expected score beats never planting anything
+        self.assertTrue(expected_score > 500 + 1000)
+
+    def test_decide_plants_profitable_crop(self):
+        # GIVEN a solved game
+        self.solver.solve()
+
+        # WHEN I ask for the first decision
+        field, crop = self.solver.decide(1, 500, [self.fields[0]])
+
+        # THEN it plants the crop which makes a profit
+        self.assertIsNone(field)
+        self.assertEqual(self.crops[0], crop)
+
+    def test_solver_input_provider_plays_game(self):
+        # GIVEN an input provider following the solver's policy
+        provider = input_providers.SolverInputProvider(self.solver)
+
+        # WHEN I use it to play a game with seeded weather
+        random.seed(1)
+        score = game.Game(5, 500, provider, self.crops, self.fields).run()
+
+        # THEN it finishes with more than it started with
+        self.assertTrue(score > 500 + 1000)
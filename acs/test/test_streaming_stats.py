@@ -0,0 +1,75 @@
+import random
+import statistics
+import unittest
+import acs.streaming_stats as streaming_stats
+
+
+class TestRunningStatistics(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(1)
+        self.values = [rng.gauss(1000, 200) for i in range(500)]
+
+    def test_add_matches_batch_statistics(self):
+        # GIVEN a stream of values
+        running = streaming_stats.RunningStatistics()
+
+        # WHEN I add them one at a time
+        for value in self.values:
+            running.add(value)
+
+        # THEN the statistics match those calculated over the whole list
+        self.assertAlmostEqual(statistics.mean(self.values), running.mean)
+        self.assertAlmostEqual(statistics.variance(self.values),
+                               running.variance())
+        self.assertEqual(min(self.values), running.minimum)
+        self.assertEqual(max(self.values), running.maximum)
+
+    def test_merge_matches_single_stream(self):
+        # GIVEN a stream of values split into two parts
+        first = streaming_stats.RunningStatistics()
+        second = streaming_stats.RunningStatistics()
+
+        for value in self.values[:123]:
+            first.add(value)
+        for value in self.values[123:]:
+            second.add(value)
+
+        # WHEN I merge the statistics of the parts
+        first.merge(second)
+
+        # THEN they match the statistics of the whole stream
+        self.assertEqual(len(self.values), first.count)
+        self.assertAlmostEqual(statistics.mean(self.values), first.mean)
+        self.assertAlmostEqual(statistics.variance(self.values),
+                               first.variance())
+
+
+class TestP2Quantile(unittest.TestCase):
+
+    def test_small_streams_are_exact(self):
+        # GIVEN fewer than six values
+        median = streaming_stats.P2Quantile(0.5)
+
+        # WHEN I add them
+        for value in [5, 1, 3]:
+            median.add(value)
+
+        # THEN the median is exact
+        self.assertEqual(3, median.value())
+
+    def test_estimates_quantiles(self):
+        # GIVEN a long stream of uniform values
+        rng = random.Random(2)
+        estimators = [streaming_stats.P2Quantile(q) for q in (0.1, 0.5, 0.9)]
+
+        # WHEN I add them
+        for i in range(10000):
+            value = rng.random()
+            for estimator in estimators:
+                estimator.add(value)
+
+        # THEN the estimated quantiles are close to the true ones
+        for estimator in estimators:
+            self.assertAlmostEqual(estimator.quantile, estimator.value(),
+                                   delta=0.02)
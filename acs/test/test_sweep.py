@@ -0,0 +1,95 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+import acs.sweep as sweep
+
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.crops_file_name = os.path.join(self.directory.name, "crops.dat")
+        self.fields_file_name = os.path.join(self.directory.name, "fields.dat")
+        self.results_file_name = os.path.join(self.directory.name,
+                                              "results.csv")
+
+        with open(self.crops_file_name, "w", encoding="utf-8") as crops_file:
+            json.dump({"crops": [
+                {"id": 1, "name": "Crop 1", "description": "", "cost": 10,
+                 "sale_price": 20, "ideal_heat": 1.1, "ideal_wetness": 0.9,
+                 "heat_sensitivity": 2, "wetness_sensitivity": 0.5},
+                {"id": 2, "name": "Crop 2", "description": "", "cost": 5,
+                 "sale_price": 15, "ideal_heat": 1.2, "ideal_wetness": 0.8,
+                 "heat_sensitivity": 0.5, "wetness_sensitivity": 2}]},
+                crops_file)
+
+        with open(self.fields_file_name, "w",
+                  encoding="utf-8") as fields_file:
+            json.dump({"fields": [
+                {"id": 1, "name": "Field 1", "description": "",
+                 "max_crop_quantity": 100, "soil_quality": 1,
+                 "price": 1000}]}, fields_file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_sweep(self, seed=1, strategy_data=None):
+        return sweep.Sweep(
+            [(self.crops_file_name, self.fields_file_name)], [3], [500],
+            self.results_file_name, workers=1, num_generations=1,
+            strategy_data=strategy_data, seed=seed).run()
+
+    def test_completed_cells_are_skipped(self):
+        # GIVEN a sweep which has run
+        self.assertEqual(1, self.run_sweep())
+
+        # WHEN it is run again with the same settings
+        # THEN nothing is run
+        self.assertEqual(0, self.run_sweep())
+
+    def test_different_settings_are_not_skipped(self):
+        # GIVEN a sweep which has run
+        self.run_sweep()
+        strategy_data = {"crop_weightings": {"Crop 1": 1, "Crop 2": 1},
+                         "field_ratio": 2}
+
+        # WHEN it is run with another seed, or to evaluate fixed Strategies
+        # THEN each cell is run again, once per distinct setting
+        self.assertEqual(1, self.run_sweep(seed=2))
+        self.assertEqual(1, self.run_sweep(strategy_data=strategy_data))
+        self.assertEqual(0, self.run_sweep(strategy_data=strategy_data))
+        strategy_data["field_ratio"] = 3
+        self.assertEqual(1, self.run_sweep(strategy_data=strategy_data))
+
+        # AND every row has the current columns
+        with open(self.results_file_name, newline="") as results_file:
+            rows = list(csv.reader(results_file))
+
+        self.assertEqual(sweep.Sweep.RESULT_COLUMNS, rows[0])
+        self.assertEqual(4, len({tuple(row[:sweep.Sweep.KEY_LENGTH])
+                                 for row in rows[1:]}))
+
+    def test_results_with_other_columns_are_rejected(self):
+        # GIVEN a results table with an older layout
+        with open(self.results_file_name, "w", newline="") as results_file:
+            csv.writer(results_file).writerow(["crops_file", "fields_file",
+                                               "max_years", "mode"])
+
+        # WHEN a sweep appends to it
+        # THEN it is refused
+        with self.assertRaises(ValueError):
+            self.run_sweep()
+
+    def test_zero_generations_are_rejected(self):
+        # GIVEN no generations to evolve
+        # WHEN a sweep is created
+        # THEN it is refused
+        with self.assertRaises(ValueError):
+            sweep.Sweep([], [3], [500], self.results_file_name,
+                        num_generations=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import acs.farm as farm
+import acs.tournament as tournament
+
+
+class TestTournament(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 4, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+
+    def strategy_entrant(self, label, first_weighting, second_weighting):
+        return tournament.Entrant(
+            label, "strategy",
+            {"crop_weightings": {"Crop 1": first_weighting,
+                                 "Crop 2": second_weighting},
+             "field_ratio": 2})
+
+    def test_clear_winner_decided_early(self):
+        # GIVEN a profitable Strategy against a loss-making one
+        entrants = [self.strategy_entrant("loser", 0, 1),
+                    self.strategy_entrant("winner", 1, 0)]
+        contest = tournament.Tournament(entrants, 5, 500, self.crops,
+                                        self.fields, max_games=500)
+
+        # WHEN I run the tournament
+        table = contest.run()
+
+        # THEN the winner is ranked first after the minimum number of games
+        self.assertEqual(["winner", "loser"], [row[0] for row in table])
+        self.assertEqual([1, 0, 0], table[0][4:])
+        self.assertEqual(2 * tournament.Tournament.MIN_GAMES,
+                         contest.games_played())
+
+    def test_identical_entrants_draw(self):
+        # GIVEN two copies of the same deterministic Strategy
+        entrants = [self.strategy_entrant("first", 1, 0),
+                    self.strategy_entrant("second", 1, 0)]
+        contest = tournament.Tournament(entrants, 5, 500, self.crops,
+                                        self.fields, max_games=500)
+
+        # WHEN I run the tournament
+        table = contest.run()
+
+        # THEN their pairing is a draw
+        self.assertEqual([0, 1, 0], table[0][4:])
+        self.assertEqual(table[0][2], table[1][2])
+
+    def test_pairing_waits_for_evidence(self):
+        # GIVEN a pairing with noisy differences close to zero
+        pairing = tournament.Pairing(0, 1)
+        first_scores = [100 + (10 if game % 2 else -10)
+                        for game in range(30)]
+        second_scores = [100] * 30
+
+        # WHEN I update it
+        pairing.update(first_scores, second_scores, 1, 0.05, 0.05, 20, 100)
+
+        # THEN it remains undecided
+        self.assertFalse(pairing.decided)
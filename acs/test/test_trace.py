@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+import acs.ai as ai
+import acs.farm as farm
+import acs.game as game
+import acs.input_providers as input_providers
+import acs.trace as trace
+
+
+class TestTraceRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [farm.Field(1, 'Field 1', '', 100, 1, 1000)]
+        strategy = ai.Strategy({self.crops[0]: 50, self.crops[1]: 80}, 2)
+        self.input_provider = input_providers.AIInputProvider(strategy)
+
+        handle, self.file_name = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def play_games(self, number_of_games, sample_interval):
+        scores = []
+
+        with trace.TraceRecorder(self.file_name, sample_interval) as recorder:
+            for i in range(number_of_games):
+                scores.append(game.Game(5, 500, self.input_provider,
+                                        self.crops, self.fields,
+                                        recorder).run())
+
+        replayer = trace.TraceReplayer(self.file_name, self.crops, self.fields)
+        return scores, list(replayer.read_records())
+
+    def test_records_are_fixed_width(self):
+        # GIVEN a traced game
+        self.play_games(1, 1)
+
+        # WHEN I check the size of the trace file
+        # THEN it holds a whole number of records
+        self.assertEqual(0, os.path.getsize(self.file_name)
+                         % trace.RECORD_SIZE)
+
+    def test_final_score_is_recorded(self):
+        # GIVEN a traced game
+        scores, records = self.play_games(1, 1)
+
+        # WHEN I read back its last record
+        tag, values = records[-1]
+
+        # THEN it holds the final score of the game
+        self.assertEqual(trace.END_RECORD, tag)
+        self.assertEqual(scores[0], values[0])
+
+    def test_sampling_skips_games(self):
+        # GIVEN ten games, of which one in five are traced
+        scores, records = self.play_games(10, 5)
+
+        # WHEN I count the games in the trace
+        games = [values[0] for tag, values in records
+                 if tag == trace.GAME_RECORD]
+
+        # THEN only the sampled games are present
+        self.assertEqual([0, 5], games)
@@ -0,0 +1,88 @@
+import unittest
+import acs.ai as ai
+import acs.farm as farm
+import acs.what_if as what_if
+
+
+class TestWhatIf(unittest.TestCase):
+
+    def setUp(self):
+        self.crops = [
+            farm.Crop(1, 'Crop 1', 'Crop 1', 10, 20, 1.1, 0.9, 2, 0.5),
+            farm.Crop(2, 'Crop 2', 'Crop 2', 5, 15, 1.2, 0.8, 0.5, 2)
+        ]
+        self.fields = [
+            farm.Field(1, 'Field 1', '', 100, 1, 1000),
+            farm.Field(2, 'Field 2', '', 100, 1, 5000)
+        ]
+        self.new_crops, self.new_fields = what_if.apply_change(
+            self.crops, self.fields, "Crop 1.sale_price=30")
+        self.strategy_data = [
+            {"crop_weightings": {"Crop 1": 1, "Crop 2": 1},
+             "field_ratio": 100},
+            {"crop_weightings": {"Crop 1": 0, "Crop 2": 1},
+             "field_ratio": 100}
+        ]
+
+    def test_apply_change_copies_catalog(self):
+        # GIVEN a changed copy of the catalog
+        # WHEN I compare it with the original
+        diff = what_if.CatalogDiff(self.crops, self.fields, self.new_crops,
+                                   self.new_fields)
+
+        # THEN only the changed crop differs, and the original is untouched
+        self.assertEqual(["Crop 1: sale_price 20 -> 30"], diff.describe())
+        self.assertEqual(20, self.crops[0].sale_price)
+
+    def test_affected_reasons(self):
+        # GIVEN a change to crop 1 and the starting field
+        crops, fields = what_if.apply_change(self.new_crops, self.new_fields,
+                                             "Field 1.soil_quality=1.5")
+        diff = what_if.CatalogDiff(self.crops, self.fields, crops, fields)
+        planter, abstainer = [ai.Strategy.from_dict(data, self.crops)
+                              for data in self.strategy_data]
+
+        # WHEN I ask which Strategies are affected
+        # THEN every Strategy owns the field, but only one plants the crop
+        self.assertEqual(["plants Crop 1", "owns Field 1"],
+                         diff.affected_reasons(planter, 2000))
+        self.assertEqual(["owns Field 1"],
+                         diff.affected_reasons(abstainer, 2000))
+
+    def test_unweighted_crop_change_affects_fallback_draws(self):
+        # GIVEN a change to the sale price of the cheapest crop, and a
+        # Strategy which only weights the dearer crop
+        crops, fields = what_if.apply_change(self.crops, self.fields,
+                                             "Crop 2.sale_price=100")
+        diff = what_if.CatalogDiff(self.crops, self.fields, crops, fields)
+        strategy = ai.Strategy.from_dict(
+            {"crop_weightings": {"Crop 1": 1, "Crop 2": 0},
+             "field_ratio": 100}, self.crops)
+
+        # WHEN I ask whether it is affected
+        # THEN it is, as it plants the unweighted crop when it can afford
+        # nothing else
+        self.assertEqual(["draws unweighted crops"],
+                         diff.affected_reasons(strategy, 2000))
+
+    def test_unaffected_strategies_keep_their_scores(self):
+        # GIVEN an analysis of a change to crop 1
+        analysis = what_if.WhatIfAnalysis(
+            5, 500, (self.crops, self.fields),
+            (self.new_crops, self.new_fields), num_games=10)
+
+        # WHEN I run it for a Strategy which plants crop 1 and one which
+        # does not
+        rows = analysis.run(["planter", "abstainer"], self.strategy_data)
+
+        # THEN only the first is re-evaluated, and the second's score is
+        # unchanged
+        self.assertEqual(30, analysis.games_played)
+        self.assertEqual(["planter", "abstainer"], [row[0] for row in rows])
+        self.assertTrue(rows[0][4] > 0)
+        self.assertEqual(0, rows[1][4])
+
+        # AND re-evaluating it anyway confirms this
+        strategies, statistics = analysis.evaluate(
+            self.new_crops, self.new_fields, self.strategy_data[1:])
+        self.assertEqual(rows[1][2], round(statistics[0].running.mean, 2))
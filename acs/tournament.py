@@ -0,0 +1,317 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import csv
+import itertools
+import math
+import os
+
+from acs.ai import *
+from acs.data_reader import DataReader
+from acs.hall_of_fame import HallOfFame
+from acs.launchers import Launcher
+from acs.seeding import derive_seed, make_rng
+from acs.solver import Solver
+from acs.streaming_stats import RunningStatistics
+from acs.what_if import read_strategies
+
+
+class Entrant:
+    """
+    Class representing a player in a Tournament: a Strategy (given as its
+    dictionary representation), the solver's policy, or the Monte Carlo tree
+    search player with a number of rollouts per decision. Entrants are
+    described by plain data, so that worker processes can build their own
+    input providers.
+    """
+
+    __slots__ = ("label", "kind", "data")
+
+    def __init__(self, label, kind, data=None):
+        self.label = label
+        self.kind = kind
+        self.data = data
+
+    @staticmethod
+    def parse(text):
+        """
+        Return the Entrants given by "solver", "mcts:ROLLOUTS" or the name of
+        a file of saved Strategies.
+        """
+
+        if text == "solver":
+            return [Entrant("solver", "solver")]
+
+        if text.startswith("mcts:"):
+            return [Entrant(text, "mcts", int(text.split(":")[1]))]
+
+        labels, strategy_data = read_strategies([text])
+
+        return [Entrant(label, "strategy", data)
+                for label, data in zip(labels, strategy_data)]
+
+    def input_provider(self, max_years, initial_money, crops, fields, rng):
+        if self.kind == "solver":
+            return SolverInputProvider(
+                Solver(max_years, initial_money, crops, fields))
+
+        if self.kind == "mcts":
+            return MCTSInputProvider(max_years, crops, fields,
+                                     rollouts=self.data, rng=rng)
+
+        return AIInputProvider(Strategy.from_dict(self.data, crops), rng)
+
+
+class Pairing:
+    """
+    Class representing the match between two Entrants, decided by a
+    sequential probability ratio test on their paired score differences:
+    the hypothesis that the first is better by the indifference margin
+    against the hypothesis that the second is, with the variance of the
+    differences estimated from the games so far. A pairing still undecided
+    after the maximum number of games is a draw.
+    """
+
+    __slots__ = ("first", "second", "differences", "winner", "decided")
+
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+        self.differences = RunningStatistics()
+        self.winner = None
+        self.decided = False
+
+    def update(self, first_scores, second_scores, margin, alpha, beta,
+               min_games, max_games):
+        """
+        Add the differences of the games both Entrants have now played, then
+        decide the pairing if the evidence is strong enough.
+        """
+
+        games = min(len(first_scores), len(second_scores), max_games)
+
+        for game in range(self.differences.count, games):
+            self.differences.add(first_scores[game] - second_scores[game])
+
+        if self.differences.count < min_games:
+            return
+
+        variance = self.differences.variance()
+
+        if variance == 0:
+            log_ratio = math.copysign(math.inf, self.differences.mean) \
+                if self.differences.mean else 0
+        else:
+            log_ratio = (2 * margin * self.differences.mean
+                         * self.differences.count / variance)
+
+        if log_ratio >= math.log((1 - beta) / alpha):
+            self.winner = self.first
+            self.decided = True
+        elif log_ratio <= math.log(beta / (1 - alpha)):
+            self.winner = self.second
+            self.decided = True
+        elif self.differences.count >= max_games or variance == 0:
+            self.decided = True
+
+
+def play_games(entrant, max_years, initial_money, crops, fields, seed,
+               first_game, num_games):
+    """
+    Worker entry point: play games first_game to first_game + num_games - 1
+    of the tournament with the given Entrant, and return their scores. Game
+    N's weather is the same for every Entrant.
+    """
+
+    scores = []
+    input_provider = entrant.input_provider(
+        max_years, initial_money, crops, fields,
+        make_rng(seed, "decisions", entrant.label, first_game))
+
+    for game in range(first_game, first_game + num_games):
+        scores.append(Game(max_years, initial_money, input_provider, crops,
+                           fields, rng=make_rng(seed, "weather", game)).run())
+
+    return scores
+
+
+class Tournament:
+    """
+    Class playing every pair of Entrants against each other on shared
+    weather. Entrants play in batches, in parallel, for as long as any of
+    their pairings is undecided, so clearly separated pairs stop after a
+    few games and only close pairs play up to the maximum.
+    """
+
+    BATCH_SIZE = 10
+    MIN_GAMES = 20
+    MAX_GAMES = 2000
+
+    # Error rates of the sequential tests, and the score difference, as a
+    # fraction of the mean score, below which Entrants are indifferent.
+    ALPHA = 0.05
+    BETA = 0.05
+    INDIFFERENCE = 0.02
+
+    TABLE_COLUMNS = ["entrant", "games", "mean_score",
+                     "confidence_half_width", "wins", "draws", "losses"]
+
+    def __init__(self, entrants, max_years, initial_money, crops, fields,
+                 seed=0, workers=None, max_games=None, indifference=None):
+        self.entrants = entrants
+        self.max_years = max_years
+        self.initial_money = initial_money
+        self.crops = crops
+        self.fields = fields
+        self.seed = seed
+        self.workers = workers
+        self.max_games = max_games or Tournament.MAX_GAMES
+        self.indifference = indifference or Tournament.INDIFFERENCE
+        self.scores = [[] for entrant in entrants]
+        self.pairings = [Pairing(first, second) for first, second
+                         in itertools.combinations(range(len(entrants)), 2)]
+
+    def games_played(self):
+        return sum(len(scores) for scores in self.scores)
+
+    def run(self):
+        """
+        Play until every pairing is decided, and return the league table.
+        """
+
+        executor = None
+
+        if self.workers is not None and self.workers > 1:
+            executor = ProcessPoolExecutor(self.workers)
+
+        try:
+            while True:
+                active = sorted({index for pairing in self.pairings
+                                 if not pairing.decided
+                                 for index in (pairing.first,
+                                               pairing.second)})
+
+                if not active:
+                    break
+
+                self.play_round(active, executor)
+                self.update_pairings()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return self.league_table()
+
+    def play_round(self, active, executor):
+        """
+        Play the next batch of games of each of the given Entrants.
+        """
+
+        arguments = [(self.entrants[index], self.max_years,
+                      self.initial_money, self.crops, self.fields, self.seed,
+                      len(self.scores[index]), Tournament.BATCH_SIZE)
+                     for index in active]
+
+        if executor is None:
+            results = [play_games(*argument) for argument in arguments]
+        else:
+            results = executor.map(play_games, *zip(*arguments))
+
+        for index, scores in zip(active, results):
+            self.scores[index].extend(scores)
+
+    def update_pairings(self):
+        all_scores = [score for scores in self.scores for score in scores]
+        margin = self.indifference * sum(all_scores) / len(all_scores)
+
+        for pairing in self.pairings:
+            if not pairing.decided:
+                pairing.update(self.scores[pairing.first],
+                               self.scores[pairing.second], margin,
+                               Tournament.ALPHA, Tournament.BETA,
+                               Tournament.MIN_GAMES, self.max_games)
+
+    def league_table(self):
+        """
+        Return a row, in the order of TABLE_COLUMNS, for each Entrant, ranked
+        by wins less losses and then by mean score.
+        """
+
+        rows = []
+
+        for index, entrant in enumerate(self.entrants):
+            statistics = RunningStatistics()
+
+            for score in self.scores[index]:
+                statistics.add(score)
+
+            wins = sum(1 for pairing in self.pairings
+                       if pairing.winner == index)
+            losses = sum(1 for pairing in self.pairings
+                         if pairing.winner is not None and
+                         pairing.winner != index and
+                         index in (pairing.first, pairing.second))
+            draws = len(self.entrants) - 1 - wins - losses
+
+            rows.append([entrant.label, statistics.count,
+                         round(statistics.mean, 2),
+                         round(HallOfFame.CONFIDENCE_Z
+                               * statistics.standard_error(), 2),
+                         wins, draws, losses])
+
+        rows.sort(key=lambda row: (row[6] - row[4], -row[2]))
+
+        return rows
+
+    @staticmethod
+    def print_table(rows):
+        print("\n{:>4} {:<30} {:>6} {:>10} {:>8} {:>4} {:>4} {:>4}".format(
+            "Rank", "Entrant", "Games", "Mean", "95% CI", "W", "D", "L"))
+
+        for rank, row in enumerate(rows, 1):
+            print("{:>4} {:<30} {:>6} {:>10.0f} {:>8.0f} {:>4} {:>4} "
+                  "{:>4}".format(rank, row[0][-30:], *row[1:]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rank Strategies and players in a round-robin tournament "
+                    "on shared weather, stopping each pairing as soon as a "
+                    "sequential test decides it.")
+    parser.add_argument("entrants", nargs="+",
+                        help="'solver', 'mcts:ROLLOUTS' or a JSON file of "
+                             "saved Strategies")
+    parser.add_argument("--max-games", type=int,
+                        default=Tournament.MAX_GAMES,
+                        help="games after which an undecided pairing is a "
+                             "draw")
+    parser.add_argument("--indifference", type=float,
+                        default=Tournament.INDIFFERENCE,
+                        help="score difference, as a fraction of the mean "
+                             "score, too small to matter")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--table", help="CSV file to write the table to")
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    entrants = [entrant for text in arguments.entrants
+                for entrant in Entrant.parse(text)]
+    tournament = Tournament(
+        entrants, Launcher.MAX_YEARS, Launcher.INITIAL_MONEY,
+        data_reader.import_crops(), data_reader.import_fields(),
+        arguments.seed, arguments.workers, arguments.max_games,
+        arguments.indifference)
+    rows = tournament.run()
+
+    Tournament.print_table(rows)
+
+    print("\n{} games played; a fixed-count comparison of {} games each "
+          "would play {}".format(tournament.games_played(),
+                                 arguments.max_games,
+                                 arguments.max_games * len(entrants)))
+
+    if arguments.table is not None:
+        with open(arguments.table, "w", newline="") as table_file:
+            writer = csv.writer(table_file)
+            writer.writerow(Tournament.TABLE_COLUMNS)
+            writer.writerows(rows)
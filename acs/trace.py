@@ -0,0 +1,233 @@
+import argparse
+import struct
+
+from acs.data_reader import DataReader
+from acs.farm import Field
+from acs.game import Game
+from acs.input_providers import PlayerInputProvider
+from acs.weather import Weather
+
+
+# Every record in a trace file has the same width, beginning with a one byte
+# record type tag.
+RECORD_SIZE = 28
+
+GAME_RECORD = b"G"
+PURCHASE_RECORD = b"P"
+FIELD_RECORD = b"F"
+YEAR_RECORD = b"Y"
+END_RECORD = b"E"
+
+# Game number, max years, initial money
+GAME_FORMAT = "<cIHi"
+
+# Year, field ID, price
+PURCHASE_FORMAT = "<cHHi"
+
+# Field ID, crop ID (-1 if empty), quantity, revenue
+FIELD_FORMAT = "<cHhHi"
+
+# Year, heat, wetness, income, expenditure, new assets, money after harvest
+YEAR_FORMAT = "<cHffiiii"
+
+# Final score
+END_FORMAT = "<ci"
+
+RECORD_FORMATS = {
+    GAME_RECORD: GAME_FORMAT,
+    PURCHASE_RECORD: PURCHASE_FORMAT,
+    FIELD_RECORD: FIELD_FORMAT,
+    YEAR_RECORD: YEAR_FORMAT,
+    END_RECORD: END_FORMAT
+}
+
+# Pad every record format out to the full record width
+RECORD_STRUCTS = {
+    tag: struct.Struct(record_format + "{}x".format(
+        RECORD_SIZE - struct.calcsize(record_format)))
+    for tag, record_format in RECORD_FORMATS.items()
+}
+
+
+class GameTrace:
+    """
+    Class representing the records of a single traced game, accumulated in
+    memory and written out in one piece when the game ends.
+    """
+
+    def __init__(self, recorder, game_number, game):
+        self.recorder = recorder
+        self.buffer = bytearray()
+        self.append(GAME_RECORD, game_number, game.max_years, game.farm.money)
+
+    def append(self, tag, *values):
+        self.buffer += RECORD_STRUCTS[tag].pack(tag, *values)
+
+    def record_purchase(self, year, field):
+        self.append(PURCHASE_RECORD, year, field.id, field.price)
+
+    def record_year(self, year, weather, income, expenditure, new_assets,
+                    owned_fields, money):
+        """
+        Record the plantings and revenue of every owned field, followed by the
+        weather and financial results of the year.
+        """
+
+        for field in owned_fields:
+            if field.is_empty():
+                self.append(FIELD_RECORD, field.id, -1, 0, 0)
+            else:
+                self.append(FIELD_RECORD, field.id, field.crop.id,
+                            field.crop_quantity, field.last_revenue)
+
+        self.append(YEAR_RECORD, year, weather.heat, weather.wetness, income,
+                    expenditure, new_assets, money)
+
+    def record_end(self, score):
+        self.append(END_RECORD, score)
+        self.recorder.write(self.buffer)
+
+
+class TraceRecorder:
+    """
+    Class recording a sample of played games to a binary trace file. Only one
+    in every sample_interval games is traced, so that untraced games pay for
+    little more than a single check per year.
+    """
+
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, file_name, sample_interval=1):
+        self.trace_file = open(file_name, "wb",
+                               buffering=TraceRecorder.BUFFER_SIZE)
+        self.sample_interval = sample_interval
+        self.games_seen = 0
+
+    def start_game(self, game):
+        """
+        Return a GameTrace for the given game if it has been sampled for
+        tracing, or None otherwise.
+        """
+
+        game_number = self.games_seen
+        self.games_seen += 1
+
+        if game_number % self.sample_interval != 0:
+            return None
+
+        return GameTrace(self, game_number, game)
+
+    def write(self, data):
+        self.trace_file.write(data)
+
+    def close(self):
+        self.trace_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TraceReplayer:
+    """
+    Class reading a binary trace file and re-rendering each traced game using
+    the reports shown to a human player.
+    """
+
+    def __init__(self, file_name, crops, fields):
+        self.file_name = file_name
+        self.crops = {crop.id: crop for crop in crops}
+        self.fields = {field.id: field for field in fields}
+
+    def read_records(self):
+        """
+        Yield the (tag, values) of every record in the trace file.
+        """
+
+        with open(self.file_name, "rb") as trace_file:
+            while True:
+                record = trace_file.read(RECORD_SIZE)
+
+                if len(record) < RECORD_SIZE:
+                    return
+
+                tag = record[:1]
+                yield tag, RECORD_STRUCTS[tag].unpack(record)[1:]
+
+    def replay(self, game_numbers=None):
+        """
+        Render every traced game, or only those with the given numbers.
+        """
+
+        output = PlayerInputProvider()
+        showing = False
+        year_fields = []
+
+        for tag, values in self.read_records():
+
+            if tag == GAME_RECORD:
+                game_number, max_years, initial_money = values
+                showing = game_numbers is None or game_number in game_numbers
+
+                if showing:
+                    print("\n\n###### Game", game_number, "######")
+                    output.show_greeting(max_years)
+                    print("Starting balance:", initial_money)
+
+            elif not showing:
+                continue
+
+            elif tag == PURCHASE_RECORD:
+                year, field_id, price = values
+                print("\nYear", year, "- bought",
+                      self.fields[field_id].name, "for", price)
+
+            elif tag == FIELD_RECORD:
+                year_fields.append(self.build_field(*values))
+
+            elif tag == YEAR_RECORD:
+                (year, heat, wetness, income, expenditure, new_assets,
+                 money) = values
+
+                output.show_year_results_header()
+                output.report_weather(Weather(heat, wetness), Game.heat_bands,
+                                      Game.wetness_bands)
+                output.report_financials(income, expenditure, new_assets)
+                output.report_field_performance(year_fields)
+                print("Balance:", money)
+                year_fields = []
+
+            elif tag == END_RECORD:
+                output.show_final_score(values[0])
+
+    def build_field(self, field_id, crop_id, quantity, revenue):
+        """
+        Return a copy of the catalog Field with the given ID, planted as
+        recorded in the trace.
+        """
+
+        template = self.fields[field_id]
+        field = Field(template.id, template.name, template.description,
+                      template.max_crop_quantity, template.soil_quality,
+                      template.price)
+
+        if crop_id >= 0:
+            field.plant(self.crops[crop_id], quantity)
+            field.last_revenue = revenue
+
+        return field
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a game trace file.")
+    parser.add_argument("trace_file")
+    parser.add_argument("--game", type=int, nargs="*",
+                        help="numbers of the games to replay (default all)")
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    replayer = TraceReplayer(arguments.trace_file, data_reader.import_crops(),
+                             data_reader.import_fields())
+    replayer.replay(arguments.game)
@@ -1,8 +1,12 @@
+from array import array
+import bisect
 import random
 
 
 class Weather:
 
+    __slots__ = ("heat", "wetness")
+
     def __init__(self, heat, wetness):
         self.heat = heat
         self.wetness = wetness
@@ -10,11 +14,46 @@ class Weather:
 
 class WeatherBand:
 
+    __slots__ = ("min_value", "message")
+
     def __init__(self, min_value, message):
         self.min_value = min_value
         self.message = message
 
 
+class WeatherBands:
+    """
+    Class holding a list of WeatherBands in ascending order of their minimum
+    values, indexed by those values so that the band containing any value is
+    found by bisection.
+    """
+
+    __slots__ = ("bands", "min_values")
+
+    def __init__(self, bands):
+        self.bands = bands
+        self.min_values = [band.min_value for band in bands]
+
+    def __iter__(self):
+        return iter(self.bands)
+
+    def __len__(self):
+        return len(self.bands)
+
+    def find(self, value):
+        """
+        Return the highest band whose minimum value is at most the given
+        value, or None if there is none.
+        """
+
+        index = bisect.bisect_right(self.min_values, value) - 1
+
+        if index < 0:
+            return None
+
+        return self.bands[index]
+
+
 class WeatherGenerator:
 
     wetness_deviation = 0.1
@@ -25,16 +64,80 @@ class WeatherGenerator:
     heat_min = 1 - 3 * heat_deviation
     heat_max = 1 + 3 * heat_deviation
 
+    __slots__ = ("rng",)
+
+    def __init__(self, rng=None):
+        self.rng = rng or random
+
     def generate(self):
 
         wetness = 0
         while (wetness < WeatherGenerator.wetness_min
                 or wetness > WeatherGenerator.wetness_max):
-            wetness = random.gauss(1, self.wetness_deviation)
+            wetness = self.rng.gauss(1, self.wetness_deviation)
 
         heat = 0
         while (heat < WeatherGenerator.heat_min
                 or heat > WeatherGenerator.heat_max):
-            heat = random.gauss(1, self.heat_deviation)
+            heat = self.rng.gauss(1, self.heat_deviation)
 
         return Weather(heat, wetness)
+
+
+class WeatherTable:
+    """
+    Class holding pre-drawn weather scenarios, each a sequence of one Weather
+    per year, stored as a flat sequence of (heat, wetness) pairs. The values
+    may be any sequence of floats, including a view of shared memory.
+    """
+
+    __slots__ = ("values", "num_scenarios", "years")
+
+    def __init__(self, values, num_scenarios, years):
+        self.values = values
+        self.num_scenarios = num_scenarios
+        self.years = years
+
+    @staticmethod
+    def draw(num_scenarios, years, rng):
+        """
+        Return a new WeatherTable of weather drawn from the given generator.
+        """
+
+        weather_generator = WeatherGenerator(rng)
+        values = array("d")
+
+        for i in range(num_scenarios * years):
+            weather = weather_generator.generate()
+            values.append(weather.heat)
+            values.append(weather.wetness)
+
+        return WeatherTable(values, num_scenarios, years)
+
+    def generator(self, scenario):
+        """
+        Return a generator replaying the given scenario, which is taken modulo
+        the number of scenarios held.
+        """
+
+        return ScenarioWeatherGenerator(
+            self.values, (scenario % self.num_scenarios) * self.years * 2)
+
+
+class ScenarioWeatherGenerator:
+    """
+    Class replaying the weather of one scenario of a WeatherTable, one year at
+    a time.
+    """
+
+    __slots__ = ("values", "position")
+
+    def __init__(self, values, position):
+        self.values = values
+        self.position = position
+
+    def generate(self):
+        position = self.position
+        self.position = position + 2
+
+        return Weather(self.values[position], self.values[position + 1])
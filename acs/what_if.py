@@ -0,0 +1,358 @@
+import argparse
+import csv
+import json
+import math
+import os
+import time
+
+from acs.ai import *
+from acs.data_reader import DataReader
+from acs.evaluation_store import EvaluationStore
+from acs.hall_of_fame import HallOfFame
+from acs.launchers import Launcher
+from acs.seeding import derive_seed
+
+
+class CatalogDiff:
+    """
+    Class representing the crops and fields changed between two versions of
+    a catalog, as lists of (old, new) pairs matched by id. Both versions must
+    hold the same crops and fields, with the same names, as Strategies refer
+    to crops by name.
+    """
+
+    CROP_ATTRIBUTES = ("cost", "sale_price", "ideal_heat", "ideal_wetness",
+                       "heat_sensitivity", "wetness_sensitivity")
+    FIELD_ATTRIBUTES = ("max_crop_quantity", "soil_quality", "price")
+
+    __slots__ = ("changed_crops", "changed_fields", "starting_field_id",
+                 "old_lowest_crop_cost", "new_lowest_crop_cost")
+
+    def __init__(self, old_crops, old_fields, new_crops, new_fields):
+        if [(crop.id, crop.name) for crop in old_crops] != \
+                [(crop.id, crop.name) for crop in new_crops] or \
+                [field.id for field in old_fields] != \
+                [field.id for field in new_fields]:
+            raise ValueError("Both catalogs must hold the same crops and "
+                             "fields, in the same order")
+
+        self.changed_crops = [
+            (old, new) for old, new in zip(old_crops, new_crops)
+            if CatalogDiff.changes(old, new, CatalogDiff.CROP_ATTRIBUTES)]
+        self.changed_fields = [
+            (old, new) for old, new in zip(old_fields, new_fields)
+            if CatalogDiff.changes(old, new, CatalogDiff.FIELD_ATTRIBUTES)]
+        self.starting_field_id = old_fields[0].id
+        self.old_lowest_crop_cost = min(crop.cost for crop in old_crops)
+        self.new_lowest_crop_cost = min(crop.cost for crop in new_crops)
+
+    @staticmethod
+    def changes(old, new, attributes):
+        """
+        Return a description of each of the given attributes which differs
+        between two versions of a crop or field.
+        """
+
+        return ["{} {} -> {}".format(attribute, getattr(old, attribute),
+                                     getattr(new, attribute))
+                for attribute in attributes
+                if getattr(old, attribute) != getattr(new, attribute)]
+
+    def is_empty(self):
+        return not self.changed_crops and not self.changed_fields
+
+    def describe(self):
+        """
+        Return a line per changed crop or field, listing the changed values.
+        """
+
+        return ([old.name + ": " + ", ".join(CatalogDiff.changes(
+                    old, new, CatalogDiff.CROP_ATTRIBUTES))
+                 for old, new in self.changed_crops]
+                + [old.name + ": " + ", ".join(CatalogDiff.changes(
+                    old, new, CatalogDiff.FIELD_ATTRIBUTES))
+                   for old, new in self.changed_fields])
+
+    def affected_reasons(self, strategy, maximum_score):
+        """
+        Return why the given Strategy's games may change, or an empty list if
+        it makes exactly the same decisions with the same outcomes in both
+        catalogs. A field is taken to matter if it costs less than the best
+        final score the Strategy reached with the old catalog.
+        """
+
+        reasons = []
+
+        # When the cheapest crop has no chance of being planted, a player who
+        # can only afford unweighted crops plants the dearest of them, so a
+        # change to any unweighted crop may change the games
+        draws_unweighted = strategy.chances_to_plant[
+            strategy.crop_sampler.crops[0]] == 0
+        unweighted_changed = False
+
+        for old, new in self.changed_crops:
+            if strategy.chances_to_plant[old] > 0:
+                reasons.append("plants " + old.name)
+            else:
+                unweighted_changed = True
+
+        # Crop costs decide bankruptcy
+        if self.old_lowest_crop_cost != self.new_lowest_crop_cost:
+            reasons.append("cheapest crop cost")
+
+        if draws_unweighted and unweighted_changed:
+            reasons.append("draws unweighted crops")
+
+        for old, new in self.changed_fields:
+            if old.id == self.starting_field_id:
+                reasons.append("owns " + old.name)
+            elif min(old.price, new.price) < maximum_score:
+                reasons.append("can afford " + old.name)
+
+        return reasons
+
+
+def apply_change(crops, fields, text):
+    """
+    Return copies of the given catalog with a change of the form
+    "NAME.ATTRIBUTE=VALUE" applied to the named crop or field, e.g.
+    "Corn.sale_price=35".
+    """
+
+    target, value = text.split("=")
+    name, attribute = target.rsplit(".", 1)
+    crops = [Crop(*[getattr(crop, slot) for slot in Crop.__slots__])
+             for crop in crops]
+    fields = [Field(*[getattr(field, slot) for slot in Field.__slots__[:6]])
+              for field in fields]
+
+    for item in crops + fields:
+        if item.name == name:
+            if attribute not in CatalogDiff.CROP_ATTRIBUTES + \
+                    CatalogDiff.FIELD_ATTRIBUTES or \
+                    not hasattr(item, attribute):
+                raise ValueError("Cannot change " + attribute)
+
+            setattr(item, attribute, json.loads(value))
+            return crops, fields
+
+    raise ValueError("No crop or field named " + name)
+
+
+class WhatIfAnalysis:
+    """
+    Class measuring the impact of a catalog change on a set of saved
+    Strategies. Every Strategy is evaluated with the old catalog (from the
+    evaluation store, if it has been before), but only those whose games the
+    change can affect are evaluated again with the new one. All evaluations
+    share one seed, so both catalogs face the same weather and unaffected
+    Strategies keep exactly the same scores.
+    """
+
+    NUM_GAMES = 200
+
+    REPORT_COLUMNS = ["strategy", "affected_by", "old_fitness",
+                      "new_fitness", "change", "change_percent",
+                      "confidence_half_width", "old_rank", "new_rank"]
+
+    def __init__(self, max_years, initial_money, old_catalog, new_catalog,
+                 num_games=None, seed=0, workers=None, store_file_name=None):
+        self.max_years = max_years
+        self.initial_money = initial_money
+        self.old_crops, self.old_fields = old_catalog
+        self.new_crops, self.new_fields = new_catalog
+        self.num_games = num_games or WhatIfAnalysis.NUM_GAMES
+        self.seed = seed
+        self.workers = workers
+        self.store_file_name = store_file_name
+        self.diff = CatalogDiff(self.old_crops, self.old_fields,
+                                self.new_crops, self.new_fields)
+        self.games_played = 0
+
+    def evaluate(self, crops, fields, strategy_data):
+        """
+        Evaluate the given Strategies with the given catalog, and return them
+        with their ScoreStatistics.
+        """
+
+        strategies = [Strategy.from_dict(data, crops)
+                      for data in strategy_data]
+        evaluation_store = None
+
+        # Evaluations of each catalog are kept apart by its digest
+        if self.store_file_name is not None:
+            evaluation_store = EvaluationStore(
+                self.store_file_name, DataReader.catalog_digest(crops, fields))
+
+        evolver = Evolver(self.max_years, self.initial_money, crops, fields,
+                          verbose=False, seed=self.seed, workers=self.workers,
+                          evaluation_store=evaluation_store)
+        common_seed = derive_seed(self.seed, "what if")
+
+        evolver.start_workers()
+
+        try:
+            all_statistics = evolver.evaluate_strategies(
+                strategies, [common_seed] * len(strategies), self.num_games)
+        finally:
+            evolver.stop_workers()
+
+            if evaluation_store is not None:
+                evaluation_store.close()
+
+        self.games_played += evolver.games_played
+
+        return strategies, all_statistics
+
+    def run(self, labels, strategy_data):
+        """
+        Return a report row, in the order of REPORT_COLUMNS, for each of the
+        given Strategies, most affected first.
+        """
+
+        old_strategies, old_statistics = self.evaluate(
+            self.old_crops, self.old_fields, strategy_data)
+        reasons = [self.diff.affected_reasons(strategy,
+                                              statistics.running.maximum)
+                   for strategy, statistics
+                   in zip(old_strategies, old_statistics)]
+        affected = [index for index, strategy_reasons in enumerate(reasons)
+                    if strategy_reasons]
+
+        new_statistics = list(old_statistics)
+        affected_strategies, affected_statistics = self.evaluate(
+            self.new_crops, self.new_fields,
+            [strategy_data[index] for index in affected])
+
+        for index, statistics in zip(affected, affected_statistics):
+            new_statistics[index] = statistics
+
+        old_ranks = WhatIfAnalysis.ranks(old_statistics)
+        new_ranks = WhatIfAnalysis.ranks(new_statistics)
+        rows = []
+
+        for index, label in enumerate(labels):
+            old_mean = old_statistics[index].running.mean
+            new_mean = new_statistics[index].running.mean
+            half_width = 0
+
+            if reasons[index]:
+                half_width = HallOfFame.CONFIDENCE_Z * math.sqrt(
+                    old_statistics[index].running.standard_error() ** 2
+                    + new_statistics[index].running.standard_error() ** 2)
+
+            rows.append([
+                label, "; ".join(reasons[index]) or "-", round(old_mean, 2),
+                round(new_mean, 2), round(new_mean - old_mean, 2),
+                round(100 * (new_mean - old_mean) / old_mean, 2)
+                if old_mean else 0,
+                round(half_width, 2), old_ranks[index], new_ranks[index]])
+
+        rows.sort(key=lambda row: -abs(row[4]))
+
+        return rows
+
+    @staticmethod
+    def ranks(all_statistics):
+        order = sorted(range(len(all_statistics)),
+                       key=lambda index: -all_statistics[index].running.mean)
+        ranks = [0] * len(order)
+
+        for rank, index in enumerate(order, 1):
+            ranks[index] = rank
+
+        return ranks
+
+    @staticmethod
+    def print_report(rows):
+        print("\n{:<30} {:>10} {:>10} {:>9} {:>8} {:>6}  {}".format(
+            "Strategy", "Old", "New", "Change", "95% CI", "Rank",
+            "Affected by"))
+
+        for row in rows:
+            print("{:<30} {:>10.0f} {:>10.0f} {:>+8.1f}% {:>8.0f} {:>6}  "
+                  "{}".format(row[0][-30:], row[2], row[3], row[5], row[6],
+                              "{}->{}".format(row[7], row[8]), row[1]))
+
+
+def read_strategies(file_names):
+    """
+    Return (labels, strategy data) for the Strategies saved in the given
+    files. Each file holds a Strategy, a best Strategy file written by
+    acs.anytime, or a list of Strategies.
+    """
+
+    labels = []
+    strategy_data = []
+
+    for file_name in file_names:
+        with open(file_name, encoding="utf-8") as strategy_file:
+            data = json.load(strategy_file)
+
+        if isinstance(data, dict):
+            data = [data.get("strategy", data)]
+
+        for index, strategy in enumerate(data):
+            labels.append(file_name if len(data) == 1
+                          else "{}[{}]".format(file_name, index))
+            strategy_data.append(strategy)
+
+    return labels, strategy_data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Report the impact of a catalog change on saved "
+                    "Strategies, re-evaluating only those it can affect.")
+    parser.add_argument("strategies", nargs="+",
+                        help="JSON files of saved Strategies")
+    parser.add_argument("--new-crops", default=DataReader.crops_file_name,
+                        help="changed crop catalog")
+    parser.add_argument("--new-fields", default=DataReader.fields_file_name,
+                        help="changed field catalog")
+    parser.add_argument("--change", action="append", default=[],
+                        metavar="NAME.ATTRIBUTE=VALUE",
+                        help="change to apply to the new catalog, e.g. "
+                             "Corn.sale_price=35 (repeatable)")
+    parser.add_argument("--games", type=int,
+                        default=WhatIfAnalysis.NUM_GAMES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--store",
+                        help="evaluation store shared between runs")
+    parser.add_argument("--report", help="CSV file to write the report to")
+    arguments = parser.parse_args()
+
+    data_reader = DataReader()
+    old_catalog = (data_reader.import_crops(), data_reader.import_fields())
+    new_data_reader = DataReader(arguments.new_crops, arguments.new_fields)
+    new_crops = new_data_reader.import_crops()
+    new_fields = new_data_reader.import_fields()
+
+    for change in arguments.change:
+        new_crops, new_fields = apply_change(new_crops, new_fields, change)
+
+    analysis = WhatIfAnalysis(
+        Launcher.MAX_YEARS, Launcher.INITIAL_MONEY, old_catalog,
+        (new_crops, new_fields), arguments.games, arguments.seed,
+        arguments.workers, arguments.store)
+
+    print("Catalog changes:")
+    for line in analysis.diff.describe() or ["none"]:
+        print("   ", line)
+
+    labels, strategy_data = read_strategies(arguments.strategies)
+    start_time = time.perf_counter()
+
+    rows = analysis.run(labels, strategy_data)
+    WhatIfAnalysis.print_report(rows)
+
+    print("\n{} of {} Strategies affected; {} games played in {:.1f}s".format(
+        sum(1 for row in rows if row[1] != "-"), len(rows),
+        analysis.games_played, time.perf_counter() - start_time))
+
+    if arguments.report is not None:
+        with open(arguments.report, "w", newline="") as report_file:
+            writer = csv.writer(report_file)
+            writer.writerow(WhatIfAnalysis.REPORT_COLUMNS)
+            writer.writerows(rows)